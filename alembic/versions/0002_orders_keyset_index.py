@@ -0,0 +1,42 @@
+"""
+Keyset pagination index for orders.
+
+Revision: 0002
+Creates: ix_orders_created_at_id on orders (created_at, id)
+
+GET /orders pages by ORDER BY created_at DESC, id DESC and, in cursor mode,
+seeks with (created_at, id) < (:created_at, :id). A btree on the same
+columns serves both with a backward index scan, so a page costs the same
+at any depth. Products page by primary key and need no extra index.
+
+The index is built CONCURRENTLY outside the migration transaction so that
+writes to orders are not blocked while it builds. If the build fails it
+leaves an INVALID index behind: drop it and re-run the upgrade.
+"""
+from alembic import op
+
+revision: str = "0002"
+down_revision: str | None = "0001"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_orders_created_at_id",
+            "orders",
+            ["created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_orders_created_at_id",
+            table_name="orders",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,81 @@
+"""
+Indexes for filtered order listing.
+
+Revision: 0003
+Creates: ix_orders_status_created_at_id on orders (status, created_at, id)
+         ix_orders_pending_created_at_id on orders (created_at, id)
+             WHERE status = 'Pending'
+         ix_orders_created_at_brin on orders USING brin (created_at)
+Drops:   ix_orders_status (a prefix of the composite index)
+
+GET /orders filters by status and a created_at range and pages newest
+first. The composite index serves status + ORDER BY created_at DESC, id DESC
++ keyset seek in one backward scan; the partial index keeps the Pending
+queue small; BRIN answers wide date ranges over an insert-ordered table.
+
+All statements run CONCURRENTLY outside the migration transaction so that
+writes to orders are not blocked while the indexes build. If a build fails
+it leaves an INVALID index behind: drop it and re-run the upgrade.
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0003"
+down_revision: str | None = "0002"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_orders_status_created_at_id",
+            "orders",
+            ["status", "created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_orders_pending_created_at_id",
+            "orders",
+            ["created_at", "id"],
+            postgresql_where=sa.text("status = 'Pending'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_orders_created_at_brin",
+            "orders",
+            ["created_at"],
+            postgresql_using="brin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_orders_status",
+            table_name="orders",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_orders_status",
+            "orders",
+            ["status"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name in (
+            "ix_orders_created_at_brin",
+            "ix_orders_pending_created_at_id",
+            "ix_orders_status_created_at_id",
+        ):
+            op.drop_index(
+                name,
+                table_name="orders",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
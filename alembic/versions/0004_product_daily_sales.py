@@ -0,0 +1,41 @@
+"""
+Per-product daily sales aggregates.
+
+Revision: 0004
+Creates: product_daily_sales (product_id, day) with order_count, units, revenue
+         ix_product_daily_sales_day on product_daily_sales (day)
+
+The table is maintained by the order service from here on. Existing history
+is not backfilled by the migration; run ``python -m app.rebuild_sales`` once
+after upgrading.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0004"
+down_revision: str | None = "0003"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "product_daily_sales",
+        sa.Column(
+            "product_id",
+            sa.Integer(),
+            sa.ForeignKey("products.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.Column("units", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Numeric(14, 2), nullable=False),
+        sa.PrimaryKeyConstraint("product_id", "day"),
+    )
+    op.create_index("ix_product_daily_sales_day", "product_daily_sales", ["day"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_product_daily_sales_day", table_name="product_daily_sales")
+    op.drop_table("product_daily_sales")
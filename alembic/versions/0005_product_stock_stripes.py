@@ -0,0 +1,82 @@
+"""
+Striped stock counters for hot products.
+
+Revision: 0005
+Creates: products.stock_stripes (smallint, default 0)
+         product_stock_stripes (product_id, stripe) with quantity >= 0
+         product_daily_sales.slot (smallint, default 0), added to the
+             primary key
+
+Products stay unstriped (stock_stripes = 0) until switched with
+PUT /api/v1/products/{id}/stripes, so existing stock is untouched. Their
+daily sales totals are spread over as many slots as they have stripes, so
+the aggregate row does not become the next hot spot; existing rows are
+slot 0.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0005"
+down_revision: str | None = "0004"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "products",
+        sa.Column(
+            "stock_stripes", sa.SmallInteger(), nullable=False, server_default="0"
+        ),
+    )
+    op.create_table(
+        "product_stock_stripes",
+        sa.Column(
+            "product_id",
+            sa.Integer(),
+            sa.ForeignKey("products.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("stripe", sa.SmallInteger(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("product_id", "stripe"),
+        sa.CheckConstraint("quantity >= 0", name="ck_stock_stripe_non_negative"),
+    )
+    op.add_column(
+        "product_daily_sales",
+        sa.Column("slot", sa.SmallInteger(), nullable=False, server_default="0"),
+    )
+    op.drop_constraint("product_daily_sales_pkey", "product_daily_sales")
+    op.create_primary_key(
+        "product_daily_sales_pkey", "product_daily_sales", ["product_id", "day", "slot"]
+    )
+
+
+def downgrade() -> None:
+    # Merge the slots of each (product, day) back into one row.
+    op.execute(
+        "CREATE TEMP TABLE merged_daily_sales ON COMMIT DROP AS "
+        "SELECT product_id, day, SUM(order_count) AS order_count, "
+        "SUM(units) AS units, SUM(revenue) AS revenue "
+        "FROM product_daily_sales GROUP BY product_id, day"
+    )
+    op.execute("DELETE FROM product_daily_sales")
+    op.drop_constraint("product_daily_sales_pkey", "product_daily_sales")
+    op.drop_column("product_daily_sales", "slot")
+    op.execute(
+        "INSERT INTO product_daily_sales "
+        "(product_id, day, order_count, units, revenue) "
+        "SELECT product_id, day, order_count, units, revenue FROM merged_daily_sales"
+    )
+    op.create_primary_key(
+        "product_daily_sales_pkey", "product_daily_sales", ["product_id", "day"]
+    )
+    # Fold striped stock back into the product rows before dropping it.
+    op.execute(
+        "UPDATE products p SET stock_quantity = p.stock_quantity + s.total "
+        "FROM (SELECT product_id, SUM(quantity) AS total "
+        "FROM product_stock_stripes GROUP BY product_id) s "
+        "WHERE p.id = s.product_id"
+    )
+    op.drop_table("product_stock_stripes")
+    op.drop_column("products", "stock_stripes")
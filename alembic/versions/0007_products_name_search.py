@@ -0,0 +1,56 @@
+"""
+Indexes for product search.
+
+Revision: 0007
+Creates: ix_products_name_prefix on products ((lower(name) COLLATE "C"), id)
+         ix_products_name_search on products
+             USING gin (to_tsvector('simple', name))
+
+GET /products/search matches names by prefix or by words. The btree keeps
+lowercased names in byte order, so a prefix is one range seek and keyset
+pages are read in index order; ix_products_name sorts by the database
+collation and cannot do either. The GIN index finds names containing a
+word that starts with each word of the query, in any order.
+
+Both use only built-in operator classes, so no extension is required.
+They are built CONCURRENTLY outside the migration transaction so that writes
+to products are not blocked; if a build fails it leaves an INVALID index
+behind: drop it and re-run the upgrade.
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0007"
+down_revision: str | None = "0006"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_products_name_prefix",
+            "products",
+            [sa.text('(lower(name) COLLATE "C")'), "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_products_name_search",
+            "products",
+            [sa.text("to_tsvector('simple', name)")],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in ("ix_products_name_search", "ix_products_name_prefix"):
+            op.drop_index(
+                name,
+                table_name="products",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,72 @@
+"""
+Time-limited stock reservations.
+
+Revision: 0008
+Creates: reservations (id) with expires_at, created_at
+         ix_reservations_expires_at on reservations (expires_at)
+         reservation_items (reservation_id, product_id) with quantity > 0
+         ix_reservation_items_product_id on reservation_items (product_id)
+
+Held stock is taken from products (or their stripes) when a hold is made and
+lives in reservation_items until an order consumes it or it is returned.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0008"
+down_revision: str | None = "0007"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "reservations",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_reservations_expires_at", "reservations", ["expires_at"])
+    op.create_table(
+        "reservation_items",
+        sa.Column(
+            "reservation_id",
+            sa.Integer(),
+            sa.ForeignKey("reservations.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "product_id",
+            sa.Integer(),
+            sa.ForeignKey("products.id", ondelete="RESTRICT"),
+            nullable=False,
+        ),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("reservation_id", "product_id"),
+        sa.CheckConstraint(
+            "quantity > 0", name="ck_reservation_item_quantity_positive"
+        ),
+    )
+    op.create_index(
+        "ix_reservation_items_product_id", "reservation_items", ["product_id"]
+    )
+
+
+def downgrade() -> None:
+    # Return every outstanding hold to stock before dropping it.
+    op.execute(
+        "UPDATE products p SET stock_quantity = p.stock_quantity + r.total "
+        "FROM (SELECT product_id, SUM(quantity) AS total "
+        "FROM reservation_items GROUP BY product_id) r "
+        "WHERE p.id = r.product_id"
+    )
+    op.drop_index("ix_reservation_items_product_id", table_name="reservation_items")
+    op.drop_table("reservation_items")
+    op.drop_index("ix_reservations_expires_at", table_name="reservations")
+    op.drop_table("reservations")
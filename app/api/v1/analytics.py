@@ -0,0 +1,48 @@
+"""Analytics API routes."""
+import logging
+from datetime import date
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependencies import get_db
+from app.responses import PydanticJSONResponse
+from app.schemas.analytics import SalesReport
+from app.services.sales_service import Granularity, SalesService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+@router.get(
+    "/sales",
+    response_model=SalesReport,
+    status_code=status.HTTP_200_OK,
+    summary="Units and revenue by period, with top products",
+    description=(
+        "Reads the incrementally maintained per-product daily totals; "
+        "cancelled orders are excluded. date_from is inclusive, date_to "
+        "exclusive. Weeks start on Monday."
+    ),
+)
+async def sales_report(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    granularity: Annotated[Granularity, Query(description="day, week or month")] = "day",
+    date_from: Annotated[date | None, Query()] = None,
+    date_to: Annotated[date | None, Query()] = None,
+    product_id: Annotated[int | None, Query(gt=0)] = None,
+    top: Annotated[
+        int, Query(ge=0, le=100, description="Top products by revenue")
+    ] = 10,
+) -> PydanticJSONResponse:
+    service = SalesService(db)
+    report = await service.sales_report(
+        granularity=granularity,
+        date_from=date_from,
+        date_to=date_to,
+        product_id=product_id,
+        top=top,
+    )
+    return PydanticJSONResponse(report)
@@ -0,0 +1,36 @@
+"""Change feed API routes."""
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import StreamingResponse
+
+from app.config import get_settings
+from app.dependencies import get_event_broker
+from app.services.events import EventBroker, sse_stream
+
+router = APIRouter(prefix="/events", tags=["Events"])
+settings = get_settings()
+
+
+@router.get(
+    "",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Stream order and stock changes as Server-Sent Events",
+    description=(
+        "Sends order_created, order_status_changed and stock_changed events as "
+        "the writes commit. A resync or evicted event, or a reconnect, means "
+        "events may have been missed: refetch what is displayed."
+    ),
+)
+async def stream_events(
+    broker: Annotated[EventBroker, Depends(get_event_broker)],
+) -> StreamingResponse:
+    # Connect before the 200 goes out, so a database outage is an error
+    # response rather than an empty stream.
+    await broker.listen()
+    return StreamingResponse(
+        sse_stream(broker, settings.events_keepalive_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,15 +1,42 @@
 """Order API routes."""
 import logging
+from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.config import get_settings
-from app.dependencies import get_db
+from app.dependencies import (
+    get_db,
+    get_idempotency_cache,
+    get_order_coalescer,
+    get_product_cache,
+    get_read_db,
+    get_read_session_factory,
+    get_session_factory,
+)
+from app.etag import cache_headers, etag_matches, not_modified
+from app.exceptions import AppError, InsufficientStockError, NotFoundError
+from app.models.order import OrderStatus
+from app.responses import PydanticJSONResponse
 from app.schemas.common import PaginatedResponse
-from app.schemas.order import OrderCreate, OrderRead, OrderStatusUpdate
-from app.services.order_service import OrderService
+from app.schemas.order import (
+    OrderBatchCreate,
+    OrderBatchError,
+    OrderBatchResponse,
+    OrderBatchResult,
+    OrderCreate,
+    OrderRead,
+    OrderStatusUpdate,
+)
+from app.services.idempotency import IdempotencyCache, IdempotentRequest
+from app.services.list_totals import TotalMode
+from app.services.order_coalescer import OrderCoalescer
+from app.services.order_export import ExportFormat, OrderExporter
+from app.services.order_service import OrderService, order_etag, order_page_etag
+from app.services.product_cache import ProductCache
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -24,26 +51,115 @@ router = APIRouter(prefix="/orders", tags=["Orders"])
     summary="Create a new order",
     description=(
         "Creates an order transactionally using SELECT FOR UPDATE. "
-        "Returns 400 on insufficient stock, 404 if any product is not found."
+        "Returns 400 on insufficient stock, 404 if any product is not found. "
+        "With reservation_id instead of items, the hold from POST "
+        "/reservations becomes the order without touching stock; 404 if it "
+        "is unknown or already used, 409 if it has expired. "
+        "With an Idempotency-Key header, retries of the same body return the "
+        "original order instead of creating another; reusing the key for a "
+        "different body returns 409."
     ),
 )
 async def create_order(
     payload: OrderCreate,
+    session_factory: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_session_factory)
+    ],
+    coalescer: Annotated[OrderCoalescer | None, Depends(get_order_coalescer)],
+    product_cache: Annotated[ProductCache | None, Depends(get_product_cache)],
+    idempotency_cache: Annotated[IdempotencyCache, Depends(get_idempotency_cache)],
+    idempotency_key: Annotated[
+        str | None, Header(min_length=1, max_length=255)
+    ] = None,
+) -> PydanticJSONResponse:
+    # Keyed orders bypass the coalescer: the key claim and the order must
+    # share one transaction. Orders from holds take no locks, so there is
+    # nothing to coalesce.
+    if (
+        coalescer is not None
+        and idempotency_key is None
+        and payload.reservation_id is None
+    ):
+        # The coalescer runs the batch on its own session; this request
+        # opens none.
+        order = await coalescer.submit(payload)
+        return PydanticJSONResponse(order, status_code=status.HTTP_201_CREATED)
+
+    async with session_factory() as db:
+        service = OrderService(db, product_cache=product_cache)
+        if idempotency_key is not None:
+            request = IdempotentRequest.for_payload(idempotency_key, payload)
+            order = await idempotency_cache.run(
+                request, lambda: service.create_order(payload, request)
+            )
+        else:
+            order = await service.create_order(payload)
+    return PydanticJSONResponse(order, status_code=status.HTTP_201_CREATED)
+
+
+@router.post(
+    "/batch",
+    response_model=OrderBatchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Create many orders in one transaction",
+    description=(
+        "Locks every referenced product once and validates orders in sequence "
+        "against a running stock tally. Orders that cannot be fulfilled are "
+        "reported per entry and do not fail the rest of the batch."
+    ),
+)
+async def create_orders_batch(
+    payload: OrderBatchCreate,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> OrderRead:
-    service = OrderService(db)
-    order = await service.create_order(payload)
-    return OrderRead.model_validate(order)
+    product_cache: Annotated[ProductCache | None, Depends(get_product_cache)],
+) -> PydanticJSONResponse:
+    service = OrderService(db, product_cache=product_cache)
+    outcomes = await service.create_orders_batch(payload.orders)
+    results = [
+        _batch_result(index, outcome) for index, outcome in enumerate(outcomes)
+    ]
+    created = sum(1 for r in results if r.status == "created")
+    return PydanticJSONResponse(
+        OrderBatchResponse(
+            created=created,
+            failed=len(results) - created,
+            results=results,
+        )
+    )
+
+
+def _batch_result(index: int, outcome: OrderRead | AppError) -> OrderBatchResult:
+    if isinstance(outcome, OrderRead):
+        return OrderBatchResult(index=index, status="created", order=outcome)
+    if isinstance(outcome, InsufficientStockError):
+        error = OrderBatchError(
+            detail=outcome.message,
+            product_id=outcome.product_id,
+            requested=outcome.requested,
+            available=outcome.available,
+        )
+    elif isinstance(outcome, NotFoundError):
+        error = OrderBatchError(
+            detail=outcome.message, product_id=int(outcome.resource_id)
+        )
+    else:
+        error = OrderBatchError(detail=outcome.message)
+    return OrderBatchResult(index=index, status="failed", error=error)
 
 
 @router.get(
     "",
     response_model=PaginatedResponse[OrderRead],
     status_code=status.HTTP_200_OK,
-    summary="List orders with pagination",
+    summary="List orders with offset or cursor pagination",
+    description=(
+        "Newest first. Filters combine with AND; repeat them unchanged when "
+        "following next_cursor. Sends a strong ETag; with a matching "
+        "If-None-Match the response is 304 without a body."
+    ),
 )
 async def list_orders(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     limit: Annotated[
         int,
         Query(ge=1, le=settings.max_page_limit, description="Max items to return"),
@@ -52,14 +168,98 @@ async def list_orders(
         int,
         Query(ge=0, description="Number of items to skip"),
     ] = 0,
-) -> PaginatedResponse[OrderRead]:
+    cursor: Annotated[
+        str | None,
+        Query(description="Opaque cursor from a previous page's next_cursor"),
+    ] = None,
+    order_status: Annotated[
+        OrderStatus | None, Query(alias="status", description="Filter by status")
+    ] = None,
+    created_from: Annotated[
+        datetime | None, Query(description="Created at or after (inclusive)")
+    ] = None,
+    created_to: Annotated[
+        datetime | None, Query(description="Created before (exclusive)")
+    ] = None,
+    product_id: Annotated[
+        int | None, Query(gt=0, description="Orders containing this product")
+    ] = None,
+    total_mode: Annotated[
+        TotalMode | None,
+        Query(description="exact, estimate or none (default: the server setting)"),
+    ] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
     service = OrderService(db)
-    result = await service.list_orders(limit=limit, offset=offset)
-    return PaginatedResponse[OrderRead](
-        items=[OrderRead.model_validate(o) for o in result["items"]],
-        total=result["total"],
-        limit=result["limit"],
-        offset=result["offset"],
+    page_args = dict(
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        status=order_status,
+        created_from=created_from,
+        created_to=created_to,
+        product_id=product_id,
+        total_mode=total_mode,
+    )
+    if if_none_match is not None:
+        etag = await service.page_etag(**page_args)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, settings.orders_cache_control)
+    result = await service.list_orders(**page_args)
+    return PydanticJSONResponse(
+        PaginatedResponse[OrderRead](
+            items=result["items"],
+            total=result["total"],
+            total_is_estimate=result["total_is_estimate"],
+            limit=result["limit"],
+            offset=result["offset"],
+            next_cursor=result["next_cursor"],
+        ),
+        headers=cache_headers(order_page_etag(result), settings.orders_cache_control),
+    )
+
+
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Stream all matching orders as NDJSON or CSV",
+    description=(
+        "Streams every order matching the filters from a server-side cursor, "
+        "with items joined in. NDJSON emits one order per line; CSV emits one "
+        "row per order item. created_from is inclusive, created_to exclusive."
+    ),
+)
+async def export_orders(
+    session_factory: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_read_session_factory)
+    ],
+    format: Annotated[ExportFormat, Query(description="ndjson or csv")] = "ndjson",
+    order_status: Annotated[
+        OrderStatus | None, Query(alias="status", description="Filter by status")
+    ] = None,
+    created_from: Annotated[datetime | None, Query()] = None,
+    created_to: Annotated[datetime | None, Query()] = None,
+) -> StreamingResponse:
+    exporter = OrderExporter(
+        session_factory, batch_size=settings.order_export_batch_size
+    )
+    chunks = exporter.stream(
+        format,
+        status=order_status,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="orders.{format}"'},
     )
 
 
@@ -68,14 +268,25 @@ async def list_orders(
     response_model=OrderRead,
     status_code=status.HTTP_200_OK,
     summary="Get order by ID",
+    description=(
+        "Sends a strong ETag; with a matching If-None-Match the response is "
+        "304 without a body."
+    ),
 )
 async def get_order(
     order_id: int,
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> OrderRead:
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
     service = OrderService(db)
+    if if_none_match is not None:
+        etag = await service.order_etag(order_id)
+        if etag is not None and etag_matches(if_none_match, etag):
+            return not_modified(etag, settings.orders_cache_control)
     order = await service.get_order(order_id)
-    return OrderRead.model_validate(order)
+    return PydanticJSONResponse(
+        order, headers=cache_headers(order_etag(order), settings.orders_cache_control)
+    )
 
 
 @router.patch(
@@ -89,7 +300,7 @@ async def update_order_status(
     order_id: int,
     payload: OrderStatusUpdate,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> OrderRead:
+) -> PydanticJSONResponse:
     service = OrderService(db)
     order = await service.update_order_status(order_id, payload.status)
-    return OrderRead.model_validate(order)
+    return PydanticJSONResponse(order)
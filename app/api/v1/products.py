@@ -2,14 +2,35 @@
 import logging
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
-from app.dependencies import get_db
+from app.dependencies import (
+    get_db,
+    get_product_cache,
+    get_product_name_index,
+    get_read_db,
+    get_read_product_cache,
+)
+from app.etag import cache_headers, etag_matches, not_modified
+from app.responses import PydanticJSONResponse
 from app.schemas.common import PaginatedResponse
-from app.schemas.product import ProductCreate, ProductRead
-from app.services.product_service import ProductService
+from app.schemas.product import (
+    ProductCreate,
+    ProductImportResult,
+    ProductRead,
+    StockStripesUpdate,
+)
+from app.services.list_totals import TotalMode
+from app.services.product_cache import ProductCache
+from app.services.product_import import ImportFormat, ProductImporter
+from app.services.product_search import ProductNameIndex, ProductSearch, SearchMode
+from app.services.product_service import (
+    ProductService,
+    product_etag,
+    product_page_etag,
+)
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -26,20 +47,63 @@ router = APIRouter(prefix="/products", tags=["Products"])
 async def create_product(
     payload: ProductCreate,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> ProductRead:
-    service = ProductService(db)
+    cache: Annotated[ProductCache | None, Depends(get_product_cache)],
+    name_index: Annotated[
+        ProductNameIndex | None, Depends(get_product_name_index)
+    ],
+) -> PydanticJSONResponse:
+    service = ProductService(db, cache, name_index)
     product = await service.create_product(payload)
-    return ProductRead.model_validate(product)
+    return PydanticJSONResponse(
+        ProductRead.model_validate(product), status_code=status.HTTP_201_CREATED
+    )
+
+
+@router.post(
+    "/import",
+    response_model=ProductImportResult,
+    status_code=status.HTTP_200_OK,
+    summary="Bulk-import products from a CSV or NDJSON upload",
+    description=(
+        "The request body is the raw file: CSV with a header row containing "
+        "name, price and stock_quantity, or one JSON object per line. Rows are "
+        "validated like POST /products and loaded with COPY in one transaction; "
+        "invalid rows are skipped and reported. With upsert=true, rows whose "
+        "name matches existing products update them instead."
+    ),
+)
+async def import_products(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    cache: Annotated[ProductCache | None, Depends(get_product_cache)],
+    format: Annotated[ImportFormat, Query(description="csv or ndjson")] = "csv",
+    upsert: Annotated[
+        bool, Query(description="Update existing products matched by name")
+    ] = False,
+) -> PydanticJSONResponse:
+    importer = ProductImporter(
+        db,
+        cache,
+        chunk_size=settings.product_import_chunk_size,
+        max_errors=settings.product_import_max_errors,
+    )
+    result = await importer.import_products(request.stream(), format, upsert=upsert)
+    return PydanticJSONResponse(result)
 
 
 @router.get(
     "",
     response_model=PaginatedResponse[ProductRead],
     status_code=status.HTTP_200_OK,
-    summary="List products with pagination",
+    summary="List products with offset or cursor pagination",
+    description=(
+        "Sends a strong ETag; with a matching If-None-Match the response is "
+        "304 without a body."
+    ),
 )
 async def list_products(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    cache: Annotated[ProductCache | None, Depends(get_read_product_cache)],
     limit: Annotated[
         int,
         Query(ge=1, le=settings.max_page_limit, description="Max items to return"),
@@ -48,12 +112,115 @@ async def list_products(
         int,
         Query(ge=0, description="Number of items to skip"),
     ] = 0,
-) -> PaginatedResponse[ProductRead]:
-    service = ProductService(db)
-    result = await service.list_products(limit=limit, offset=offset)
-    return PaginatedResponse[ProductRead](
-        items=[ProductRead.model_validate(p) for p in result["items"]],
-        total=result["total"],
-        limit=result["limit"],
-        offset=result["offset"],
+    cursor: Annotated[
+        str | None,
+        Query(description="Opaque cursor from a previous page's next_cursor"),
+    ] = None,
+    total_mode: Annotated[
+        TotalMode | None,
+        Query(description="exact, estimate or none (default: the server setting)"),
+    ] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    service = ProductService(db, cache)
+    page_args = dict(limit=limit, offset=offset, cursor=cursor, total_mode=total_mode)
+    if if_none_match is not None:
+        etag = await service.page_etag(**page_args)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, settings.products_cache_control)
+    result = await service.list_products(**page_args)
+    return PydanticJSONResponse(
+        PaginatedResponse[ProductRead](
+            items=result["items"],
+            total=result["total"],
+            total_is_estimate=result["total_is_estimate"],
+            limit=result["limit"],
+            offset=result["offset"],
+            next_cursor=result["next_cursor"],
+        ),
+        headers=cache_headers(
+            product_page_etag(result), settings.products_cache_control
+        ),
     )
+
+
+@router.get(
+    "/search",
+    response_model=PaginatedResponse[ProductRead],
+    status_code=status.HTTP_200_OK,
+    summary="Search products by name, for autocomplete",
+    description=(
+        "mode=prefix matches names starting with q, case-insensitively, in "
+        "name order. mode=fuzzy matches names with a word starting with each "
+        "word of q, in any order, best match first. Pages are fetched with "
+        "next_cursor and carry no total."
+    ),
+)
+async def search_products(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    name_index: Annotated[
+        ProductNameIndex | None, Depends(get_product_name_index)
+    ],
+    q: Annotated[str, Query(min_length=1, max_length=255)],
+    mode: Annotated[SearchMode, Query(description="prefix or fuzzy")] = "prefix",
+    limit: Annotated[
+        int,
+        Query(ge=1, le=settings.max_page_limit, description="Max items to return"),
+    ] = settings.default_page_limit,
+    cursor: Annotated[
+        str | None,
+        Query(description="Opaque cursor from a previous page's next_cursor"),
+    ] = None,
+) -> PydanticJSONResponse:
+    result = await ProductSearch(db, name_index).search(q, mode, limit, cursor)
+    return PydanticJSONResponse(PaginatedResponse[ProductRead](**result))
+
+
+@router.get(
+    "/{product_id}",
+    response_model=ProductRead,
+    status_code=status.HTTP_200_OK,
+    summary="Get product by ID",
+    description=(
+        "Sends a strong ETag; with a matching If-None-Match the response is "
+        "304 without a body."
+    ),
+)
+async def get_product(
+    product_id: int,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    cache: Annotated[ProductCache | None, Depends(get_read_product_cache)],
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    service = ProductService(db, cache)
+    if if_none_match is not None:
+        etag = await service.product_etag(product_id)
+        if etag is not None and etag_matches(if_none_match, etag):
+            return not_modified(etag, settings.products_cache_control)
+    product = await service.get_product_by_id(product_id)
+    return PydanticJSONResponse(
+        product,
+        headers=cache_headers(product_etag(product), settings.products_cache_control),
+    )
+
+
+@router.put(
+    "/{product_id}/stripes",
+    response_model=ProductRead,
+    status_code=status.HTTP_200_OK,
+    summary="Split a hot product's stock across N counters",
+    description=(
+        "With stripes > 0, concurrent orders for the product decrement "
+        "different stock rows instead of queueing on one. stock_quantity "
+        "still reports the total. stripes = 0 restores a single counter."
+    ),
+)
+async def set_stock_stripes(
+    product_id: int,
+    payload: StockStripesUpdate,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    cache: Annotated[ProductCache | None, Depends(get_product_cache)],
+) -> PydanticJSONResponse:
+    service = ProductService(db, cache)
+    product = await service.set_stock_stripes(product_id, payload.stripes)
+    return PydanticJSONResponse(product)
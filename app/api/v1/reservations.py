@@ -0,0 +1,66 @@
+"""Reservation API routes."""
+import logging
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependencies import get_db, get_product_cache
+from app.responses import PydanticJSONResponse
+from app.schemas.reservation import ReservationCreate, ReservationRead
+from app.services.product_cache import ProductCache
+from app.services.reservation_service import ReservationService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/reservations", tags=["Reservations"])
+
+
+@router.post(
+    "",
+    response_model=ReservationRead,
+    status_code=status.HTTP_201_CREATED,
+    summary="Hold stock for a limited time",
+    description=(
+        "Takes the items from available stock until expires_at, all or "
+        "nothing. Returns 400 on insufficient stock, 404 if any product is "
+        "not found. POST /orders with reservation_id turns the hold into an "
+        "order; expired holds are returned to stock in the background."
+    ),
+)
+async def create_reservation(
+    payload: ReservationCreate,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    product_cache: Annotated[ProductCache | None, Depends(get_product_cache)],
+) -> PydanticJSONResponse:
+    service = ReservationService(db, product_cache)
+    reservation = await service.reserve(payload)
+    return PydanticJSONResponse(reservation, status_code=status.HTTP_201_CREATED)
+
+
+@router.get(
+    "/{reservation_id}",
+    response_model=ReservationRead,
+    status_code=status.HTTP_200_OK,
+    summary="Get a hold that has not been consumed or returned",
+)
+async def get_reservation(
+    reservation_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> PydanticJSONResponse:
+    reservation = await ReservationService(db).get_reservation(reservation_id)
+    return PydanticJSONResponse(reservation)
+
+
+@router.delete(
+    "/{reservation_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Release a hold and return its stock now",
+)
+async def release_reservation(
+    reservation_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    product_cache: Annotated[ProductCache | None, Depends(get_product_cache)],
+) -> Response:
+    await ReservationService(db, product_cache).release(reservation_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,112 @@
+"""
+Key/value cache backends.
+
+Backends store opaque ``bytes`` under string keys; callers own serialization
+and hit/miss accounting, since only they know which lookups carry data.
+``InMemoryCacheBackend`` is a per-process LRU with TTL. ``RedisCacheBackend``
+shares entries between workers through any client exposing the async
+``get``/``set``/``delete`` subset of ``redis.asyncio.Redis``.
+"""
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class CacheBackend(ABC):
+    """Interface shared by all cache backends."""
+
+    def __init__(self) -> None:
+        self.evictions = 0
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes) -> None: ...
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None: ...
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Bounded LRU cache with a per-entry TTL.
+
+    Not thread-safe; meant for a single event loop. Expired entries are
+    dropped lazily when read. ``evictions`` counts entries pushed out by the
+    size bound.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        super().__init__()
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, value: bytes) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+
+class RedisLikeClient(Protocol):
+    async def get(self, name: str) -> Any: ...
+
+    async def set(self, name: str, value: bytes, px: int | None = None) -> Any: ...
+
+    async def delete(self, *names: str) -> Any: ...
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared cache backed by Redis (or anything speaking the same subset).
+
+    TTL is enforced by the server; evictions happen server-side too and are
+    not reflected in ``evictions``.
+    """
+
+    def __init__(
+        self, client: RedisLikeClient, ttl_seconds: float, prefix: str = "inventory:"
+    ) -> None:
+        super().__init__()
+        self._client = client
+        self._ttl_ms = int(ttl_seconds * 1000)
+        self._prefix = prefix
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._client.get(self._prefix + key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        await self._client.set(self._prefix + key, value, px=self._ttl_ms)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._client.delete(*(self._prefix + key for key in keys))
@@ -1,54 +1,169 @@
-from collections.abc import AsyncGenerator
+import logging
+import time
 
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, NullPool
 
-from app.config import get_settings
+from app.config import Settings, get_settings
+from app.metrics import DB_POOL_CHECKOUT_WAIT, CallbackMetric
+
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
-# In test mode, use NullPool to avoid event-loop binding issues across test sessions.
-_engine_kwargs: dict = {
-    "echo": settings.app_env == "development",
-    "pool_pre_ping": True,
-}
-if settings.app_env == "test":
-    _engine_kwargs["poolclass"] = NullPool
-else:
-    _engine_kwargs.update(
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+def pool_limits(settings: Settings, workers: int) -> tuple[int, int]:
+    """
+    ``(pool_size, max_overflow)`` for one of ``workers`` processes that
+    share ``db_connection_budget``. Explicit ``db_pool_size`` and
+    ``db_max_overflow`` win, with a warning if they exceed the share.
+    """
+    share = settings.db_connection_budget // max(workers, 1)
+    if settings.events_enabled:
+        share -= 1  # the change feed's LISTEN connection
+    share = max(share, 1)
+    pool_size = settings.db_pool_size
+    if pool_size is None:
+        pool_size = max(share // 2, 1)
+    max_overflow = settings.db_max_overflow
+    if max_overflow is None:
+        max_overflow = max(share - pool_size, 0)
+    if pool_size + max_overflow > share:
+        logger.warning(
+            "Pool of %d + %d overflow exceeds this worker's share (%d) of a "
+            "%d-connection budget across %d worker(s)",
+            pool_size,
+            max_overflow,
+            share,
+            settings.db_connection_budget,
+            workers,
+        )
+    return pool_size, max_overflow
+
+
+def _engine_kwargs(settings: Settings) -> dict:
+    """``create_async_engine`` arguments shared by the primary and replica."""
+    kwargs: dict = {
+        "echo": settings.app_env == "development",
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if settings.app_env == "test":
+        # NullPool avoids event-loop binding issues across test sessions.
+        kwargs["poolclass"] = NullPool
+        return kwargs
+    # app.serve exports the resolved worker count; a bare uvicorn is one.
+    pool_size, max_overflow = pool_limits(settings, settings.web_workers or 1)
+    kwargs.update(
         {
-            "pool_size": 10,
-            "max_overflow": 20,
-            "pool_timeout": 30,
-            "pool_recycle": 1800,
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": settings.db_pool_timeout,
+            "pool_recycle": settings.db_pool_recycle,
         }
     )
+    return kwargs
+
 
-engine = create_async_engine(settings.async_database_url, **_engine_kwargs)
+# The engines are created by ``create_engines`` in the app's lifespan, not at
+# import, and bound to these session factories then.
+engine: AsyncEngine | None = None
+read_engine: AsyncEngine | None = None
 
 AsyncSessionLocal = async_sessionmaker(
-    bind=engine,
     class_=AsyncSession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
 )
 
+# Optional read replica for GET endpoints; see app/replica.py for routing.
+ReadSessionLocal = (
+    async_sessionmaker(
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+    if settings.read_database_url
+    else None
+)
+
+
+def create_engines() -> None:
+    """Create the engines and bind the session factories. Opens no connections."""
+    global engine, read_engine
+    kwargs = _engine_kwargs(settings)
+    engine = create_async_engine(settings.async_database_url, **kwargs)
+    AsyncSessionLocal.configure(bind=engine)
+    if ReadSessionLocal is not None:
+        read_engine = create_async_engine(settings.read_database_url, **kwargs)
+        ReadSessionLocal.configure(bind=read_engine)
+
+
+async def dispose_engines() -> None:
+    global engine, read_engine
+    for created in (engine, read_engine):
+        if created is not None:
+            await created.dispose()
+    engine = read_engine = None
+
+
+def _pool_stat(name: str) -> int | None:
+    if engine is None or not isinstance(engine.pool, InstrumentedQueuePool):
+        return None
+    return getattr(engine.pool, name)()
+
+
+CallbackMetric(
+    "db_pool_size",
+    "Configured number of persistent connections.",
+    lambda: _pool_stat("size"),
+)
+CallbackMetric(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+    lambda: _pool_stat("checkedout"),
+)
+CallbackMetric(
+    "db_pool_overflow",
+    "Connections open beyond pool_size (negative while below it).",
+    lambda: _pool_stat("overflow"),
+)
+
 
 class Base(DeclarativeBase):
     pass
 
 
+def _require_engine() -> AsyncEngine:
+    if engine is None:
+        raise RuntimeError("No engine: call create_engines() first")
+    return engine
+
+
 async def create_all_tables() -> None:
-    async with engine.begin() as conn:
+    async with _require_engine().begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
 async def drop_all_tables() -> None:
-    async with engine.begin() as conn:
+    async with _require_engine().begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
@@ -1,8 +1,20 @@
 from collections.abc import AsyncGenerator
+from functools import lru_cache
+from typing import Annotated
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.database import AsyncSessionLocal
+from app.cache import CacheBackend, InMemoryCacheBackend, RedisCacheBackend
+from app.config import get_settings
+from app.database import AsyncSessionLocal, ReadSessionLocal
+from app.replica import ReplicaRouter
+from app.services.events import EventBroker
+from app.services.idempotency import IdempotencyCache
+from app.services.order_coalescer import OrderCoalescer
+from app.services.product_cache import ProductCache
+from app.services.product_search import ProductNameIndex
+from app.warmup import PoolWarmer
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -14,3 +26,134 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
         finally:
             await session.close()
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """For work that outlives the request-scoped session, e.g. streamed bodies."""
+    return AsyncSessionLocal
+
+
+@lru_cache
+def get_pool_warmer() -> PoolWarmer:
+    session_factories = [AsyncSessionLocal]
+    if ReadSessionLocal is not None:
+        session_factories.append(ReadSessionLocal)
+    return PoolWarmer(
+        session_factories, connections=get_settings().db_warmup_connections
+    )
+
+
+@lru_cache
+def get_replica_router() -> ReplicaRouter:
+    settings = get_settings()
+    return ReplicaRouter(
+        AsyncSessionLocal,
+        ReadSessionLocal,
+        max_lag_seconds=settings.replica_max_lag_seconds,
+        interval_seconds=settings.replica_lag_check_interval_seconds,
+    )
+
+
+async def get_read_db(
+    request: Request,
+    router: Annotated[ReplicaRouter, Depends(get_replica_router)],
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session for GET endpoints: on the replica when the router allows it."""
+    async with router.session_factory(request)() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+
+def get_read_session_factory(
+    request: Request,
+    router: Annotated[ReplicaRouter, Depends(get_replica_router)],
+) -> async_sessionmaker[AsyncSession]:
+    """``get_session_factory`` for reads, routed like ``get_read_db``."""
+    return router.session_factory(request)
+
+
+@lru_cache
+def get_product_cache() -> ProductCache | None:
+    settings = get_settings()
+    backend: CacheBackend
+    if settings.product_cache_backend == "none":
+        return None
+    if settings.product_cache_backend == "redis":
+        # Optional dependency: only needed when the shared backend is selected.
+        from redis.asyncio import Redis
+
+        backend = RedisCacheBackend(
+            Redis.from_url(settings.product_cache_redis_url),
+            ttl_seconds=settings.product_cache_ttl_seconds,
+        )
+    else:
+        backend = InMemoryCacheBackend(
+            max_entries=settings.product_cache_max_entries,
+            ttl_seconds=settings.product_cache_ttl_seconds,
+        )
+    return ProductCache(backend)
+
+
+def get_read_product_cache(
+    request: Request,
+    router: Annotated[ReplicaRouter, Depends(get_replica_router)],
+    cache: Annotated[ProductCache | None, Depends(get_product_cache)],
+) -> ProductCache | None:
+    """
+    The product cache for ``get_read_db`` reads. Replica reads only read
+    it: what they load may predate a write that just invalidated the entry.
+    A client pinned to the primary bypasses it, since a write invalidates
+    only its own worker's in-memory entries.
+    """
+    if cache is None or router.pinned_to_primary(request):
+        return None
+    return cache.read_only() if router.reads_replica(request) else cache
+
+
+@lru_cache
+def get_product_name_index() -> ProductNameIndex | None:
+    settings = get_settings()
+    if not settings.product_search_index:
+        return None
+    return ProductNameIndex(
+        AsyncSessionLocal,
+        interval_seconds=settings.product_search_index_refresh_seconds,
+    )
+
+
+@lru_cache
+def get_order_coalescer() -> OrderCoalescer | None:
+    settings = get_settings()
+    if settings.order_coalesce_window_ms <= 0:
+        return None
+    return OrderCoalescer(
+        AsyncSessionLocal,
+        window_ms=settings.order_coalesce_window_ms,
+        max_batch=settings.order_coalesce_max_batch,
+        product_cache=get_product_cache(),
+    )
+
+
+@lru_cache
+def get_idempotency_cache() -> IdempotencyCache:
+    settings = get_settings()
+    return IdempotencyCache(
+        InMemoryCacheBackend(
+            max_entries=settings.idempotency_cache_max_entries,
+            ttl_seconds=settings.idempotency_key_ttl_seconds,
+        )
+    )
+
+
+@lru_cache
+def get_event_broker() -> EventBroker:
+    """This worker's change-feed broker, shared by every event stream."""
+    settings = get_settings()
+    return EventBroker(
+        settings.async_database_url, queue_size=settings.events_queue_size
+    )
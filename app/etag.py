@@ -0,0 +1,56 @@
+"""
+Strong ETags and conditional GET helpers.
+
+A resource's ETag is an MD5 over a few cheap fields per row (id,
+``updated_at`` and anything that changes without touching ``updated_at``)
+plus, for pages, the total and whether another page follows. The same
+fields are available on the response DTOs and from a narrow metadata query,
+so a route can answer ``If-None-Match`` with a 304 without loading or
+serializing the rows, and compute the tag of a full response from what it is
+about to send.
+"""
+import hashlib
+from collections.abc import Iterable
+
+from fastapi import Response, status
+
+
+def make_etag(*parts: object) -> str:
+    """Strong ETag over ``parts``; each must have a stable ``str()``."""
+    raw = "\x1f".join(map(str, parts)).encode()
+    return f'"{hashlib.md5(raw, usedforsecurity=False).hexdigest()}"'
+
+
+def page_etag(
+    total: int | None,
+    total_is_estimate: bool,
+    has_more: bool,
+    row_tags: Iterable[str],
+) -> str:
+    return make_etag(total, total_is_estimate, has_more, *row_tags)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """``If-None-Match`` comparison: weak, so ``W/`` prefixes are ignored."""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def cache_headers(etag: str, cache_control: str) -> dict[str, str]:
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return headers
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=cache_headers(etag, cache_control),
+    )
@@ -46,3 +46,21 @@ class InvalidStatusTransitionError(AppError):
 class ConflictError(AppError):
     def __init__(self, message: str) -> None:
         super().__init__(message)
+
+
+class ReservationExpiredError(ConflictError):
+    """A hold past its TTL; its stock goes back once the sweeper reaches it."""
+
+    def __init__(self, reservation_id: int) -> None:
+        self.reservation_id = reservation_id
+        super().__init__(f"Reservation with id={reservation_id} has expired.")
+
+
+class InvalidCursorError(AppError):
+    def __init__(self, cursor: str) -> None:
+        self.cursor = cursor
+        super().__init__("Invalid or malformed pagination cursor.")
+
+
+class ImportFormatError(AppError):
+    """An upload that cannot be parsed at all, as opposed to a bad row."""
@@ -1,21 +1,47 @@
 import logging
 import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Annotated
 
-from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
+from app.database import AsyncSessionLocal, create_engines, dispose_engines
+from app.dependencies import (
+    get_event_broker,
+    get_pool_warmer,
+    get_product_cache,
+    get_product_name_index,
+    get_replica_router,
+)
 from app.exceptions import (
     AppError,
     ConflictError,
+    ImportFormatError,
     InsufficientStockError,
+    InvalidCursorError,
     InvalidStatusTransitionError,
     NotFoundError,
 )
+from app.metrics import APP_ERRORS, REGISTRY, CallbackMetric, MetricsMiddleware
+from app.replica import ReadYourWritesMiddleware, ReplicaRouter
+from app.responses import PydanticJSONResponse
+from app.services.idempotency import IdempotencyKeyPurger
+from app.services.product_cache import ProductCache
+from app.services.product_search import ProductNameIndex
+from app.services.reservation_service import ReservationSweeper
+from app.services.stock_stripes import StockRebalancer
+from app.warmup import PoolWarmer
 from app.api.v1 import products as products_router
 from app.api.v1 import orders as orders_router
+from app.api.v1 import analytics as analytics_router
+from app.api.v1 import events as events_router
+from app.api.v1 import reservations as reservations_router
 
 settings = get_settings()
 
@@ -27,6 +53,54 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Engines are created here rather than at import; no connection is opened
+    # until the pool warmer (or the first request) asks for one.
+    create_engines()
+    tasks: list[
+        PoolWarmer
+        | StockRebalancer
+        | IdempotencyKeyPurger
+        | ReplicaRouter
+        | ProductNameIndex
+        | ReservationSweeper
+    ] = [get_pool_warmer(), get_replica_router()]
+    if settings.stock_rebalance_interval_seconds > 0:
+        tasks.append(
+            StockRebalancer(
+                AsyncSessionLocal, settings.stock_rebalance_interval_seconds
+            )
+        )
+    if settings.idempotency_purge_interval_seconds > 0:
+        tasks.append(
+            IdempotencyKeyPurger(
+                AsyncSessionLocal,
+                ttl_seconds=settings.idempotency_key_ttl_seconds,
+                interval_seconds=settings.idempotency_purge_interval_seconds,
+            )
+        )
+    if settings.reservation_sweep_interval_seconds > 0:
+        tasks.append(
+            ReservationSweeper(
+                AsyncSessionLocal,
+                interval_seconds=settings.reservation_sweep_interval_seconds,
+                batch_size=settings.reservation_sweep_batch_size,
+                product_cache=get_product_cache(),
+            )
+        )
+    name_index = get_product_name_index()
+    if name_index is not None:
+        tasks.append(name_index)
+    for task in tasks:
+        task.start()
+    yield
+    for task in tasks:
+        await task.stop()
+    await get_event_broker().stop()
+    await dispose_engines()
+
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.app_title,
@@ -37,6 +111,8 @@ def create_app() -> FastAPI:
         ),
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
+        default_response_class=PydanticJSONResponse,
     )
 
     app.add_middleware(
@@ -47,11 +123,23 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    app.add_middleware(MetricsMiddleware)
+
+    if settings.read_database_url:
+        app.add_middleware(
+            ReadYourWritesMiddleware,
+            window_seconds=settings.read_your_writes_seconds,
+        )
+
     app.include_router(products_router.router, prefix="/api/v1")
     app.include_router(orders_router.router, prefix="/api/v1")
+    app.include_router(reservations_router.router, prefix="/api/v1")
+    app.include_router(analytics_router.router, prefix="/api/v1")
+    app.include_router(events_router.router, prefix="/api/v1")
 
     @app.exception_handler(NotFoundError)
     async def not_found_handler(request: Request, exc: NotFoundError) -> JSONResponse:
+        APP_ERRORS.inc(type(exc).__name__)
         logger.warning("Not found: %s", exc.message)
         return JSONResponse(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -62,6 +150,7 @@ def create_app() -> FastAPI:
     async def insufficient_stock_handler(
         request: Request, exc: InsufficientStockError
     ) -> JSONResponse:
+        APP_ERRORS.inc(type(exc).__name__)
         logger.warning("Insufficient stock: %s", exc.message)
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -77,16 +166,40 @@ def create_app() -> FastAPI:
     async def invalid_transition_handler(
         request: Request, exc: InvalidStatusTransitionError
     ) -> JSONResponse:
+        APP_ERRORS.inc(type(exc).__name__)
         logger.warning("Invalid status transition: %s", exc.message)
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"detail": exc.message},
         )
 
+    @app.exception_handler(InvalidCursorError)
+    async def invalid_cursor_handler(
+        request: Request, exc: InvalidCursorError
+    ) -> JSONResponse:
+        APP_ERRORS.inc(type(exc).__name__)
+        logger.warning("Invalid cursor: %r", exc.cursor)
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": exc.message},
+        )
+
+    @app.exception_handler(ImportFormatError)
+    async def import_format_handler(
+        request: Request, exc: ImportFormatError
+    ) -> JSONResponse:
+        APP_ERRORS.inc(type(exc).__name__)
+        logger.warning("Rejected import: %s", exc.message)
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": exc.message},
+        )
+
     @app.exception_handler(ConflictError)
     async def conflict_handler(
         request: Request, exc: ConflictError
     ) -> JSONResponse:
+        APP_ERRORS.inc(type(exc).__name__)
         logger.warning("Conflict: %s", exc.message)
         return JSONResponse(
             status_code=status.HTTP_409_CONFLICT,
@@ -97,6 +210,7 @@ def create_app() -> FastAPI:
     async def generic_app_error_handler(
         request: Request, exc: AppError
     ) -> JSONResponse:
+        APP_ERRORS.inc(type(exc).__name__)
         logger.error("Unhandled app error: %s", exc.message)
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -110,15 +224,76 @@ def create_app() -> FastAPI:
         logger.warning("Request validation error: %s", exc.errors())
         return JSONResponse(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            content={"detail": exc.errors()},
+            # Model validators put the raised ValueError in the error context.
+            content={"detail": jsonable_encoder(exc.errors())},
         )
 
     @app.get("/health", tags=["Health"], include_in_schema=False)
     async def health_check() -> dict[str, str]:
         return {"status": "ok", "version": settings.app_version}
 
+    # 503 until the pools are warmed, so a load balancer keeps traffic away
+    # from a worker that would answer its first requests cold.
+    @app.get("/ready", tags=["Health"], include_in_schema=False)
+    async def readiness_check(
+        warmer: Annotated[PoolWarmer, Depends(get_pool_warmer)],
+    ) -> JSONResponse:
+        if not warmer.ready:
+            return JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"status": "warming up"},
+            )
+        return JSONResponse(content={"status": "ready"})
+
+    @app.get("/cache/stats", tags=["Health"], include_in_schema=False)
+    async def cache_stats(
+        product_cache: Annotated[ProductCache | None, Depends(get_product_cache)],
+    ) -> dict[str, dict[str, int]]:
+        if product_cache is None:
+            return {}
+        stats = product_cache.stats
+        return {
+            "products": {
+                "hits": stats.hits,
+                "misses": stats.misses,
+                "evictions": stats.evictions,
+            }
+        }
+
+    @app.get("/metrics", tags=["Health"], include_in_schema=False)
+    async def metrics() -> PlainTextResponse:
+        return PlainTextResponse(
+            REGISTRY.render(), media_type="text/plain; version=0.0.4"
+        )
+
     logger.info("Application started: %s v%s", settings.app_title, settings.app_version)
     return app
 
 
+def _product_cache_stat(name: str) -> int | None:
+    product_cache = get_product_cache()
+    return None if product_cache is None else getattr(product_cache.stats, name)
+
+
+# Registered once per process, not per create_app() call.
+for stat in ("hits", "misses", "evictions"):
+    CallbackMetric(
+        f"product_cache_{stat}_total",
+        f"Product cache {stat}.",
+        lambda stat=stat: _product_cache_stat(stat),
+        metric_type="counter",
+    )
+
+CallbackMetric(
+    "replica_lag_seconds",
+    "Last measured read-replica lag (absent while unknown or unconfigured).",
+    lambda: get_replica_router().lag,
+)
+CallbackMetric(
+    "event_subscribers",
+    "Open event streams on this worker.",
+    lambda: get_event_broker().subscriber_count,
+)
+
+
 app = create_app()
@@ -0,0 +1,240 @@
+"""
+In-process metrics exported in the Prometheus text format.
+
+The collectors are plain counters and bucket arrays updated from the event
+loop thread, so recording a sample is a dict lookup plus an increment: no
+locks, no allocation on the hot path once a label set has been seen. Values
+computed elsewhere (pool size, cache stats) are read by callbacks at scrape
+time.
+"""
+import bisect
+import time
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    metric_type = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        REGISTRY.register(self)
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def samples(self) -> Iterator[str]:
+        for labelvalues, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {value}"
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._buckets = buckets
+        # Per label set: [per-bucket counts..., +Inf count, sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        state = self._values.get(labelvalues)
+        if state is None:
+            state = self._values[labelvalues] = [0.0] * (len(self._buckets) + 2)
+        state[bisect.bisect_left(self._buckets, value)] += 1
+        state[-1] += value
+
+    def samples(self) -> Iterator[str]:
+        bucket_names = ("le", *self.labelnames)
+        for labelvalues, state in self._values.items():
+            cumulative = 0.0
+            for bound, count in zip((*self._buckets, float("inf")), state):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _format_labels(bucket_names, (le, *labelvalues))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {state[-1]}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class CallbackMetric(_Metric):
+    """A gauge or counter whose value is read from ``callback`` at scrape time."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], float | None],
+        metric_type: str = "gauge",
+    ) -> None:
+        super().__init__(name, documentation)
+        self.metric_type = metric_type
+        self._callback = callback
+
+    def samples(self) -> Iterator[str]:
+        value = self._callback()
+        if value is not None:
+            yield f"{self.name} {value}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP responses by method, route template and status code.",
+    ("method", "route", "status"),
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time from request receipt to the end of the response body.",
+    ("method", "route"),
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection (bounded by pool_timeout).",
+)
+ORDER_LOCK_WAIT = Histogram(
+    "order_lock_wait_seconds",
+    "Time spent acquiring product row locks while creating orders.",
+    ("strategy",),
+)
+ORDER_TRANSACTION = Histogram(
+    "order_transaction_seconds",
+    "Order creation transaction time, from the first statement to commit.",
+    ("strategy",),
+)
+EVENT_SUBSCRIBER_EVICTIONS = Counter(
+    "event_subscriber_evictions_total",
+    "Event stream subscribers dropped for letting their queue fill up.",
+)
+SINGLE_FLIGHT_COLLAPSED = Counter(
+    "single_flight_collapsed_total",
+    "Reads that joined an identical in-flight query instead of running one.",
+    ("call",),
+)
+APP_ERRORS = Counter(
+    "app_errors_total",
+    "Domain exceptions answered as error responses, by exception class.",
+    ("type",),
+)
+
+
+class MetricsMiddleware:
+    """
+    Records per-route latency and status counts for HTTP requests.
+
+    The route label is the matched path template (``/api/v1/orders/{order_id}``)
+    so cardinality stays bounded; requests that match no route are labelled
+    ``unmatched``.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._templates: dict[Any, str] = {}
+
+    def _route_template(self, scope: Scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        template = self._templates.get(endpoint)
+        if template is None:
+            router_app = scope["app"]
+            for route in router_app.routes:
+                if getattr(route, "endpoint", None) is endpoint:
+                    template = route.path
+                    break
+            else:
+                template = "unmatched"
+            self._templates[endpoint] = template
+        return template
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = self._route_template(scope)
+            method = scope["method"]
+            HTTP_LATENCY.observe(time.perf_counter() - started, method, route)
+            HTTP_REQUESTS.inc(method, route, str(status_code))
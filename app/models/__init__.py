@@ -2,5 +2,19 @@
 from app.models.product import Product
 from app.models.order import Order, OrderStatus
 from app.models.order_item import OrderItem
+from app.models.product_daily_sales import ProductDailySales
+from app.models.product_stock_stripe import ProductStockStripe
+from app.models.idempotency_key import IdempotencyKey
+from app.models.reservation import Reservation, ReservationItem
 
-__all__ = ["Product", "Order", "OrderStatus", "OrderItem"]
+__all__ = [
+    "Product",
+    "Order",
+    "OrderStatus",
+    "OrderItem",
+    "ProductDailySales",
+    "ProductStockStripe",
+    "IdempotencyKey",
+    "Reservation",
+    "ReservationItem",
+]
@@ -0,0 +1,36 @@
+"""IdempotencyKey ORM model — deduplicates retried order submissions."""
+from datetime import datetime
+
+from sqlalchemy import Index, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    A client-supplied ``Idempotency-Key`` and the order it produced.
+
+    The row is inserted before the order's stock is touched and committed
+    with it, so a key exists exactly when its order does. ``fingerprint``
+    is a hash of the request body; reusing a key for a different body is a
+    conflict. ``response`` is the serialized ``OrderRead`` replayed to
+    retries.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    __table_args__ = (
+        # Background purge of expired keys.
+        Index("ix_idempotency_keys_created_at", "created_at"),
+    )
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    response: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        nullable=False, server_default=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<IdempotencyKey key={self.key!r}>"
@@ -2,7 +2,7 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import Enum as SAEnum, func
+from sqlalchemy import Enum as SAEnum, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -17,6 +17,24 @@ class OrderStatus(str, enum.Enum):
 class Order(Base):
     __tablename__ = "orders"
 
+    __table_args__ = (
+        # Serves ORDER BY created_at DESC, id DESC and the keyset seek predicate.
+        Index("ix_orders_created_at_id", "created_at", "id"),
+        # Status-filtered listing: equality on status, then the same order/seek.
+        # Also serves plain status lookups, so status has no index of its own.
+        Index("ix_orders_status_created_at_id", "status", "created_at", "id"),
+        # The fulfilment queue: small because orders leave Pending quickly.
+        Index(
+            "ix_orders_pending_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("status = 'Pending'"),
+        ),
+        # created_at follows insertion order, so a BRIN index covers date
+        # ranges over the whole table for a few pages of storage.
+        Index("ix_orders_created_at_brin", "created_at", postgresql_using="brin"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     status: Mapped[OrderStatus] = mapped_column(
         SAEnum(
@@ -27,7 +45,6 @@ class Order(Base):
         ),
         nullable=False,
         default=OrderStatus.PENDING,
-        index=True,
     )
     created_at: Mapped[datetime] = mapped_column(
         nullable=False, server_default=func.now()
@@ -2,7 +2,16 @@
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import CheckConstraint, Numeric, String, func
+from sqlalchemy import (
+    CheckConstraint,
+    Index,
+    Numeric,
+    SmallInteger,
+    String,
+    func,
+    literal_column,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -13,12 +22,34 @@ class Product(Base):
 
     __table_args__ = (
         CheckConstraint("stock_quantity >= 0", name="ck_product_stock_non_negative"),
+        # GET /products/search, prefix mode: lowercased names in byte order,
+        # so a prefix is a range seek and pages come out of the index in order.
+        Index(
+            "ix_products_name_prefix",
+            func.lower(literal_column("name")).collate("C"),
+            "id",
+        ),
+        # GET /products/search, fuzzy mode: every word of the name.
+        Index(
+            "ix_products_name_search",
+            func.to_tsvector(
+                literal_column("'simple'", REGCONFIG), literal_column("name")
+            ),
+            postgresql_using="gin",
+        ),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     price: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
     stock_quantity: Mapped[int] = mapped_column(nullable=False, default=0)
+    # 0: stock lives in stock_quantity. N > 0: stock is split across N
+    # product_stock_stripes rows and stock_quantity only holds stock added
+    # since the last rebalance. ``total_stock`` (see product_stock_stripe.py)
+    # is the sum either way.
+    stock_stripes: Mapped[int] = mapped_column(
+        SmallInteger, nullable=False, default=0, server_default="0"
+    )
     created_at: Mapped[datetime] = mapped_column(
         nullable=False, server_default=func.now()
     )
@@ -0,0 +1,49 @@
+"""ProductDailySales ORM model — per-product, per-day sales totals."""
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Date, ForeignKey, Index, Integer, Numeric, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class ProductDailySales(Base):
+    """
+    Running totals maintained in the same transaction as the orders they
+    summarise: incremented when an order is created, decremented when it is
+    cancelled. ``day`` is the order's ``created_at`` date; a product's totals
+    for a day are the sum over its slots. Rebuild from history with
+    ``python -m app.rebuild_sales``.
+    """
+
+    __tablename__ = "product_daily_sales"
+
+    __table_args__ = (
+        # Date-range rollups across all products.
+        Index("ix_product_daily_sales_day", "day"),
+    )
+
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    # Striped products spread a day's totals over several rows so concurrent
+    # orders do not serialise on one; everything else uses slot 0.
+    slot: Mapped[int] = mapped_column(
+        SmallInteger, primary_key=True, server_default="0"
+    )
+
+    # Orders containing the product; summing across products double-counts
+    # multi-product orders.
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    units: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    revenue: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2), nullable=False, default=Decimal("0")
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ProductDailySales product_id={self.product_id} day={self.day} "
+            f"units={self.units}>"
+        )
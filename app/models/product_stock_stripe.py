@@ -0,0 +1,43 @@
+"""ProductStockStripe ORM model — sub-counters for striped products."""
+from sqlalchemy import CheckConstraint, ForeignKey, Integer, SmallInteger, func, select
+from sqlalchemy.orm import Mapped, column_property, mapped_column
+
+from app.database import Base
+from app.models.product import Product
+
+
+class ProductStockStripe(Base):
+    """
+    One of ``products.stock_stripes`` counters holding a striped product's
+    stock. Orders decrement a single stripe, so concurrent orders for the
+    same product mostly lock different rows.
+    """
+
+    __tablename__ = "product_stock_stripes"
+
+    __table_args__ = (
+        CheckConstraint("quantity >= 0", name="ck_stock_stripe_non_negative"),
+    )
+
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    stripe: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return (
+            f"<ProductStockStripe product_id={self.product_id} "
+            f"stripe={self.stripe} qty={self.quantity}>"
+        )
+
+
+# Stock as clients see it: the product row plus all of its stripes. For
+# unstriped products the subquery finds no rows and adds 0.
+Product.total_stock = column_property(
+    Product.stock_quantity
+    + select(func.coalesce(func.sum(ProductStockStripe.quantity), 0))
+    .where(ProductStockStripe.product_id == Product.id)
+    .correlate_except(ProductStockStripe)
+    .scalar_subquery()
+)
@@ -0,0 +1,65 @@
+"""Reservation ORM models — time-limited stock holds."""
+from datetime import datetime
+
+from sqlalchemy import CheckConstraint, ForeignKey, Index, Integer, func, select
+from sqlalchemy.orm import Mapped, column_property, mapped_column
+
+from app.database import Base
+from app.models.product import Product
+
+
+class Reservation(Base):
+    """
+    A hold on stock until ``expires_at``, e.g. while a checkout's payment is
+    processed. The held quantities were taken from the products' stock when
+    the hold was made. The rows are deleted when an order consumes the hold,
+    when it is released, or when the sweeper returns its stock after expiry.
+    """
+
+    __tablename__ = "reservations"
+
+    __table_args__ = (
+        # Background sweep of expired holds, oldest first.
+        Index("ix_reservations_expires_at", "expires_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    expires_at: Mapped[datetime] = mapped_column(nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        nullable=False, server_default=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<Reservation id={self.id} expires_at={self.expires_at}>"
+
+
+class ReservationItem(Base):
+    __tablename__ = "reservation_items"
+
+    __table_args__ = (
+        CheckConstraint("quantity > 0", name="ck_reservation_item_quantity_positive"),
+    )
+
+    reservation_id: Mapped[int] = mapped_column(
+        ForeignKey("reservations.id", ondelete="CASCADE"), primary_key=True
+    )
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey("products.id", ondelete="RESTRICT"), primary_key=True, index=True
+    )
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<ReservationItem reservation_id={self.reservation_id} "
+            f"product_id={self.product_id} qty={self.quantity}>"
+        )
+
+
+# Stock held for a product by reservations not yet consumed, released or
+# swept. It is no longer part of the product's stock.
+Product.reserved_quantity = column_property(
+    select(func.coalesce(func.sum(ReservationItem.quantity), 0))
+    .where(ReservationItem.product_id == Product.id)
+    .correlate_except(ReservationItem)
+    .scalar_subquery()
+)
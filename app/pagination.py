@@ -0,0 +1,80 @@
+"""
+Opaque keyset-pagination cursors.
+
+A cursor encodes the sort key of the last row of a page. The next page is
+fetched with a seek predicate on that key instead of OFFSET, so the cost of
+a page does not grow with its depth.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any
+
+from app.exceptions import InvalidCursorError
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise InvalidCursorError(cursor) from exc
+    if not isinstance(payload, dict):
+        raise InvalidCursorError(cursor)
+    return payload
+
+
+def encode_order_cursor(created_at: datetime, order_id: int) -> str:
+    return encode_cursor({"c": created_at.isoformat(), "i": order_id})
+
+
+def decode_order_cursor(cursor: str) -> tuple[datetime, int]:
+    payload = decode_cursor(cursor)
+    try:
+        return datetime.fromisoformat(payload["c"]), int(payload["i"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise InvalidCursorError(cursor) from exc
+
+
+def encode_product_cursor(product_id: int) -> str:
+    return encode_cursor({"i": product_id})
+
+
+def decode_product_cursor(cursor: str) -> int:
+    payload = decode_cursor(cursor)
+    try:
+        return int(payload["i"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise InvalidCursorError(cursor) from exc
+
+
+def encode_name_cursor(key: str, product_id: int) -> str:
+    return encode_cursor({"n": key, "i": product_id})
+
+
+def decode_name_cursor(cursor: str) -> tuple[str, int]:
+    payload = decode_cursor(cursor)
+    try:
+        key, product_id = payload["n"], int(payload["i"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise InvalidCursorError(cursor) from exc
+    if not isinstance(key, str):
+        raise InvalidCursorError(cursor)
+    return key, product_id
+
+
+def encode_rank_cursor(rank: float, product_id: int) -> str:
+    return encode_cursor({"r": rank, "i": product_id})
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, int]:
+    payload = decode_cursor(cursor)
+    try:
+        return float(payload["r"]), int(payload["i"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise InvalidCursorError(cursor) from exc
@@ -0,0 +1,55 @@
+"""
+Recompute product_daily_sales from order history.
+
+    python -m app.rebuild_sales [--since 2024-01-01] [--until 2024-07-01]
+                                [--chunk-days 31] [--workers 4]
+
+Run once after migration 0004, or whenever the aggregates are suspected to
+have drifted. Windows are rebuilt in parallel, each in its own transaction.
+"""
+import argparse
+import asyncio
+import logging
+from datetime import date
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import get_settings
+from app.services.sales_service import rebuild_sales
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--since", type=date.fromisoformat, default=None)
+    parser.add_argument(
+        "--until",
+        type=date.fromisoformat,
+        default=None,
+        help="Exclusive. Pass today's date to leave the live day alone.",
+    )
+    parser.add_argument("--chunk-days", type=int, default=31)
+    parser.add_argument("--workers", type=int, default=4)
+    return parser.parse_args()
+
+
+async def _main(args: argparse.Namespace) -> None:
+    settings = get_settings()
+    engine = create_async_engine(
+        settings.async_database_url, pool_size=args.workers, max_overflow=0
+    )
+    try:
+        rows = await rebuild_sales(
+            engine,
+            chunk_days=args.chunk_days,
+            workers=args.workers,
+            since=args.since,
+            until=args.until,
+        )
+    finally:
+        await engine.dispose()
+    print(f"Rebuilt {rows} product/day row(s).")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(message)s")
+    asyncio.run(_main(_parse_args()))
@@ -0,0 +1,143 @@
+"""Read-replica routing with read-your-writes and a replica lag check."""
+import asyncio
+import logging
+import math
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Set on responses to successful writes; while present, the client's reads go
+# to the primary.
+PRIMARY_READS_COOKIE = "read_primary"
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Seconds the replica's replayed state is behind the primary, or NULL when
+# it is a standby with no WAL receiver streaming from the primary: one that
+# lost its upstream has replayed everything it received and would otherwise
+# look caught up forever. A server not in recovery (e.g. a second plain
+# database in tests) has no lag, and neither does a streaming standby that
+# has replayed everything it received, however long ago the last
+# transaction was. Without pg_read_all_stats the receiver's status reads as
+# NULL, and only its presence is checked.
+_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver "
+    "WHERE coalesce(status, 'streaming') = 'streaming') THEN NULL "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaRouter:
+    """
+    Picks the session factory for a read: the replica, unless the client
+    wrote recently (it carries ``PRIMARY_READS_COOKIE``, see
+    ``ReadYourWritesMiddleware``) or the replica is unhealthy.
+
+    A background task measures the replica's lag every ``interval_seconds``.
+    Reads fall back to the primary while the lag exceeds ``max_lag_seconds``,
+    and while it is unknown: before the first check, when the check fails,
+    or while the replica is not streaming WAL from the primary.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replica: async_sessionmaker[AsyncSession] | None,
+        max_lag_seconds: float,
+        interval_seconds: float = 1.0,
+    ) -> None:
+        self._primary = primary
+        self._replica = replica
+        self._max_lag = max_lag_seconds
+        self._interval = interval_seconds
+        self._task: asyncio.Task[None] | None = None
+        self.lag: float | None = None
+
+    @property
+    def replica_healthy(self) -> bool:
+        return self.lag is not None and self.lag <= self._max_lag
+
+    def pinned_to_primary(self, conn: HTTPConnection) -> bool:
+        return PRIMARY_READS_COOKIE in conn.cookies
+
+    def reads_replica(self, conn: HTTPConnection) -> bool:
+        return (
+            self._replica is not None
+            and not self.pinned_to_primary(conn)
+            and self.replica_healthy
+        )
+
+    def session_factory(self, conn: HTTPConnection) -> async_sessionmaker[AsyncSession]:
+        return self._replica if self.reads_replica(conn) else self._primary
+
+    async def run_once(self) -> float | None:
+        if self._replica is None:
+            return None
+        was_healthy = self.replica_healthy
+        try:
+            async with self._replica() as session:
+                lag = await session.scalar(_LAG_QUERY)
+        except Exception:
+            if self.lag is not None:
+                logger.exception("Replica lag check failed; reading from the primary")
+            self.lag = None
+            return None
+        self.lag = None if lag is None else float(lag)
+        if self.lag is None:
+            if was_healthy:
+                logger.warning("Replica is not streaming: reading from the primary")
+        elif self.replica_healthy and not was_healthy:
+            logger.info("Replica lag %.3fs: reading from the replica", self.lag)
+        elif was_healthy and not self.replica_healthy:
+            logger.warning("Replica lag %.3fs: reading from the primary", self.lag)
+        return self.lag
+
+    async def _run(self) -> None:
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self._interval)
+
+    def start(self) -> None:
+        if self._replica is not None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Marks clients that just wrote: every successful non-safe request gets
+    ``PRIMARY_READS_COOKIE`` for ``window_seconds``, so the writer's own
+    reads skip the replica until it has had time to catch up. The cookie
+    works across workers and needs no shared state.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: float) -> None:
+        self.app = app
+        self._cookie = (
+            f"{PRIMARY_READS_COOKIE}=1; Max-Age={math.ceil(window_seconds)}; "
+            "Path=/; HttpOnly; SameSite=Lax"
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(scope=message).append("set-cookie", self._cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,30 @@
+"""
+JSON responses serialized by Pydantic.
+
+FastAPI's default path validates a route's return value against its
+``response_model``, converts it to plain Python objects and then runs
+``json.dumps``. A route that already holds the validated model can return
+``PydanticJSONResponse(model)`` instead: the model is written straight to
+JSON bytes by pydantic-core in one pass. The output is byte-for-byte what
+the default path produces (``Decimal`` as a string, ISO datetimes, compact
+separators, non-ASCII unescaped).
+"""
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    ``JSONResponse`` that renders Pydantic models with ``model_dump_json``.
+
+    Anything else (error handlers' dicts, plain route return values) is
+    rendered by ``JSONResponse`` as before, so this is safe as the app-wide
+    ``default_response_class``.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json(by_alias=True).encode()
+        return super().render(content)
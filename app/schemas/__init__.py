@@ -1,6 +1,16 @@
 """Schemas package."""
-from app.schemas.product import ProductCreate, ProductRead
+from app.schemas.product import (
+    ProductCreate,
+    ProductImportError,
+    ProductImportResult,
+    ProductRead,
+    StockStripesUpdate,
+)
 from app.schemas.order import (
+    OrderBatchCreate,
+    OrderBatchError,
+    OrderBatchResponse,
+    OrderBatchResult,
     OrderCreate,
     OrderItemInput,
     OrderItemRead,
@@ -8,10 +18,18 @@ from app.schemas.order import (
     OrderStatusUpdate,
 )
 from app.schemas.common import PaginatedResponse, ErrorDetail
+from app.schemas.analytics import ProductSales, SalesBucket, SalesReport
 
 __all__ = [
     "ProductCreate",
+    "ProductImportError",
+    "ProductImportResult",
     "ProductRead",
+    "StockStripesUpdate",
+    "OrderBatchCreate",
+    "OrderBatchError",
+    "OrderBatchResponse",
+    "OrderBatchResult",
     "OrderCreate",
     "OrderItemInput",
     "OrderItemRead",
@@ -19,4 +37,7 @@ __all__ = [
     "OrderStatusUpdate",
     "PaginatedResponse",
     "ErrorDetail",
+    "ProductSales",
+    "SalesBucket",
+    "SalesReport",
 ]
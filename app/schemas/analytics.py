@@ -0,0 +1,32 @@
+"""Analytics Pydantic schemas."""
+from datetime import date
+from decimal import Decimal
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict
+
+
+class SalesBucket(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    period: date
+    units: int
+    revenue: Decimal
+
+
+class ProductSales(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    product_id: int
+    name: str
+    order_count: int
+    units: int
+    revenue: Decimal
+
+
+class SalesReport(BaseModel):
+    granularity: Literal["day", "week", "month"]
+    date_from: date | None
+    date_to: date | None
+    buckets: list[SalesBucket]
+    top_products: list[ProductSales]
@@ -9,12 +9,24 @@ T = TypeVar("T")
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
-    """Generic paginated response wrapper."""
+    """
+    Generic paginated response wrapper.
+
+    ``offset`` is ``None`` for pages fetched by cursor. ``next_cursor`` is set
+    whenever more rows follow and can be passed back as ``cursor`` to seek to
+    the next page, regardless of how the current page was fetched.
+
+    ``total`` is ``None`` with ``total_mode=none`` and on search pages, and
+    approximate when ``total_is_estimate`` is set (see
+    ``app.services.list_totals``).
+    """
 
     items: list[T]
-    total: int
+    total: int | None
+    total_is_estimate: bool = False
     limit: int
-    offset: int
+    offset: int | None
+    next_cursor: str | None = None
 
 
 class ErrorDetail(BaseModel):
@@ -1,9 +1,11 @@
 """Order Pydantic schemas."""
 from datetime import datetime
 from decimal import Decimal
+from typing import Literal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
+from app.config import get_settings
 from app.models.order import OrderStatus
 
 
@@ -13,7 +15,16 @@ class OrderItemInput(BaseModel):
 
 
 class OrderCreate(BaseModel):
-    items: list[OrderItemInput] = Field(..., min_length=1)
+    # Either the items to order, or a hold from POST /reservations whose
+    # items become the order.
+    items: list[OrderItemInput] = Field(default_factory=list)
+    reservation_id: int | None = Field(None, gt=0, examples=[None])
+
+    @model_validator(mode="after")
+    def _items_or_reservation(self) -> "OrderCreate":
+        if bool(self.items) == (self.reservation_id is not None):
+            raise ValueError("Give either items or a reservation_id, not both.")
+        return self
 
 
 class OrderItemRead(BaseModel):
@@ -37,3 +48,36 @@ class OrderRead(BaseModel):
 
 class OrderStatusUpdate(BaseModel):
     status: OrderStatus = Field(..., examples=["Shipped"])
+
+
+class OrderBatchCreate(BaseModel):
+    orders: list[OrderCreate] = Field(
+        ..., min_length=1, max_length=get_settings().max_batch_orders
+    )
+
+    @field_validator("orders")
+    @classmethod
+    def _no_reservations(cls, orders: list[OrderCreate]) -> list[OrderCreate]:
+        if any(order.reservation_id is not None for order in orders):
+            raise ValueError("Orders from reservations cannot be batched.")
+        return orders
+
+
+class OrderBatchError(BaseModel):
+    detail: str
+    product_id: int | None = None
+    requested: int | None = None
+    available: int | None = None
+
+
+class OrderBatchResult(BaseModel):
+    index: int
+    status: Literal["created", "failed"]
+    order: OrderRead | None = None
+    error: OrderBatchError | None = None
+
+
+class OrderBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: list[OrderBatchResult]
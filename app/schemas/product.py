@@ -2,7 +2,9 @@
 from datetime import datetime
 from decimal import Decimal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
+
+from app.config import get_settings
 
 
 class ProductCreate(BaseModel):
@@ -17,6 +19,33 @@ class ProductRead(BaseModel):
     id: int
     name: str
     price: Decimal
-    stock_quantity: int
+    # Read from ``Product.total_stock`` so striped stock is included. This is
+    # the stock available to order: units held by reservations are taken out
+    # of it when the hold is made and counted in ``reserved_quantity``.
+    stock_quantity: int = Field(
+        validation_alias=AliasChoices("total_stock", "stock_quantity")
+    )
+    reserved_quantity: int = 0
+    stock_stripes: int = 0
     created_at: datetime
     updated_at: datetime
+
+
+class StockStripesUpdate(BaseModel):
+    stripes: int = Field(
+        ..., ge=0, le=get_settings().max_stock_stripes, examples=[8]
+    )
+
+
+class ProductImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class ProductImportResult(BaseModel):
+    received: int = 0
+    inserted: int = 0
+    updated: int = 0
+    failed: int = 0
+    # Capped at PRODUCT_IMPORT_MAX_ERRORS; ``failed`` has the full count.
+    errors: list[ProductImportError] = Field(default_factory=list)
@@ -0,0 +1,31 @@
+"""Reservation Pydantic schemas."""
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.config import get_settings
+from app.schemas.order import OrderItemInput
+
+
+class ReservationCreate(BaseModel):
+    items: list[OrderItemInput] = Field(..., min_length=1)
+    # Default: RESERVATION_TTL_SECONDS.
+    ttl_seconds: int | None = Field(
+        None, ge=1, le=get_settings().reservation_max_ttl_seconds, examples=[600]
+    )
+
+
+class ReservationItemRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    product_id: int
+    quantity: int
+
+
+class ReservationRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    expires_at: datetime
+    created_at: datetime
+    items: list[ReservationItemRead]
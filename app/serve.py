@@ -0,0 +1,73 @@
+"""
+Production server: uvicorn with one worker process per CPU by default.
+
+    python -m app.serve [--workers N] [--host 0.0.0.0] [--port 8000]
+
+The resolved worker count is exported as WEB_WORKERS before the workers
+start, so each sizes its connection pool from an equal share of
+DB_CONNECTION_BUDGET (see ``app.database.pool_limits``).
+"""
+import argparse
+import logging
+import os
+
+import uvicorn
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on, honouring affinity masks (e.g. cpusets)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=get_settings().web_workers,
+        help="Worker processes; 0 (the default) means one per available CPU.",
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    workers = args.workers if args.workers > 0 else available_cpus()
+    os.environ["WEB_WORKERS"] = str(workers)
+    get_settings.cache_clear()
+    settings = get_settings()
+
+    from app.database import pool_limits
+
+    pool_size, max_overflow = pool_limits(settings, workers)
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level.upper(), logging.INFO),
+        format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
+    )
+    logger.info(
+        "Starting %d worker(s); each pools %d + %d overflow connection(s) "
+        "of a %d-connection budget",
+        workers,
+        pool_size,
+        max_overflow,
+        settings.db_connection_budget,
+    )
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        log_level=settings.log_level.lower(),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,22 @@
 """Services package."""
 from app.services.product_service import ProductService
 from app.services.order_service import OrderService
+from app.services.order_coalescer import OrderCoalescer
+from app.services.order_export import OrderExporter
+from app.services.product_import import ProductImporter
+from app.services.sales_service import SalesService
+from app.services.stock_stripes import StockRebalancer, StockStripes
+from app.services.idempotency import IdempotencyCache, IdempotencyKeyPurger
 
-__all__ = ["ProductService", "OrderService"]
+__all__ = [
+    "ProductService",
+    "ProductImporter",
+    "OrderService",
+    "OrderCoalescer",
+    "OrderExporter",
+    "SalesService",
+    "StockRebalancer",
+    "StockStripes",
+    "IdempotencyCache",
+    "IdempotencyKeyPurger",
+]
@@ -0,0 +1,295 @@
+"""Change feed — NOTIFY inside write transactions, fanned out per worker."""
+import asyncio
+import json
+import logging
+from collections import deque
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from typing import Any
+
+import asyncpg
+from sqlalchemy import Select, Text, column, func, literal, select, values
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.engine import make_url
+from sqlalchemy.sql.elements import Label
+
+from app.metrics import EVENT_SUBSCRIBER_EVICTIONS
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = "inventory_events"
+
+# NOTIFY payloads must stay under 8000 bytes; events are packed into JSON
+# arrays of at most this size, one notification each.
+_MAX_PAYLOAD_BYTES = 7900
+
+# Product ids per stock_changed event built in SQL; 500 ten-digit ids still
+# fit in one payload.
+_IDS_PER_EVENT = 500
+
+Event = dict[str, Any]
+
+
+def order_created(order_id: int) -> Event:
+    return {"type": "order_created", "order_id": order_id}
+
+
+def order_status_changed(order_id: int, status: str) -> Event:
+    return {"type": "order_status_changed", "order_id": order_id, "status": status}
+
+
+def stock_changed(product_ids: Iterable[int]) -> Event:
+    return {"type": "stock_changed", "product_ids": sorted(product_ids)}
+
+
+def notify(events: Iterable[Event]) -> Label:
+    """
+    A scalar subquery that sends ``events`` on ``EVENTS_CHANNEL``, to add to
+    the RETURNING or select list of a statement the transaction runs anyway,
+    so publishing costs no round trip. Postgres evaluates it once and
+    delivers the notifications only if the transaction commits.
+    """
+    payloads = values(column("payload", Text), name="events").data(
+        [(payload,) for payload in _pack(events)]
+    )
+    return (
+        select(func.count(func.pg_notify(EVENTS_CHANNEL, payloads.c.payload)))
+        .scalar_subquery()
+        .label("notified")
+    )
+
+
+def notify_stock_changed(product_ids: Select) -> Label:
+    """
+    ``notify`` for stock_changed events whose product ids come from a
+    one-column query, e.g. over a data-modifying CTE's RETURNING, so writes
+    too large to bring their ids into Python can publish them. The ids are
+    sent sorted, ``_IDS_PER_EVENT`` per notification; none are sent for an
+    empty query.
+    """
+    ids = product_ids.subquery("ids")
+    product_id = ids.c[0]
+    numbered = select(
+        product_id.label("id"),
+        (
+            (func.row_number().over(order_by=product_id) - 1) // _IDS_PER_EVENT
+        ).label("batch"),
+    ).subquery("numbered")
+    payloads = (
+        select(
+            func.json_build_array(
+                func.json_build_object(
+                    literal("type"),
+                    literal("stock_changed"),
+                    literal("product_ids"),
+                    func.json_agg(aggregate_order_by(numbered.c.id, numbered.c.id)),
+                )
+            )
+            .cast(Text)
+            .label("payload")
+        )
+        .group_by(numbered.c.batch)
+        .subquery("payloads")
+    )
+    return (
+        select(func.count(func.pg_notify(EVENTS_CHANNEL, payloads.c.payload)))
+        .scalar_subquery()
+        .label("notified")
+    )
+
+
+def _pack(events: Iterable[Event]) -> list[str]:
+    payloads: list[str] = []
+    batch: list[str] = []
+    size = 2
+    for event in events:
+        encoded = json.dumps(event, separators=(",", ":"))
+        if batch and size + len(encoded) + 1 > _MAX_PAYLOAD_BYTES:
+            payloads.append(f"[{','.join(batch)}]")
+            batch, size = [], 2
+        batch.append(encoded)
+        size += len(encoded) + 1
+    if batch:
+        payloads.append(f"[{','.join(batch)}]")
+    return payloads
+
+
+class Subscription:
+    """
+    One subscriber's bounded queue of notifications (each a list of
+    events). Iterating yields events until the broker closes it;
+    ``evicted`` tells whether that was for falling behind.
+    """
+
+    def __init__(self, queue_size: int) -> None:
+        self._queue: asyncio.Queue[list[Event] | None] = asyncio.Queue(queue_size)
+        self._batch: deque[Event] = deque()
+        self.evicted = False
+        self.closed = False
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> Event:
+        while not self._batch:
+            batch = await self._queue.get()
+            if batch is None:
+                self._queue.put_nowait(None)
+                raise StopAsyncIteration
+            self._batch.extend(batch)
+        return self._batch.popleft()
+
+    def _offer(self, events: list[Event]) -> bool:
+        try:
+            self._queue.put_nowait(events)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def _close(self, evicted: bool = False) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.evicted = evicted
+        # Drop what is queued: the end-of-stream marker must fit, and an
+        # evicted client refetches rather than replays.
+        self._batch.clear()
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+
+class EventBroker:
+    """
+    Fans ``EVENTS_CHANNEL`` out to this worker's subscribers over a single
+    LISTEN connection, opened when the first subscriber arrives.
+
+    Each subscriber gets a queue of ``queue_size`` notifications, each at
+    most 8000 bytes of events. One that is full when a notification arrives
+    is evicted, not waited for: its stream ends and the client reconnects
+    and refetches, so a slow reader neither delays the others nor grows
+    memory. If the LISTEN connection drops, it is re-opened and subscribers
+    get a ``resync`` event, since anything sent meanwhile was missed.
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        queue_size: int = 256,
+        reconnect_seconds: float = 1.0,
+    ) -> None:
+        self._dsn = make_url(database_url).set(drivername="postgresql")
+        self._queue_size = queue_size
+        self._reconnect_seconds = reconnect_seconds
+        self._subscribers: set[Subscription] = set()
+        self._conn: asyncpg.Connection | None = None
+        self._connect_lock = asyncio.Lock()
+        self._reconnect_task: asyncio.Task[None] | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    async def listen(self) -> None:
+        """Open the LISTEN connection unless it is already up."""
+        async with self._connect_lock:
+            if self._conn is not None and not self._conn.is_closed():
+                return
+            conn = await asyncpg.connect(
+                self._dsn.render_as_string(hide_password=False)
+            )
+            await conn.add_listener(EVENTS_CHANNEL, self._on_notification)
+            conn.add_termination_listener(self._on_termination)
+            self._conn = conn
+            logger.info("Listening on %s", EVENTS_CHANNEL)
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[Subscription]:
+        await self.listen()
+        subscription = Subscription(self._queue_size)
+        self._subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscribers.discard(subscription)
+            subscription._close()
+
+    def publish(self, events: list[Event]) -> None:
+        """Queue ``events`` for every subscriber, evicting any that are full."""
+        for subscription in list(self._subscribers):
+            if not subscription._offer(events):
+                self._subscribers.discard(subscription)
+                subscription._close(evicted=True)
+                EVENT_SUBSCRIBER_EVICTIONS.inc()
+                logger.warning("Evicted a slow event subscriber")
+
+    def _on_notification(
+        self, conn: asyncpg.Connection, pid: int, channel: str, payload: str
+    ) -> None:
+        try:
+            events = json.loads(payload)
+        except json.JSONDecodeError:
+            logger.warning("Ignoring malformed notification: %.200s", payload)
+            return
+        self.publish(events)
+
+    def _on_termination(self, conn: asyncpg.Connection) -> None:
+        if conn is not self._conn:
+            return
+        self._conn = None
+        if self._subscribers:
+            logger.warning("LISTEN connection lost; reconnecting")
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        while self._subscribers:
+            await asyncio.sleep(self._reconnect_seconds)
+            try:
+                await self.listen()
+            except (OSError, asyncpg.PostgresError):
+                logger.exception("Reconnecting the LISTEN connection failed")
+                continue
+            self.publish([{"type": "resync"}])
+            return
+
+    async def stop(self) -> None:
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            await asyncio.gather(self._reconnect_task, return_exceptions=True)
+        for subscription in self._subscribers:
+            subscription._close()
+        self._subscribers.clear()
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            await conn.close()
+
+
+async def sse_stream(
+    broker: EventBroker, keepalive_seconds: float, retry_ms: int = 3000
+) -> AsyncIterator[bytes]:
+    """
+    A subscription as a ``text/event-stream`` body: one SSE message per
+    event, named after its type, and a comment line whenever the stream
+    has been idle for ``keepalive_seconds`` so proxies keep it open. An
+    evicted subscriber gets a final ``evicted`` event.
+    """
+    async with broker.subscribe() as subscription:
+        yield f"retry: {retry_ms}\n\n".encode()
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    anext(subscription), keepalive_seconds
+                )
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            except StopAsyncIteration:
+                break
+            yield _sse_message(event)
+        if subscription.evicted:
+            yield _sse_message({"type": "evicted"})
+
+
+def _sse_message(event: Event) -> bytes:
+    data = json.dumps(event, separators=(",", ":"))
+    return f"event: {event['type']}\ndata: {data}\n\n".encode()
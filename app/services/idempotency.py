@@ -0,0 +1,190 @@
+"""Idempotent order creation — key claims, in-process replay and purge."""
+import asyncio
+import hashlib
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from pydantic import BaseModel
+from sqlalchemy import Update, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache import CacheBackend
+from app.exceptions import ConflictError
+from app.models.idempotency_key import IdempotencyKey
+from app.schemas.order import OrderRead
+
+logger = logging.getLogger(__name__)
+
+_FINGERPRINT_LENGTH = 64
+
+
+@dataclass(frozen=True)
+class IdempotentRequest:
+    """An ``Idempotency-Key`` and the fingerprint of the body it was sent with."""
+
+    key: str
+    fingerprint: str
+
+    @classmethod
+    def for_payload(cls, key: str, payload: BaseModel) -> "IdempotentRequest":
+        # Unset optional fields are left out, so adding one to a request schema
+        # does not change the fingerprints of keys already stored.
+        body = payload.model_dump_json(exclude_defaults=True)
+        digest = hashlib.sha256(body.encode()).hexdigest()
+        return cls(key=key, fingerprint=digest)
+
+    def check(self, fingerprint: str) -> None:
+        if fingerprint != self.fingerprint:
+            raise ConflictError(
+                f"Idempotency-Key '{self.key}' was already used with a "
+                "different request body."
+            )
+
+
+async def claim_key(db: AsyncSession, request: IdempotentRequest) -> OrderRead | None:
+    """
+    Claim ``request.key`` in the current transaction, or return the response
+    already recorded for it.
+
+    The INSERT waits while another transaction holds an uncommitted claim on
+    the same key, so duplicates on other workers queue behind the first one
+    without touching stock: if it commits they get its response, if it rolls
+    back one of them takes over the key.
+    """
+    while True:
+        claimed = await db.scalar(
+            pg_insert(IdempotencyKey)
+            .values(key=request.key, fingerprint=request.fingerprint)
+            .on_conflict_do_nothing(index_elements=[IdempotencyKey.key])
+            .returning(IdempotencyKey.key)
+        )
+        if claimed is not None:
+            return None
+        row = (
+            await db.execute(
+                select(IdempotencyKey.fingerprint, IdempotencyKey.response).where(
+                    IdempotencyKey.key == request.key
+                )
+            )
+        ).first()
+        if row is not None:
+            request.check(row.fingerprint)
+            return OrderRead.model_validate_json(row.response)
+        # Purged between the two statements; claim it afresh.
+
+
+def record_response(request: IdempotentRequest, response: OrderRead) -> Update:
+    """Store the response for a claimed key; run it before the order commits."""
+    return (
+        update(IdempotencyKey)
+        .where(IdempotencyKey.key == request.key)
+        .values(response=response.model_dump_json())
+    )
+
+
+class IdempotencyCache:
+    """
+    Per-process front for idempotent order creation.
+
+    Completed responses are kept in ``backend`` (an LRU in practice), so a
+    retry landing on the same worker is answered without a database round
+    trip. While a key is being processed here, duplicates wait for it to
+    finish rather than opening their own transaction; if it fails, the next
+    one in line runs the request itself.
+    """
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self._backend = backend
+        self._pending: dict[str, tuple[str, asyncio.Event]] = {}
+
+    async def run(
+        self,
+        request: IdempotentRequest,
+        create: Callable[[], Awaitable[OrderRead]],
+    ) -> OrderRead:
+        while True:
+            cached = await self._backend.get(request.key)
+            if cached is not None:
+                request.check(cached[:_FINGERPRINT_LENGTH].decode())
+                return OrderRead.model_validate_json(cached[_FINGERPRINT_LENGTH:])
+            pending = self._pending.get(request.key)
+            if pending is None:
+                break
+            request.check(pending[0])
+            await pending[1].wait()
+
+        done = asyncio.Event()
+        self._pending[request.key] = (request.fingerprint, done)
+        try:
+            response = await create()
+            await self._backend.set(
+                request.key,
+                request.fingerprint.encode() + response.model_dump_json().encode(),
+            )
+            return response
+        finally:
+            del self._pending[request.key]
+            done.set()
+
+
+class IdempotencyKeyPurger:
+    """
+    Background task that deletes keys older than ``ttl_seconds``, in batches
+    of ``batch_size`` per transaction. A key is therefore honoured for at
+    least the TTL and at most one interval longer.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        ttl_seconds: float,
+        interval_seconds: float,
+        batch_size: int = 1000,
+    ) -> None:
+        self._session_factory = session_factory
+        self._ttl = timedelta(seconds=ttl_seconds)
+        self._interval = interval_seconds
+        self._batch_size = batch_size
+        self._task: asyncio.Task[None] | None = None
+
+    async def run_once(self) -> int:
+        expired = (
+            select(IdempotencyKey.key)
+            .where(IdempotencyKey.created_at < func.now() - self._ttl)
+            .limit(self._batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        purged = 0
+        async with self._session_factory() as session:
+            while True:
+                result = await session.execute(
+                    delete(IdempotencyKey)
+                    .where(IdempotencyKey.key.in_(expired.scalar_subquery()))
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+                purged += result.rowcount
+                if result.rowcount < self._batch_size:
+                    break
+        if purged:
+            logger.info("Purged %d expired idempotency key(s)", purged)
+        return purged
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Idempotency key purge failed")
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
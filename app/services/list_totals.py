@@ -0,0 +1,107 @@
+"""
+Totals for paginated lists.
+
+``total_mode`` picks what a list page reports as ``total``:
+
+* ``exact``: ``SELECT count(*)`` over the matching rows, reused from a
+  short-lived per-process cache until it expires or the table gets new rows.
+* ``estimate``: the planner's row estimate for the table from
+  ``pg_class.reltuples``, scaled to the table's current size the way the
+  planner does it. Filtered lists, and tables never analyzed, fall back to
+  the exact count.
+* ``none``: no total at all, and no query.
+"""
+from collections.abc import Hashable, Sequence
+from typing import Literal
+
+from sqlalchemy import Table, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.cache import InMemoryCacheBackend
+from app.config import get_settings
+
+TotalMode = Literal["exact", "estimate", "none"]
+
+_ESTIMATE_QUERY = text(
+    "SELECT CASE WHEN c.reltuples < 0 OR c.relpages = 0 THEN NULL "
+    "ELSE (c.reltuples / c.relpages * (pg_relation_size(c.oid) "
+    "/ current_setting('block_size')::int))::bigint END "
+    "FROM pg_class c WHERE c.oid = to_regclass(:table)"
+)
+
+
+class ExactCounts:
+    """
+    Exact counts per table, filter arguments and engine, kept for
+    ``list_total_cache_seconds``. Like ``ProductCache`` the keys carry a
+    per-table version, bumped by ``invalidate`` after rows are added or
+    change status, so a count taken before a write commits is stored under
+    an unreachable key.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self._max_entries = max_entries
+        self._backend: InMemoryCacheBackend | None = None
+        self._versions: dict[str, int] = {}
+
+    def _cache(self) -> InMemoryCacheBackend | None:
+        ttl = get_settings().list_total_cache_seconds
+        if ttl <= 0:
+            return None
+        if self._backend is None:
+            self._backend = InMemoryCacheBackend(self._max_entries, ttl)
+        return self._backend
+
+    async def count(
+        self,
+        db: AsyncSession,
+        table: Table,
+        filters: Sequence[ColumnElement[bool]],
+        key: Hashable,
+    ) -> int:
+        stmt = select(func.count()).select_from(table).where(*filters)
+        cache = self._cache()
+        if cache is None:
+            return await db.scalar(stmt) or 0
+        version = self._versions.get(table.name, 0)
+        cache_key = f"{table.name}:{version}:{id(db.bind)}:{key!r}"
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            return int(cached)
+        total = await db.scalar(stmt) or 0
+        await cache.set(cache_key, str(total).encode())
+        return total
+
+    def clear(self) -> None:
+        self._backend = None
+
+    def invalidate(self, *tables: str) -> None:
+        for table in tables:
+            self._versions[table] = self._versions.get(table, 0) + 1
+
+
+# Shared by every service in the process.
+EXACT_COUNTS = ExactCounts()
+
+
+async def page_total(
+    db: AsyncSession,
+    mode: TotalMode | None,
+    table: Table,
+    filters: Sequence[ColumnElement[bool]] = (),
+    key: Hashable = (),
+) -> tuple[int | None, bool]:
+    """
+    ``(total, total_is_estimate)`` for a list of ``table`` rows matching
+    ``filters``; ``key`` identifies the filters for the count cache. A None
+    ``mode`` uses the ``list_total_mode`` setting.
+    """
+    mode = mode or get_settings().list_total_mode
+    if mode == "none":
+        return None, False
+    if mode == "estimate" and not filters:
+        estimate = await db.scalar(_ESTIMATE_QUERY, {"table": table.name})
+        if estimate is not None:
+            return estimate, True
+    return await EXACT_COUNTS.count(db, table, filters, key), False
@@ -0,0 +1,89 @@
+"""Group-commit coalescer for concurrent order creation."""
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.exceptions import AppError
+from app.schemas.order import OrderCreate, OrderRead
+from app.services.order_service import OrderService
+from app.services.product_cache import ProductCache
+
+logger = logging.getLogger(__name__)
+
+
+class OrderCoalescer:
+    """
+    Funnels concurrent ``create_order`` calls into shared transactions.
+
+    Requests arriving within ``window_ms`` of the first pending one are applied
+    together through ``OrderService.create_orders_batch``: one transaction, one
+    lock acquisition per product and one commit for the whole group. Orders
+    are allocated in arrival order and every caller receives its own
+    ``OrderRead`` or domain error. A group is flushed early once it reaches
+    ``max_batch``.
+
+    Groups run on their own sessions from ``session_factory``; a new group can
+    start while the previous one is still committing.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        window_ms: float,
+        max_batch: int,
+        product_cache: ProductCache | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._product_cache = product_cache
+        self._window = window_ms / 1000
+        self._max_batch = max_batch
+        self._pending: list[tuple[OrderCreate, asyncio.Future[OrderRead]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def submit(self, payload: OrderCreate) -> OrderRead:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[OrderRead] = loop.create_future()
+        self._pending.append((payload, future))
+        if len(self._pending) >= self._max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._apply(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _apply(
+        self, batch: list[tuple[OrderCreate, asyncio.Future[OrderRead]]]
+    ) -> None:
+        try:
+            async with self._session_factory() as session:
+                service = OrderService(session, product_cache=self._product_cache)
+                outcomes = await service.create_orders_batch(
+                    [payload for payload, _ in batch]
+                )
+        except Exception as exc:
+            logger.exception("Coalesced batch of %d order(s) failed", len(batch))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (_, future), outcome in zip(batch, outcomes):
+            # A caller may have gone away (e.g. client disconnect) meanwhile.
+            if future.done():
+                continue
+            if isinstance(outcome, AppError):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
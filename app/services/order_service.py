@@ -1,22 +1,72 @@
 """Order service — transactional order management with pessimistic locking."""
 import logging
+import time
 from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from contextlib import suppress
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any
 
-from sqlalchemy import func, select
+from pydantic import TypeAdapter
+from sqlalchemy import (
+    Integer,
+    Select,
+    Text,
+    cast,
+    column,
+    delete,
+    exists,
+    func,
+    insert,
+    literal_column,
+    select,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.dml import Update
+from sqlalchemy.sql.elements import ColumnElement, Label
 
+from app.config import get_settings
+from app.etag import make_etag, page_etag
 from app.exceptions import (
+    AppError,
     InsufficientStockError,
     InvalidStatusTransitionError,
     NotFoundError,
+    ReservationExpiredError,
 )
+from app.metrics import ORDER_LOCK_WAIT, ORDER_TRANSACTION
 from app.models.order import Order, OrderStatus
 from app.models.order_item import OrderItem
 from app.models.product import Product
-from app.schemas.order import OrderCreate
+from app.models.reservation import Reservation, ReservationItem
+from app.pagination import decode_order_cursor, encode_order_cursor
+from app.schemas.order import OrderCreate, OrderItemInput, OrderItemRead, OrderRead
+from app.services.events import (
+    Event,
+    notify,
+    order_created,
+    order_status_changed,
+    stock_changed,
+)
+from app.services.idempotency import IdempotentRequest, claim_key, record_response
+from app.services.list_totals import EXACT_COUNTS, TotalMode, page_total
+from app.services.product_cache import ProductCache
+from app.services.sales_service import record_sales, reverse_sales
+from app.services.stock_stripes import StockStripes
+from app.singleflight import READ_FLIGHTS, single_flight
 
 logger = logging.getLogger(__name__)
 
+# Items per INSERT: 4 bind parameters each, well under asyncpg's 32767 limit
+# together with the sales upsert riding on the same statement.
+_ITEM_CHUNK = 1000
+
 # Valid status transitions; Shipped and Cancelled are terminal states.
 ALLOWED_TRANSITIONS: dict[OrderStatus, set[OrderStatus]] = {
     OrderStatus.PENDING: {OrderStatus.SHIPPED, OrderStatus.CANCELLED},
@@ -28,42 +78,72 @@ ALLOWED_TRANSITIONS: dict[OrderStatus, set[OrderStatus]] = {
 class OrderService:
     """Encapsulates all order-related database operations."""
 
-    def __init__(self, db: AsyncSession) -> None:
+    def __init__(
+        self,
+        db: AsyncSession,
+        stock_strategy: str | None = None,
+        product_cache: ProductCache | None = None,
+    ) -> None:
         self._db = db
+        settings = get_settings()
+        self._stock_strategy = stock_strategy or settings.order_stock_strategy
+        self._product_cache = product_cache
+        self._publish_events = settings.events_enabled
 
-    async def create_order(self, payload: OrderCreate) -> Order:
+    async def create_order(
+        self, payload: OrderCreate, idempotency: IdempotentRequest | None = None
+    ) -> OrderRead:
         """
         Create a new order atomically.
 
-        Products are fetched with SELECT FOR UPDATE (sorted by id to prevent
-        deadlocks). All stock is validated before any mutation. On failure the
-        transaction rolls back automatically.
-        """
-        # Aggregate quantities in case the payload contains duplicate product_ids.
-        quantity_map: dict[int, int] = defaultdict(int)
-        for item in payload.items:
-            quantity_map[item.product_id] += item.quantity
+        With the default "lock" strategy, products are fetched with SELECT FOR
+        UPDATE (sorted by id to prevent deadlocks). All stock is validated
+        before any mutation. On failure the transaction rolls back
+        automatically. See ``_create_order_conditional`` for the
+        "conditional_update" strategy.
 
-        # Sort IDs for consistent lock ordering — prevents deadlocks under concurrency.
-        product_ids = sorted(quantity_map.keys())
+        Striped products (``stock_stripes > 0``) are never locked as a whole:
+        their stock is drawn from one stripe row (see ``StockStripes.draw``)
+        after the other products are locked and validated.
 
-        result = await self._db.execute(
-            select(Product)
-            .where(Product.id.in_(product_ids))
-            .order_by(Product.id)
-            .with_for_update()
-        )
-        locked_products = result.scalars().all()
+        Every write is a single statement that returns what the response
+        needs (one stock UPDATE, INSERT ... RETURNING for the order, one
+        multi-row INSERT ... RETURNING for the items that also upserts
+        ``product_daily_sales`` and sends the change-feed NOTIFY), and the
+        result is built from those rows rather than re-read after commit.
+
+        With ``idempotency`` the key is claimed first (see ``claim_key``) and
+        the response recorded in the same transaction. A key that already
+        has an order returns that order's original response instead.
+
+        With ``payload.reservation_id`` the order is the hold's items, whose
+        stock was taken when the hold was made; see
+        ``_create_order_from_reservation``.
+        """
+        quantity_map = aggregate_quantities(payload.items)
+        if idempotency is not None:
+            replayed = await claim_key(self._db, idempotency)
+            if replayed is not None:
+                await self._db.rollback()
+                return replayed
+        if payload.reservation_id is not None:
+            return await self._create_order_from_reservation(
+                payload.reservation_id, idempotency
+            )
+        if self._stock_strategy == "conditional_update":
+            return await self._create_order_conditional(quantity_map, idempotency)
 
-        found_ids = {p.id for p in locked_products}
-        missing_ids = set(product_ids) - found_ids
+        started = time.perf_counter()
+        product_map = await self._lock_products(quantity_map.keys(), "lock")
+        striped = await self._striped_products(quantity_map.keys() - product_map.keys())
+
+        missing_ids = quantity_map.keys() - product_map.keys() - striped.keys()
         if missing_ids:
             raise NotFoundError("Product", next(iter(missing_ids)))
 
         # Validate all items before mutating anything to ensure atomicity.
-        product_map = {p.id: p for p in locked_products}
-        for product_id, requested_qty in quantity_map.items():
-            product = product_map[product_id]
+        for product_id, product in product_map.items():
+            requested_qty = quantity_map[product_id]
             if product.stock_quantity < requested_qty:
                 raise InsufficientStockError(
                     product_id=product.id,
@@ -72,76 +152,824 @@ class OrderService:
                     available=product.stock_quantity,
                 )
 
-        order = Order(status=OrderStatus.PENDING)
-        self._db.add(order)
-        await self._db.flush()
-
-        order_items: list[OrderItem] = []
-        for product_id, requested_qty in quantity_map.items():
-            product = product_map[product_id]
-            product.stock_quantity -= requested_qty
-            order_items.append(
-                OrderItem(
-                    order_id=order.id,
-                    product_id=product.id,
-                    quantity=requested_qty,
-                    price_at_time=product.price,
-                )
+        if striped:
+            await self._draw_striped(quantity_map, striped)
+        if product_map:
+            await self._db.execute(
+                _decrement_stock({pid: quantity_map[pid] for pid in product_map})
             )
+        products = product_map | striped
+        [order_row] = await self._insert_orders(1)
+        item_rows = await self._insert_items(
+            [
+                (order_row.id, product_id, requested_qty, products[product_id].price)
+                for product_id, requested_qty in quantity_map.items()
+            ],
+            _spread(striped),
+            self._notify(
+                [order_created(order_row.id), stock_changed(quantity_map.keys())]
+            ),
+        )
+        order = _order_read(order_row, item_rows)
+        if idempotency is not None:
+            await self._db.execute(record_response(idempotency, order))
+        await self._db.commit()
+        ORDER_TRANSACTION.observe(time.perf_counter() - started, "lock")
+        await self._stock_changed(quantity_map.keys())
+
+        logger.info("Created order id=%d with %d item(s)", order_row.id, len(item_rows))
+        return order
+
+    async def _create_order_conditional(
+        self,
+        quantity_map: dict[int, int],
+        idempotency: IdempotentRequest | None = None,
+    ) -> OrderRead:
+        """
+        Create an order using one guarded UPDATE instead of SELECT FOR UPDATE.
+
+        The order row is inserted first, before any product row is touched.
+        Stock is then decremented for every product in a single
+        ``UPDATE ... FROM (VALUES ...) WHERE stock_quantity >= qty RETURNING``
+        statement, so row locks are taken by the database itself and held only
+        for that statement, the item insert and the commit. Fewer returned rows
+        than requested products means a product is missing or short; the
+        transaction is rolled back and the matching error raised.
 
-        self._db.add_all(order_items)
+        ``ck_product_stock_non_negative`` still backs the guard. Postgres does
+        not promise a lock order for UPDATE ... FROM, but for a short VALUES
+        list sorted by id it drives a nested loop in that order, which keeps
+        concurrent multi-product orders from deadlocking in practice.
+        """
+        started = time.perf_counter()
+        [order_row] = await self._insert_orders(1)
+        prices, striped = await self.take_stock(quantity_map, "conditional_update")
+
+        item_rows = await self._insert_items(
+            [
+                (order_row.id, product_id, requested_qty, prices[product_id])
+                for product_id, requested_qty in quantity_map.items()
+            ],
+            _spread(striped),
+            self._notify(
+                [order_created(order_row.id), stock_changed(quantity_map.keys())]
+            ),
+        )
+        order = _order_read(order_row, item_rows)
+        if idempotency is not None:
+            await self._db.execute(record_response(idempotency, order))
         await self._db.commit()
-        await self._db.refresh(order)
+        ORDER_TRANSACTION.observe(time.perf_counter() - started, "conditional_update")
+        await self._stock_changed(quantity_map.keys())
 
-        logger.info("Created order id=%d with %d item(s)", order.id, len(order_items))
+        logger.info("Created order id=%d with %d item(s)", order_row.id, len(item_rows))
         return order
 
-    async def get_order(self, order_id: int) -> Order:
+    async def take_stock(
+        self, quantity_map: dict[int, int], strategy: str
+    ) -> tuple[dict[int, Decimal], dict[int, Row]]:
+        """
+        Take ``quantity_map`` from stock without locking products first: one
+        guarded UPDATE for unstriped products, then a draw for striped ones.
+        Returns the products' prices and the striped products among them.
+        If a product is missing or short, the transaction is rolled back and
+        the matching error raised. ``strategy`` labels the lock-wait metric.
+        """
+        update_started = time.perf_counter()
         result = await self._db.execute(
-            select(Order).where(Order.id == order_id)
+            _decrement_stock(quantity_map, guarded=True).returning(
+                Product.id, Product.price
+            )
+        )
+        prices = {row.id: row.price for row in result}
+        ORDER_LOCK_WAIT.observe(time.perf_counter() - update_started, strategy)
+
+        striped: dict[int, Row] = {}
+        if len(prices) < len(quantity_map):
+            # Striped products are skipped by the guarded UPDATE; draw them now.
+            striped = await self._striped_products(quantity_map.keys() - prices.keys())
+            if striped:
+                await self._draw_striped(quantity_map, striped)
+                prices.update({pid: row.price for pid, row in striped.items()})
+        if len(prices) < len(quantity_map):
+            await self._db.rollback()
+            raise await self._stock_error(quantity_map, prices.keys())
+        return prices, striped
+
+    async def _create_order_from_reservation(
+        self,
+        reservation_id: int,
+        idempotency: IdempotentRequest | None = None,
+    ) -> OrderRead:
+        """
+        Turn an unexpired hold into an order. The hold's stock was taken when
+        it was made, so no product row is locked or updated: one statement
+        deletes the hold and returns its items with their prices, and the
+        order is written as usual. A hold that is missing, already consumed
+        or expired fails the order; a consumed one cannot be consumed again.
+        """
+        started = time.perf_counter()
+        result = await self._db.execute(_consume_reservation(reservation_id))
+        held = result.all()
+        if not held:
+            raise await self._reservation_error(reservation_id)
+        quantity_map = {row.product_id: row.quantity for row in held}
+
+        [order_row] = await self._insert_orders(1)
+        item_rows = await self._insert_items(
+            [
+                (order_row.id, row.product_id, row.quantity, row.price)
+                for row in held
+            ],
+            {row.product_id: row.stock_stripes for row in held if row.stock_stripes},
+            self._notify(
+                [order_created(order_row.id), stock_changed(quantity_map.keys())]
+            ),
+        )
+        order = _order_read(order_row, item_rows)
+        if idempotency is not None:
+            await self._db.execute(record_response(idempotency, order))
+        await self._db.commit()
+        ORDER_TRANSACTION.observe(time.perf_counter() - started, "reservation")
+        await self._stock_changed(quantity_map.keys())
+
+        logger.info(
+            "Created order id=%d from reservation id=%d", order_row.id, reservation_id
         )
-        order = result.scalar_one_or_none()
-        if order is None:
-            raise NotFoundError("Order", order_id)
         return order
 
-    async def list_orders(
-        self, limit: int = 10, offset: int = 0
-    ) -> dict[str, list[Order] | int]:
-        total = await self._db.scalar(select(func.count()).select_from(Order))
+    async def _reservation_error(self, reservation_id: int) -> AppError:
+        """Explain why a hold could not be consumed, and roll back."""
+        expires_at = await self._db.scalar(
+            select(Reservation.expires_at).where(Reservation.id == reservation_id)
+        )
+        await self._db.rollback()
+        if expires_at is None:
+            return NotFoundError("Reservation", reservation_id)
+        return ReservationExpiredError(reservation_id)
+
+    async def _stock_error(
+        self, quantity_map: dict[int, int], updated_ids: Iterable[int]
+    ) -> AppError:
+        """Explain why a conditional decrement skipped some products."""
+        skipped_ids = sorted(quantity_map.keys() - set(updated_ids))
         result = await self._db.execute(
-            select(Order)
-            .order_by(Order.created_at.desc())
-            .limit(limit)
-            .offset(offset)
+            select(Product.id, Product.name, Product.stock_quantity).where(
+                Product.id.in_(skipped_ids)
+            )
+        )
+        current = {row.id: row for row in result}
+        for product_id in skipped_ids:
+            if product_id not in current:
+                return NotFoundError("Product", product_id)
+        row = current[skipped_ids[0]]
+        return InsufficientStockError(
+            product_id=row.id,
+            product_name=row.name,
+            requested=quantity_map[row.id],
+            available=row.stock_quantity,
+        )
+
+    async def create_orders_batch(
+        self, payloads: list[OrderCreate]
+    ) -> list[OrderRead | AppError]:
+        """
+        Create many orders in a single transaction, allowing partial success.
+
+        The union of all referenced products is locked once, in id order
+        (a striped product's row and every stripe, after the unstriped ones).
+        Orders are then validated in sequence against a running stock tally:
+        an order that cannot be fulfilled yields its ``AppError`` and consumes
+        nothing, so it does not affect the orders around it. Accepted orders
+        and their items are written with bulk INSERTs and a single commit.
+
+        Returns one result per payload, in payload order.
+        """
+        quantity_maps = [aggregate_quantities(p.items) for p in payloads]
+        all_ids: set[int] = set()
+        for quantity_map in quantity_maps:
+            all_ids.update(quantity_map)
+        started = time.perf_counter()
+        product_map = await self._lock_products(all_ids, "batch")
+        striped = await self._striped_products(all_ids - product_map.keys())
+        stripes = StockStripes(self._db)
+        locked_stripes = await stripes.lock(striped.keys()) if striped else {}
+        products = product_map | striped
+        initial = {pid: p.stock_quantity for pid, p in product_map.items()} | {
+            pid: sum(locked_stripes.get(pid, {}).values()) for pid in striped
+        }
+        remaining = dict(initial)
+
+        outcomes: list[dict[int, int] | AppError] = []
+        for quantity_map in quantity_maps:
+            missing_ids = quantity_map.keys() - products.keys()
+            if missing_ids:
+                outcomes.append(NotFoundError("Product", min(missing_ids)))
+                continue
+            short_id = next(
+                (pid for pid, qty in quantity_map.items() if remaining[pid] < qty),
+                None,
+            )
+            if short_id is not None:
+                outcomes.append(
+                    InsufficientStockError(
+                        product_id=short_id,
+                        product_name=products[short_id].name,
+                        requested=quantity_map[short_id],
+                        available=remaining[short_id],
+                    )
+                )
+                continue
+            for product_id, requested_qty in quantity_map.items():
+                remaining[product_id] -= requested_qty
+            outcomes.append(quantity_map)
+
+        accepted = [o for o in outcomes if isinstance(o, dict)]
+        if not accepted:
+            await self._db.rollback()
+            return outcomes  # type: ignore[return-value]
+
+        consumed = {
+            product_id: initial[product_id] - remaining[product_id]
+            for product_id in initial
+            if initial[product_id] != remaining[product_id]
+        }
+        plain = {pid: qty for pid, qty in consumed.items() if pid in product_map}
+        if plain:
+            await self._db.execute(_decrement_stock(plain))
+        if len(plain) < len(consumed):
+            await stripes.take(
+                locked_stripes,
+                {pid: qty for pid, qty in consumed.items() if pid in striped},
+            )
+        order_rows = await self._insert_orders(len(accepted))
+        item_rows = await self._insert_items(
+            [
+                (order_row.id, product_id, requested_qty, products[product_id].price)
+                for order_row, quantity_map in zip(order_rows, accepted)
+                for product_id, requested_qty in quantity_map.items()
+            ],
+            _spread(striped),
+            self._notify(
+                [
+                    *(order_created(order_row.id) for order_row in order_rows),
+                    stock_changed(consumed.keys()),
+                ]
+            ),
+        )
+        await self._db.commit()
+        ORDER_TRANSACTION.observe(time.perf_counter() - started, "batch")
+        await self._stock_changed(consumed.keys())
+
+        items_by_order: dict[int, list[Row]] = defaultdict(list)
+        for item_row in item_rows:
+            items_by_order[item_row.order_id].append(item_row)
+        created = iter(order_rows)
+        results: list[OrderRead | AppError] = []
+        for outcome in outcomes:
+            if isinstance(outcome, dict):
+                order_row = next(created)
+                outcome = _order_read(order_row, items_by_order[order_row.id])
+            results.append(outcome)
+
+        logger.info(
+            "Created %d of %d batched order(s)", len(order_rows), len(payloads)
+        )
+        return results
+
+    async def _stock_changed(self, product_ids: Iterable[int]) -> None:
+        """
+        Invalidate cached product reads and order counts once a stock change
+        (and with it an order) has committed, and stop later reads joining
+        queries already in flight.
+        """
+        READ_FLIGHTS.forget()
+        EXACT_COUNTS.invalidate(Order.__tablename__)
+        if self._product_cache is not None:
+            await self._product_cache.invalidate_products(product_ids)
+
+    def _notify(self, events: list[Event]) -> Label | None:
+        """``notify(events)`` to attach to a write, unless events are disabled."""
+        return notify(events) if self._publish_events else None
+
+    async def _lock_products(
+        self, product_ids: Iterable[int], strategy: str
+    ) -> dict[int, Row]:
+        """Lock the unstriped products among ``product_ids``."""
+        started = time.perf_counter()
+        result = await self._db.execute(_lock_query(product_ids))
+        products = {row.id: row for row in result}
+        ORDER_LOCK_WAIT.observe(time.perf_counter() - started, strategy)
+        return products
+
+    async def _striped_products(self, product_ids: Iterable[int]) -> dict[int, Row]:
+        """
+        Read (without locking) the striped products among ``product_ids``.
+        Only runs when some requested product was not returned by the lock or
+        guarded UPDATE, so orders for unstriped products pay nothing extra.
+        """
+        product_ids = sorted(product_ids)
+        if not product_ids:
+            return {}
+        result = await self._db.execute(
+            select(Product.id, Product.name, Product.price, Product.stock_stripes)
+            .where(Product.id.in_(product_ids), Product.stock_stripes > 0)
+        )
+        return {row.id: row for row in result}
+
+    async def _draw_striped(
+        self, quantity_map: dict[int, int], striped: dict[int, Row]
+    ) -> None:
+        started = time.perf_counter()
+        short = await StockStripes(self._db).draw(
+            {
+                pid: (quantity_map[pid], row.stock_stripes)
+                for pid, row in striped.items()
+            }
+        )
+        ORDER_LOCK_WAIT.observe(time.perf_counter() - started, "striped")
+        if short:
+            await self._db.rollback()
+            product_id = min(short)
+            raise InsufficientStockError(
+                product_id=product_id,
+                product_name=striped[product_id].name,
+                requested=quantity_map[product_id],
+                available=short[product_id],
+            )
+
+    async def _insert_orders(self, count: int) -> Sequence[Row]:
+        """Insert ``count`` pending orders in one round trip, in input order."""
+        result = await self._db.execute(
+            insert(Order).returning(
+                Order.id,
+                Order.status,
+                Order.created_at,
+                Order.updated_at,
+                sort_by_parameter_order=True,
+            ),
+            [{"status": OrderStatus.PENDING}] * count,
         )
+        return result.all()
+
+    async def _insert_items(
+        self,
+        items: list[tuple[int, int, int, Decimal]],
+        spread: dict[int, int] | None = None,
+        notification: Label | None = None,
+    ) -> list[Row]:
+        """
+        Insert (order_id, product_id, quantity, price) rows and add them to
+        ``product_daily_sales``, one statement per ``_ITEM_CHUNK`` items.
+        ``spread`` is passed on to ``record_sales``; ``notification`` (see
+        ``notify``) rides on the first statement.
+        """
+        rows: list[Row] = []
+        for start in range(0, len(items), _ITEM_CHUNK):
+            chunk = items[start : start + _ITEM_CHUNK]
+            stmt = (
+                insert(OrderItem)
+                .values(
+                    [
+                        {
+                            "order_id": order_id,
+                            "product_id": product_id,
+                            "quantity": quantity,
+                            "price_at_time": price,
+                        }
+                        for order_id, product_id, quantity, price in chunk
+                    ]
+                )
+                .returning(
+                    OrderItem.id,
+                    OrderItem.order_id,
+                    OrderItem.product_id,
+                    OrderItem.quantity,
+                    OrderItem.price_at_time,
+                )
+                .add_cte(record_sales(chunk, spread))
+            )
+            if notification is not None and start == 0:
+                stmt = stmt.returning(notification)
+            result = await self._db.execute(stmt)
+            rows.extend(result.all())
+        # Multi-row VALUES draws ids in row order; RETURNING order is unspecified.
+        rows.sort(key=lambda row: row.id)
+        return rows
+
+    @single_flight("orders.get")
+    async def get_order(self, order_id: int) -> OrderRead:
+        result = await self._db.execute(
+            _orders_with_items().where(Order.id == order_id)
+        )
+        row = result.first()
+        if row is None:
+            raise NotFoundError("Order", order_id)
+        return _order_from_json_row(row)
+
+    @single_flight("orders.list")
+    async def list_orders(
+        self,
+        limit: int = 10,
+        offset: int = 0,
+        cursor: str | None = None,
+        status: OrderStatus | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        product_id: int | None = None,
+        total_mode: TotalMode | None = None,
+    ) -> dict[str, Any]:
+        """
+        Return a page of orders, newest first, optionally filtered.
+
+        Orders and their items come from one statement (see
+        ``_orders_with_items``) and are turned straight into ``OrderRead``;
+        no ORM objects are loaded.
+
+        With ``cursor`` the page is located by seeking past the
+        ``(created_at, id)`` key of the previous page's last row, which is
+        served by ``ix_orders_created_at_id`` (or, with a status filter,
+        ``ix_orders_status_created_at_id``); ``offset`` is ignored. Cursors
+        do not carry filters: pass the same filters with every page.
+        ``total_mode`` picks how ``total`` is computed; see ``page_total``.
+        """
+        filters = order_filters(status, created_from, created_to, product_id)
+        total, total_is_estimate = await page_total(
+            self._db,
+            total_mode,
+            Order.__table__,
+            filters,
+            (status, created_from, created_to, product_id),
+        )
+        stmt = _page_query(_orders_with_items(), filters, offset, cursor)
+
+        # Fetch one extra row to learn whether another page follows.
+        result = await self._db.execute(stmt.limit(limit + 1))
+        orders = [_order_from_json_row(row) for row in result]
+        next_cursor = None
+        if len(orders) > limit:
+            orders = orders[:limit]
+            last = orders[-1]
+            next_cursor = encode_order_cursor(last.created_at, last.id)
+
         return {
-            "items": result.scalars().all(),
-            "total": total or 0,
+            "items": orders,
+            "total": total,
+            "total_is_estimate": total_is_estimate,
             "limit": limit,
-            "offset": offset,
+            "offset": None if cursor is not None else offset,
+            "next_cursor": next_cursor,
         }
 
+    @single_flight("orders.etag")
+    async def order_etag(self, order_id: int) -> str | None:
+        """
+        The ETag ``get_order`` would send, from the order's ``updated_at``
+        alone (items never change); None if the order does not exist.
+        """
+        result = await self._db.execute(
+            select(Order.id, Order.updated_at).where(Order.id == order_id)
+        )
+        row = result.first()
+        return None if row is None else order_etag(row)
+
+    @single_flight("orders.page_etag")
+    async def page_etag(
+        self,
+        limit: int = 10,
+        offset: int = 0,
+        cursor: str | None = None,
+        status: OrderStatus | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        product_id: int | None = None,
+        total_mode: TotalMode | None = None,
+    ) -> str:
+        """
+        The ETag of the page ``list_orders`` would return for the same
+        arguments, from the total and the ids and ``updated_at`` of its rows.
+        """
+        filters = order_filters(status, created_from, created_to, product_id)
+        total, total_is_estimate = await page_total(
+            self._db,
+            total_mode,
+            Order.__table__,
+            filters,
+            (status, created_from, created_to, product_id),
+        )
+        stmt = _page_query(select(Order.id, Order.updated_at), filters, offset, cursor)
+        rows = (await self._db.execute(stmt.limit(limit + 1))).all()
+        return page_etag(
+            total,
+            total_is_estimate,
+            len(rows) > limit,
+            (_version_tag(row) for row in rows[:limit]),
+        )
+
+    async def warm_up(self) -> None:
+        """
+        Run the hot order statements once on this session's connection, so
+        SQLAlchemy has compiled them and the connection has prepared them
+        before the first real request. Touches no rows; the caller rolls
+        back.
+        """
+        limit = get_settings().default_page_limit
+        with suppress(NotFoundError):
+            await self.get_order(0)
+        await self.order_etag(0)
+        await self.list_orders(limit=limit)
+        await self.page_etag(limit=limit)
+        await self._db.execute(_lock_query([0]))
+
     async def update_order_status(
         self, order_id: int, new_status: OrderStatus
-    ) -> Order:
-        order = await self.get_order(order_id)
+    ) -> OrderRead:
+        """
+        Apply a status transition in a single statement.
 
-        allowed = ALLOWED_TRANSITIONS.get(order.status, set())
-        if new_status not in allowed:
+        The UPDATE only matches while the order is in a status that may move
+        to ``new_status`` and returns the order joined with its items, so a
+        successful transition is one round trip plus the commit. A
+        cancellation subtracts the order from ``product_daily_sales`` in the
+        same statement, and so does the change-feed NOTIFY. The current
+        status is read only to explain a rejected transition.
+        """
+        allowed_from = [
+            current
+            for current, targets in ALLOWED_TRANSITIONS.items()
+            if new_status in targets
+        ]
+        updated = (
+            update(Order)
+            .where(Order.id == order_id, Order.status.in_(allowed_from))
+            .values(status=new_status)
+            .returning(Order.id, Order.status, Order.created_at, Order.updated_at)
+            .cte("updated")
+        )
+        stmt = (
+            select(
+                updated,
+                OrderItem.id.label("item_id"),
+                OrderItem.product_id,
+                OrderItem.quantity,
+                OrderItem.price_at_time,
+            )
+            .outerjoin(OrderItem, OrderItem.order_id == updated.c.id)
+            .order_by(OrderItem.id)
+        )
+        if new_status == OrderStatus.CANCELLED:
+            stmt = stmt.add_cte(reverse_sales(updated))
+        notification = self._notify(
+            [order_status_changed(order_id, new_status.value)]
+        )
+        if notification is not None:
+            stmt = stmt.add_columns(notification)
+        result = await self._db.execute(stmt)
+        rows = result.all()
+
+        if not rows:
+            current = await self._db.scalar(
+                select(Order.status).where(Order.id == order_id)
+            )
+            await self._db.rollback()
+            if current is None:
+                raise NotFoundError("Order", order_id)
             raise InvalidStatusTransitionError(
-                current=order.status.value,
+                current=current.value,
                 requested=new_status.value,
             )
 
-        order.status = new_status
         await self._db.commit()
-        await self._db.refresh(order)
+        READ_FLIGHTS.forget()
+        EXACT_COUNTS.invalidate(Order.__tablename__)
 
-        logger.info(
-            "Order id=%d status updated: %s → %s",
-            order.id,
-            order.status.value,
-            new_status.value,
+        logger.info("Order id=%d status updated to %s", order_id, new_status.value)
+        return OrderRead(
+            id=rows[0].id,
+            status=rows[0].status,
+            created_at=rows[0].created_at,
+            updated_at=rows[0].updated_at,
+            items=[
+                OrderItemRead(
+                    id=row.item_id,
+                    product_id=row.product_id,
+                    quantity=row.quantity,
+                    price_at_time=row.price_at_time,
+                )
+                for row in rows
+                if row.item_id is not None
+            ],
         )
-        return order
+
+
+def aggregate_quantities(items: Iterable[OrderItemInput]) -> dict[int, int]:
+    """Sum quantities per product in case the items repeat a product_id."""
+    quantity_map: dict[int, int] = defaultdict(int)
+    for item in items:
+        quantity_map[item.product_id] += item.quantity
+    return dict(quantity_map)
+
+
+def order_filters(
+    status: OrderStatus | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    product_id: int | None = None,
+) -> list[ColumnElement[bool]]:
+    """
+    WHERE clauses shared by order listing and export.
+
+    ``created_from`` is inclusive and ``created_to`` exclusive. ``product_id``
+    keeps orders with at least one item for that product.
+    """
+    filters: list[ColumnElement[bool]] = []
+    if status is not None:
+        filters.append(Order.status == status)
+    if created_from is not None:
+        filters.append(Order.created_at >= _naive_utc(created_from))
+    if created_to is not None:
+        filters.append(Order.created_at < _naive_utc(created_to))
+    if product_id is not None:
+        filters.append(
+            exists().where(
+                OrderItem.order_id == Order.id, OrderItem.product_id == product_id
+            )
+        )
+    return filters
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """
+    The model maps ``orders.created_at`` as a naive ``DateTime``, so asyncpg
+    binds comparisons against it as ``timestamp`` and rejects aware values.
+    Migrations create the column as ``timestamptz``, which compares with the
+    naive UTC value taken in the session's ``TimeZone`` (UTC by default);
+    only ``create_all`` schemas, such as the tests', store it naive.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _lock_query(product_ids: Iterable[int]) -> Select:
+    """SELECT ... FOR UPDATE of the unstriped products among ``product_ids``."""
+    # Sort IDs for consistent lock ordering — prevents deadlocks under concurrency.
+    return (
+        select(Product.id, Product.name, Product.price, Product.stock_quantity)
+        .where(Product.id.in_(sorted(product_ids)), Product.stock_stripes == 0)
+        .order_by(Product.id)
+        .with_for_update()
+    )
+
+
+def _decrement_stock(quantity_map: dict[int, int], guarded: bool = False) -> Update:
+    """
+    Build one ``UPDATE products ... FROM (VALUES (id, qty), ...)`` statement.
+
+    With ``guarded`` rows whose stock would go negative, and striped
+    products, are left untouched, which is how the conditional strategy
+    detects shortfalls.
+    """
+    requested = values(
+        column("id", Integer), column("qty", Integer), name="requested"
+    ).data(sorted(quantity_map.items()))
+    stmt = (
+        update(Product)
+        .where(Product.id == requested.c.id)
+        .values(stock_quantity=Product.stock_quantity - requested.c.qty)
+        .execution_options(synchronize_session=False)
+    )
+    if guarded:
+        stmt = stmt.where(
+            Product.stock_quantity >= requested.c.qty, Product.stock_stripes == 0
+        )
+    return stmt
+
+
+def _consume_reservation(reservation_id: int) -> Select:
+    """
+    Delete an unexpired hold and its items, returning each item's product,
+    quantity, price and stripe count. Returns no rows for a missing or
+    expired hold; a hold being swept is waited for and then missing.
+    """
+    consumed = (
+        delete(Reservation)
+        .where(Reservation.id == reservation_id, Reservation.expires_at > func.now())
+        .returning(Reservation.id)
+        .cte("consumed")
+    )
+    items = (
+        delete(ReservationItem)
+        .where(ReservationItem.reservation_id.in_(select(consumed.c.id)))
+        .returning(ReservationItem.product_id, ReservationItem.quantity)
+        .cte("items")
+    )
+    return (
+        select(
+            items.c.product_id,
+            items.c.quantity,
+            Product.price,
+            Product.stock_stripes,
+        )
+        .join(Product, Product.id == items.c.product_id)
+        .order_by(items.c.product_id)
+    )
+
+
+def _spread(striped: dict[int, Row]) -> dict[int, int]:
+    """Stripe counts to spread striped products' sales totals over."""
+    return {product_id: row.stock_stripes for product_id, row in striped.items()}
+
+
+def _page_query(
+    stmt: Select,
+    filters: list[ColumnElement[bool]],
+    offset: int,
+    cursor: str | None,
+) -> Select:
+    """Apply filters, newest-first order and the offset or cursor seek."""
+    stmt = stmt.where(*filters).order_by(Order.created_at.desc(), Order.id.desc())
+    if cursor is not None:
+        created_at, order_id = decode_order_cursor(cursor)
+        return stmt.where(
+            tuple_(Order.created_at, Order.id) < tuple_(created_at, order_id)
+        )
+    return stmt.offset(offset)
+
+
+def _version_tag(order: Row | OrderRead) -> str:
+    return f"{order.id}:{order.updated_at.isoformat()}"
+
+
+def order_etag(order: Row | OrderRead) -> str:
+    """ETag of an order, from an ``OrderRead`` or an (id, updated_at) row."""
+    return make_etag(_version_tag(order))
+
+
+def order_page_etag(page: dict[str, Any]) -> str:
+    """ETag of a ``list_orders`` page."""
+    return page_etag(
+        page["total"],
+        page["total_is_estimate"],
+        page["next_cursor"] is not None,
+        (_version_tag(order) for order in page["items"]),
+    )
+
+
+def _orders_with_items() -> Select:
+    """
+    Order columns plus an ``items`` column holding the order's items as a
+    JSON array, ordered by id. The correlated subquery runs only for the
+    rows the outer query returns, so one statement serves a whole page.
+    """
+    item = func.json_build_object(
+        "id",
+        OrderItem.id,
+        "product_id",
+        OrderItem.product_id,
+        "quantity",
+        OrderItem.quantity,
+        # As a string: a JSON number would be parsed through float.
+        "price_at_time",
+        cast(OrderItem.price_at_time, Text),
+    )
+    items = (
+        select(
+            func.coalesce(
+                func.json_agg(aggregate_order_by(item, OrderItem.id)),
+                literal_column("'[]'::json"),
+            )
+        )
+        .where(OrderItem.order_id == Order.id)
+        .scalar_subquery()
+    )
+    return select(
+        Order.id,
+        Order.status,
+        Order.created_at,
+        Order.updated_at,
+        cast(items, Text).label("items"),
+    )
+
+
+_ORDER_ITEMS = TypeAdapter(list[OrderItemRead])
+
+
+def _order_from_json_row(row: Row) -> OrderRead:
+    return OrderRead(
+        id=row.id,
+        status=row.status,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        items=_ORDER_ITEMS.validate_json(row.items),
+    )
+
+
+def _order_read(order_row: Row, item_rows: Iterable[Row]) -> OrderRead:
+    return OrderRead(
+        id=order_row.id,
+        status=order_row.status,
+        created_at=order_row.created_at,
+        updated_at=order_row.updated_at,
+        items=[OrderItemRead.model_validate(row) for row in item_rows],
+    )
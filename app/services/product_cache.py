@@ -0,0 +1,108 @@
+"""Read-through cache for product reads."""
+import copy
+import uuid
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+from app.cache import CacheBackend, CacheStats
+from app.schemas.common import PaginatedResponse
+from app.schemas.product import ProductRead
+
+_LIST_VERSION_KEY = "products:list:version"
+
+
+class ProductCache:
+    """
+    Caches ``ProductRead`` entries and list pages on a ``CacheBackend``.
+
+    Entries are stored as JSON so callers never share mutable objects.
+    Invalidation swaps a random version token instead of deleting data: a
+    product entry lives under ``product:{id}:{version}`` and list pages under
+    the list version. A reader that loaded rows just before a write commits
+    stores them under the old, now unreachable version, so it cannot
+    resurrect stale data after the writer has invalidated.
+    """
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self._backend = backend
+        self._fill = True
+        # Shared with ``read_only`` views, so their hits count too.
+        self._counts: Counter[str] = Counter()
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._counts["hits"],
+            misses=self._counts["misses"],
+            evictions=self._backend.evictions,
+        )
+
+    @property
+    def flight_key(self) -> tuple[CacheBackend, bool]:
+        """Equal for caches that serve and store the same entries."""
+        return self._backend, self._fill
+
+    def read_only(self) -> "ProductCache":
+        """
+        A view of this cache that serves hits but does not store what its
+        loaders return, for reads from a replica: a lagging replica would
+        otherwise refill an entry a write just invalidated with the row from
+        before the write, for every reader, for a whole TTL.
+        """
+        view = copy.copy(self)
+        view._fill = False
+        return view
+
+    async def get_product(
+        self, product_id: int, loader: Callable[[], Awaitable[ProductRead]]
+    ) -> ProductRead:
+        version = await self._version(f"product:{product_id}:version")
+        key = f"product:{product_id}:{version}"
+        cached = await self._backend.get(key)
+        if cached is not None:
+            self._counts["hits"] += 1
+            return ProductRead.model_validate_json(cached)
+        self._counts["misses"] += 1
+        product = await loader()
+        if self._fill:
+            await self._backend.set(key, product.model_dump_json().encode())
+        return product
+
+    async def get_page(
+        self,
+        params: tuple[Any, ...],
+        loader: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        version = await self._version(_LIST_VERSION_KEY)
+        key = f"products:list:{version}:" + ":".join(map(str, params))
+        cached = await self._backend.get(key)
+        if cached is not None:
+            self._counts["hits"] += 1
+            return dict(PaginatedResponse[ProductRead].model_validate_json(cached))
+        self._counts["misses"] += 1
+        page = await loader()
+        if self._fill:
+            encoded = PaginatedResponse[ProductRead](**page).model_dump_json()
+            await self._backend.set(key, encoded.encode())
+        return page
+
+    async def invalidate_products(self, product_ids: Iterable[int]) -> None:
+        """Drop the given products and every list page; call after commit."""
+        for product_id in product_ids:
+            await self._bump(f"product:{product_id}:version")
+        await self.invalidate_lists()
+
+    async def invalidate_lists(self) -> None:
+        await self._bump(_LIST_VERSION_KEY)
+
+    async def _version(self, key: str) -> str:
+        version = await self._backend.get(key)
+        if version is None:
+            return await self._bump(key)
+        return version.decode()
+
+    async def _bump(self, key: str) -> str:
+        version = uuid.uuid4().hex
+        await self._backend.set(key, version.encode())
+        return version
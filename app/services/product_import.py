@@ -0,0 +1,295 @@
+"""Bulk product import — streamed CSV/NDJSON loaded through COPY."""
+import codecs
+import csv
+import json
+import logging
+from collections.abc import AsyncIterator
+from typing import Any, Literal
+
+from pydantic import ValidationError
+from sqlalchemy import Integer, column, delete, func, literal, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.exceptions import ImportFormatError
+from app.models.product import Product
+from app.models.product_stock_stripe import ProductStockStripe
+from app.schemas.product import ProductCreate, ProductImportError, ProductImportResult
+from app.services.events import notify_stock_changed
+from app.services.list_totals import EXACT_COUNTS
+from app.services.product_cache import ProductCache
+from app.services.stock_stripes import StockStripes
+from app.singleflight import READ_FLIGHTS
+
+logger = logging.getLogger(__name__)
+
+ImportFormat = Literal["csv", "ndjson"]
+
+STAGING_TABLE = "product_import_staging"
+STAGING_COLUMNS = ("line", "name", "price", "stock_quantity")
+REQUIRED_FIELDS = ("name", "price", "stock_quantity")
+
+# Serialises upserting imports so two of them cannot both insert the same
+# new name (products.name is not unique).
+_UPSERT_LOCK_KEY = 0x70726F64
+
+# A CSV record whose quotes never balance would otherwise swallow the rest of
+# the upload; past this size it is rejected and parsing resumes.
+_MAX_RECORD_CHARS = 1 << 20
+
+# No row is anywhere near this long; a body without newlines would otherwise
+# be buffered whole while waiting for one.
+_MAX_LINE_CHARS = 1 << 20
+
+
+class ProductImporter:
+    """
+    Loads a streamed catalog upload into ``products`` in one transaction.
+
+    The body is decoded and parsed incrementally, each row is validated
+    against ``ProductCreate``, and valid rows are sent ``chunk_size`` at a time
+    to a temporary staging table with asyncpg's binary COPY. A final
+    INSERT ... SELECT (plus an UPDATE ... FROM in upsert mode) moves them into
+    ``products``. Memory is bounded by one chunk, whatever the upload size.
+
+    Invalid rows are skipped and counted; the first ``max_errors`` are
+    reported with their line numbers.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        cache: ProductCache | None = None,
+        chunk_size: int = 5000,
+        max_errors: int = 100,
+    ) -> None:
+        self._db = db
+        self._cache = cache
+        self._chunk_size = chunk_size
+        self._max_errors = max_errors
+
+    async def import_products(
+        self,
+        body: AsyncIterator[bytes],
+        fmt: ImportFormat,
+        upsert: bool = False,
+    ) -> ProductImportResult:
+        """
+        With ``upsert`` a row whose name matches existing products updates
+        their price and stock instead of inserting; the last row for a name
+        wins, and striped products are re-split around the new total.
+        Otherwise every valid row is inserted.
+        """
+        conn = await self._db.connection()
+        await conn.execute(
+            text(
+                f"CREATE TEMP TABLE {STAGING_TABLE} ("
+                "line integer NOT NULL, name varchar(255) NOT NULL, "
+                "price numeric(12, 2) NOT NULL, stock_quantity integer NOT NULL"
+                ") ON COMMIT DROP"
+            )
+        )
+        raw = await conn.get_raw_connection()
+        driver = raw.driver_connection
+
+        result = ProductImportResult()
+        chunk: list[tuple[int, str, Any, int]] = []
+        rows = _csv_rows(body) if fmt == "csv" else _ndjson_rows(body)
+        async for line, row in rows:
+            result.received += 1
+            try:
+                if isinstance(row, str):
+                    raise ValueError(row)
+                product = ProductCreate.model_validate(row)
+            except (ValidationError, ValueError) as exc:
+                self._reject(result, line, exc)
+                continue
+            chunk.append((line, product.name, product.price, product.stock_quantity))
+            if len(chunk) >= self._chunk_size:
+                await driver.copy_records_to_table(
+                    STAGING_TABLE, records=chunk, columns=STAGING_COLUMNS
+                )
+                chunk.clear()
+        if chunk:
+            await driver.copy_records_to_table(
+                STAGING_TABLE, records=chunk, columns=STAGING_COLUMNS
+            )
+
+        updated_ids: list[int] = []
+        if upsert:
+            await conn.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": _UPSERT_LOCK_KEY}
+            )
+            updated = await conn.execute(
+                text(
+                    "UPDATE products p "
+                    "SET price = s.price, stock_quantity = s.stock_quantity, "
+                    "updated_at = now() "
+                    "FROM (SELECT DISTINCT ON (name) name, price, stock_quantity "
+                    f"FROM {STAGING_TABLE} ORDER BY name, line DESC) s "
+                    "WHERE p.name = s.name "
+                    "RETURNING p.id, p.stock_stripes"
+                )
+            )
+            stripes = StockStripes(self._db)
+            for product_id, stripe_count in updated.all():
+                updated_ids.append(product_id)
+                if stripe_count:
+                    # The imported quantity replaces the striped total too.
+                    await conn.execute(
+                        delete(ProductStockStripe).where(
+                            ProductStockStripe.product_id == product_id
+                        )
+                    )
+                    await stripes.set_stripes(product_id, stripe_count)
+            insert_sql = (
+                "INSERT INTO products (name, price, stock_quantity) "
+                "SELECT name, price, stock_quantity FROM ("
+                "SELECT DISTINCT ON (name) line, name, price, stock_quantity "
+                f"FROM {STAGING_TABLE} s "
+                "WHERE NOT EXISTS "
+                "(SELECT 1 FROM products p WHERE p.name = s.name) "
+                "ORDER BY name, line DESC) latest "
+                "ORDER BY line RETURNING id"
+            )
+        else:
+            insert_sql = (
+                "INSERT INTO products (name, price, stock_quantity) "
+                f"SELECT name, price, stock_quantity FROM {STAGING_TABLE} "
+                "ORDER BY line RETURNING id"
+            )
+        inserted = text(insert_sql).columns(column("id", Integer)).cte("inserted")
+        stmt = select(func.count()).select_from(inserted)
+        if get_settings().events_enabled:
+            # The new ids stay in the database; only their count comes back.
+            changed = select(inserted.c.id)
+            if updated_ids:
+                changed = changed.union_all(
+                    select(func.unnest(literal(updated_ids, ARRAY(Integer))))
+                )
+            stmt = stmt.add_columns(notify_stock_changed(changed))
+        result.inserted = (await conn.execute(stmt)).first()[0]
+        result.updated = len(updated_ids)
+        await self._db.commit()
+        READ_FLIGHTS.forget()
+        EXACT_COUNTS.invalidate(Product.__tablename__)
+
+        if self._cache is not None:
+            if updated_ids:
+                await self._cache.invalidate_products(updated_ids)
+            else:
+                await self._cache.invalidate_lists()
+
+        logger.info(
+            "Imported products: received=%d inserted=%d updated=%d failed=%d",
+            result.received,
+            result.inserted,
+            result.updated,
+            result.failed,
+        )
+        return result
+
+    def _reject(self, result: ProductImportResult, line: int, exc: Exception) -> None:
+        result.failed += 1
+        if len(result.errors) >= self._max_errors:
+            return
+        if isinstance(exc, ValidationError):
+            detail = "; ".join(
+                f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}"
+                for err in exc.errors()
+            )
+        else:
+            detail = str(exc)
+        result.errors.append(ProductImportError(line=line, detail=detail))
+
+
+async def _lines(body: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode the body incrementally and split it on newlines."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in body:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        if len(pending) > _MAX_LINE_CHARS or any(
+            len(line) > _MAX_LINE_CHARS for line in lines
+        ):
+            raise ImportFormatError(
+                f"Line is longer than {_MAX_LINE_CHARS} characters."
+            )
+        for line in lines:
+            yield line.removesuffix("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.removesuffix("\r")
+
+
+async def _ndjson_rows(
+    body: AsyncIterator[bytes],
+) -> AsyncIterator[tuple[int, dict[str, Any] | str]]:
+    """Yield (line number, object) pairs; unparseable lines yield an error string."""
+    line_no = 0
+    async for line in _lines(body):
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield line_no, f"invalid JSON: {exc.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield line_no, "expected a JSON object"
+            continue
+        yield line_no, row
+
+
+async def _csv_rows(
+    body: AsyncIterator[bytes],
+) -> AsyncIterator[tuple[int, dict[str, str] | str]]:
+    """
+    Yield (line number, row) pairs keyed by the header row.
+
+    A quoted field may contain newlines, so physical lines are joined until
+    the record's double quotes balance. The line number is where the record
+    starts.
+    """
+    header: list[str] | None = None
+    record: list[str] = []
+    record_chars = 0
+    quotes = 0
+    start = 0
+    line_no = 0
+    async for line in _lines(body):
+        line_no += 1
+        if not record:
+            start = line_no
+        record.append(line)
+        record_chars += len(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            if record_chars > _MAX_RECORD_CHARS:
+                record, record_chars, quotes = [], 0, 0
+                yield start, "unterminated quoted field"
+            continue
+        text_record = "\n".join(record)
+        record, record_chars, quotes = [], 0, 0
+        if not text_record.strip():
+            continue
+        values = next(csv.reader([text_record]))
+        if header is None:
+            header = [h.strip() for h in values]
+            missing = [f for f in REQUIRED_FIELDS if f not in header]
+            if missing:
+                raise ImportFormatError(
+                    f"CSV header is missing column(s): {', '.join(missing)}."
+                )
+            continue
+        if len(values) != len(header):
+            yield start, f"expected {len(header)} fields, got {len(values)}"
+            continue
+        yield start, dict(zip(header, values))
+    if record:
+        yield start, "unterminated quoted field"
+    if header is None:
+        raise ImportFormatError("CSV upload is empty; a header row is required.")
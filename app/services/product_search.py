@@ -0,0 +1,289 @@
+"""
+Product search by name, for autocomplete.
+
+Two match modes, both keyset-paginated:
+
+* ``prefix``: names starting with the query, case-insensitively, ordered by
+  lowercased name in byte order. Served by ``ix_products_name_prefix`` as
+  one range seek, or from ``ProductNameIndex`` when it is enabled.
+* ``fuzzy``: names with a word starting with each word of the query, in any
+  order ("wid pro" finds "Pro Widget"), best ``ts_rank`` first. Served by
+  ``ix_products_name_search``.
+"""
+import asyncio
+import bisect
+import logging
+import re
+import time
+from typing import Any, Literal
+
+from sqlalchemy import func, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.product import Product
+from app.pagination import (
+    decode_name_cursor,
+    decode_rank_cursor,
+    encode_name_cursor,
+    encode_rank_cursor,
+)
+from app.schemas.product import ProductRead
+
+logger = logging.getLogger(__name__)
+
+SearchMode = Literal["prefix", "fuzzy"]
+
+# Both must match the index expressions in app/models/product.py exactly.
+_NAME_KEY = func.lower(Product.name).collate("C")
+_SIMPLE = literal_column("'simple'", REGCONFIG)
+_NAME_VECTOR = func.to_tsvector(_SIMPLE, Product.name)
+
+_WORD = re.compile(r"\w+")
+
+
+def _name_key(name: str) -> str:
+    """
+    ``ProductNameIndex``'s key for a name. Always computed in Python, never
+    by the database's ``lower()``, which follows its own locale: names added
+    live and names loaded by ``run_once`` must get the same key.
+    """
+    return name.lower()
+
+
+def _prefix_end(prefix: str) -> str | None:
+    """The smallest string greater than every string starting with ``prefix``."""
+    while prefix:
+        last = ord(prefix[-1]) + 1
+        if last == 0xD800:
+            last = 0xE000  # Surrogates cannot be encoded.
+        if last <= 0x10FFFF:
+            return prefix[:-1] + chr(last)
+        prefix = prefix[:-1]
+    return None
+
+
+class ProductNameIndex:
+    """
+    A per-process sorted list of ``(_name_key(name), id)`` for prefix searches
+    that never touch the database to find their matches.
+
+    ``run_once`` loads the names of products it has not seen yet: all of
+    them the first time, then those above the highest id seen. Ids are
+    taken before their transactions commit, so an id skipped over may still
+    appear; such gaps are re-read for ``gap_seconds`` before they are taken
+    for rollbacks. Products created through this worker are added straight
+    away with ``add``; those created elsewhere appear within
+    ``interval_seconds``. Products are never renamed or deleted, so nothing
+    else can go stale.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval_seconds: float = 5.0,
+        gap_seconds: float = 60.0,
+    ) -> None:
+        self._session_factory = session_factory
+        self._interval = interval_seconds
+        self._gap_seconds = gap_seconds
+        self._entries: list[tuple[str, int]] = []
+        self._ids: set[int] = set()
+        self._last_id = 0
+        self._gaps: dict[int, float] = {}
+        self._task: asyncio.Task[None] | None = None
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, product_id: int, name: str) -> None:
+        if product_id not in self._ids:
+            self._ids.add(product_id)
+            bisect.insort(self._entries, (_name_key(name), product_id))
+
+    def search(
+        self, prefix: str, limit: int, after: tuple[str, int] | None = None
+    ) -> list[tuple[str, int]]:
+        """Up to ``limit`` entries starting with ``prefix``, after ``after``."""
+        start = bisect.bisect_left(self._entries, (prefix,))
+        if after is not None:
+            start = max(start, bisect.bisect_right(self._entries, after))
+        matches = []
+        for entry in self._entries[start : start + limit]:
+            if not entry[0].startswith(prefix):
+                break
+            matches.append(entry)
+        return matches
+
+    async def run_once(self) -> int:
+        """Load products not yet indexed; returns how many were added."""
+        now = time.monotonic()
+        self._gaps = {
+            gap: seen
+            for gap, seen in self._gaps.items()
+            if now - seen < self._gap_seconds
+        }
+        low = min(self._gaps, default=self._last_id + 1)
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(Product.id, Product.name)
+                .where(Product.id >= low)
+                .order_by(Product.id)
+            )
+            rows = [
+                (_name_key(name), product_id)
+                for product_id, name in result
+                if product_id not in self._ids
+            ]
+
+        self._ids.update(product_id for _, product_id in rows)
+        if len(rows) > 64:
+            self._entries.extend(rows)
+            self._entries.sort()
+        else:
+            for row in rows:
+                bisect.insort(self._entries, row)
+
+        last_id = max((product_id for _, product_id in rows), default=0)
+        if self.loaded:
+            for gap in range(low, last_id):
+                if gap not in self._ids:
+                    self._gaps.setdefault(gap, now)
+                else:
+                    self._gaps.pop(gap, None)
+        self._last_id = max(self._last_id, last_id)
+        if not self.loaded:
+            logger.info("Indexed %d product name(s)", len(rows))
+        self.loaded = True
+        return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Product name index refresh failed")
+            await asyncio.sleep(self._interval)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class ProductSearch:
+    """Name searches; prefix ones use ``index`` once it has loaded."""
+
+    def __init__(
+        self, db: AsyncSession, index: ProductNameIndex | None = None
+    ) -> None:
+        self._db = db
+        self._index = index
+
+    async def search(
+        self,
+        query: str,
+        mode: SearchMode = "prefix",
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        A page of products matching ``query``. Like a cursor page of
+        ``list_products``: no total, and ``next_cursor`` while more follow.
+        Cursors are only valid for the same query and mode.
+        """
+        if mode == "fuzzy":
+            items, next_cursor = await self._fuzzy(query, limit, cursor)
+        elif self._index is not None and self._index.loaded:
+            items, next_cursor = await self._prefix_from_index(query, limit, cursor)
+        else:
+            items, next_cursor = await self._prefix(query, limit, cursor)
+        return {
+            "items": items,
+            "total": None,
+            "total_is_estimate": False,
+            "limit": limit,
+            "offset": None,
+            "next_cursor": next_cursor,
+        }
+
+    async def _prefix(
+        self, query: str, limit: int, cursor: str | None
+    ) -> tuple[list[ProductRead], str | None]:
+        prefix = query.strip().lower()
+        stmt = select(Product, _NAME_KEY).where(_NAME_KEY >= prefix)
+        end = _prefix_end(prefix)
+        if end is not None:
+            stmt = stmt.where(_NAME_KEY < end)
+        if cursor is not None:
+            stmt = stmt.where(
+                tuple_(_NAME_KEY, Product.id) > tuple_(*decode_name_cursor(cursor))
+            )
+        stmt = stmt.order_by(_NAME_KEY, Product.id).limit(limit + 1)
+        # Stock is changed with Core UPDATEs; never serve it from the identity map.
+        result = await self._db.execute(
+            stmt.execution_options(populate_existing=True)
+        )
+        rows = result.all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            product, key = rows[-1]
+            next_cursor = encode_name_cursor(key, product.id)
+        return [ProductRead.model_validate(product) for product, _ in rows], next_cursor
+
+    async def _prefix_from_index(
+        self, query: str, limit: int, cursor: str | None
+    ) -> tuple[list[ProductRead], str | None]:
+        assert self._index is not None
+        after = decode_name_cursor(cursor) if cursor is not None else None
+        matches = self._index.search(_name_key(query.strip()), limit + 1, after)
+        next_cursor = None
+        if len(matches) > limit:
+            matches = matches[:limit]
+            next_cursor = encode_name_cursor(*matches[-1])
+        if not matches:
+            return [], next_cursor
+        ids = [product_id for _, product_id in matches]
+        result = await self._db.execute(
+            select(Product)
+            .where(Product.id.in_(ids))
+            .execution_options(populate_existing=True)
+        )
+        products = {product.id: product for product in result.scalars()}
+        # An id can be missing from a replica that has not caught up yet.
+        return [
+            ProductRead.model_validate(products[product_id])
+            for product_id in ids
+            if product_id in products
+        ], next_cursor
+
+    async def _fuzzy(
+        self, query: str, limit: int, cursor: str | None
+    ) -> tuple[list[ProductRead], str | None]:
+        words = _WORD.findall(query.lower())
+        if not words:
+            return [], None
+        tsquery = func.to_tsquery(
+            _SIMPLE, " & ".join(f"{word}:*" for word in words)
+        )
+        rank = func.ts_rank(_NAME_VECTOR, tsquery)
+        stmt = select(Product, rank).where(_NAME_VECTOR.bool_op("@@")(tsquery))
+        if cursor is not None:
+            after_rank, after_id = decode_rank_cursor(cursor)
+            stmt = stmt.where(tuple_(-rank, Product.id) > tuple_(-after_rank, after_id))
+        stmt = stmt.order_by(rank.desc(), Product.id).limit(limit + 1)
+        result = await self._db.execute(
+            stmt.execution_options(populate_existing=True)
+        )
+        rows = result.all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            product, last_rank = rows[-1]
+            next_cursor = encode_rank_cursor(last_rank, product.id)
+        return [ProductRead.model_validate(product) for product, _ in rows], next_cursor
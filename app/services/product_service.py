@@ -1,22 +1,70 @@
 """Product service."""
 import logging
-from typing import Any
+from contextlib import suppress
+from datetime import datetime
+from typing import Any, Protocol
 
-from sqlalchemy import func, select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
+from app.etag import make_etag, page_etag
 from app.exceptions import NotFoundError
 from app.models.product import Product
-from app.schemas.product import ProductCreate
+from app.pagination import decode_product_cursor, encode_product_cursor
+from app.schemas.product import ProductCreate, ProductRead
+from app.services.events import notify, stock_changed
+from app.services.list_totals import EXACT_COUNTS, TotalMode, page_total
+from app.services.product_cache import ProductCache
+from app.services.product_search import ProductNameIndex
+from app.services.stock_stripes import StockStripes
+from app.singleflight import READ_FLIGHTS, single_flight
 
 logger = logging.getLogger(__name__)
 
 
+class _ProductVersion(Protocol):
+    id: int
+    updated_at: datetime
+    stock_quantity: int
+    reserved_quantity: int
+
+
+def _version_tag(product: _ProductVersion) -> str:
+    # Striped stock and reservations change without touching updated_at.
+    return (
+        f"{product.id}:{product.updated_at.isoformat()}:"
+        f"{product.stock_quantity}:{product.reserved_quantity}"
+    )
+
+
+def product_etag(product: _ProductVersion) -> str:
+    """ETag of a product, from a ``ProductRead`` or a metadata row."""
+    return make_etag(_version_tag(product))
+
+
+def product_page_etag(page: dict[str, Any]) -> str:
+    """ETag of a ``list_products`` page."""
+    return page_etag(
+        page["total"],
+        page["total_is_estimate"],
+        page["next_cursor"] is not None,
+        (_version_tag(product) for product in page["items"]),
+    )
+
+
 class ProductService:
     """Encapsulates all product-related database operations."""
 
-    def __init__(self, db: AsyncSession) -> None:
+    def __init__(
+        self,
+        db: AsyncSession,
+        cache: ProductCache | None = None,
+        name_index: ProductNameIndex | None = None,
+    ) -> None:
         self._db = db
+        self._cache = cache
+        self._name_index = name_index
 
     async def create_product(self, payload: ProductCreate) -> Product:
         product = Product(
@@ -25,32 +73,175 @@ class ProductService:
             stock_quantity=payload.stock_quantity,
         )
         self._db.add(product)
+        if get_settings().events_enabled:
+            await self._db.flush()
+            await self._db.execute(select(notify([stock_changed([product.id])])))
         await self._db.commit()
+        READ_FLIGHTS.forget()
+        EXACT_COUNTS.invalidate(Product.__tablename__)
         await self._db.refresh(product)
+        if self._cache is not None:
+            await self._cache.invalidate_lists()
+        if self._name_index is not None:
+            self._name_index.add(product.id, product.name)
         logger.info("Created product id=%d name=%r", product.id, product.name)
         return product
 
-    async def get_product_by_id(self, product_id: int) -> Product:
+    @single_flight("products.get")
+    async def get_product_by_id(self, product_id: int) -> ProductRead:
+        if self._cache is not None:
+            return await self._cache.get_product(
+                product_id, lambda: self._load_product(product_id)
+            )
+        return await self._load_product(product_id)
+
+    async def _load_product(self, product_id: int) -> ProductRead:
         result = await self._db.execute(
-            select(Product).where(Product.id == product_id)
+            select(Product)
+            .where(Product.id == product_id)
+            .execution_options(populate_existing=True)
         )
         product = result.scalar_one_or_none()
         if product is None:
             raise NotFoundError("Product", product_id)
-        return product
+        return ProductRead.model_validate(product)
+
+    @single_flight("products.etag")
+    async def product_etag(self, product_id: int) -> str | None:
+        """
+        The ETag ``get_product_by_id`` would send, read from four columns
+        instead of the row; None if the product does not exist.
+        """
+        result = await self._db.execute(
+            _version_columns().where(Product.id == product_id)
+        )
+        row = result.first()
+        return None if row is None else product_etag(row)
+
+    async def warm_up(self) -> None:
+        """
+        Run the hot product reads once on this session's connection, so they
+        are compiled and prepared before the first real request.
+        """
+        limit = get_settings().default_page_limit
+        with suppress(NotFoundError):
+            await self._load_product(0)
+        await self.product_etag(0)
+        await self._load_page(limit, 0, None)
+        await self._load_page(limit, 0, encode_product_cursor(0))
+        await self.page_etag(limit=limit)
 
+    async def set_stock_stripes(self, product_id: int, stripes: int) -> ProductRead:
+        """
+        Switch a product to striped stock with ``stripes`` counters (or back,
+        with 0). The total stock is preserved and re-split evenly.
+        """
+        if not await StockStripes(self._db).set_stripes(product_id, stripes):
+            raise NotFoundError("Product", product_id)
+        if get_settings().events_enabled:
+            await self._db.execute(select(notify([stock_changed([product_id])])))
+        await self._db.commit()
+        READ_FLIGHTS.forget()
+        if self._cache is not None:
+            await self._cache.invalidate_products([product_id])
+        logger.info("Product id=%d now has %d stock stripe(s)", product_id, stripes)
+        return await self._load_product(product_id)
+
+    @single_flight("products.list")
     async def list_products(
-        self, limit: int = 20, offset: int = 0
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: str | None = None,
+        total_mode: TotalMode | None = None,
     ) -> dict[str, Any]:
-        count_result = await self._db.execute(select(func.count(Product.id)))
-        total: int = count_result.scalar_one()
+        """
+        Return a page of products ordered by id.
 
-        data_result = await self._db.execute(
-            select(Product)
-            .order_by(Product.id)
-            .limit(limit)
-            .offset(offset)
+        With ``cursor`` the page starts after the previous page's last id
+        (a primary-key seek); ``offset`` is ignored. ``total_mode`` (default:
+        the ``list_total_mode`` setting) picks how ``total`` is computed; see
+        ``page_total``.
+        """
+        if self._cache is not None:
+            return await self._cache.get_page(
+                (limit, offset, cursor, total_mode),
+                lambda: self._load_page(limit, offset, cursor, total_mode),
+            )
+        return await self._load_page(limit, offset, cursor, total_mode)
+
+    @single_flight("products.page_etag")
+    async def page_etag(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: str | None = None,
+        total_mode: TotalMode | None = None,
+    ) -> str:
+        """
+        The ETag of the page ``list_products`` would return, computed from
+        the total and the ids, ``updated_at``, stock and reserved stock of
+        its rows.
+        """
+        total, total_is_estimate = await page_total(
+            self._db, total_mode, Product.__table__
+        )
+        result = await self._db.execute(
+            _page_query(_version_columns(), offset, cursor).limit(limit + 1)
+        )
+        rows = result.all()
+        return page_etag(
+            total,
+            total_is_estimate,
+            len(rows) > limit,
+            (_version_tag(row) for row in rows[:limit]),
+        )
+
+    async def _load_page(
+        self,
+        limit: int,
+        offset: int,
+        cursor: str | None,
+        total_mode: TotalMode | None = None,
+    ) -> dict[str, Any]:
+        total, total_is_estimate = await page_total(
+            self._db, total_mode, Product.__table__
+        )
+
+        # Stock is changed with Core UPDATEs; never serve it from the identity map.
+        stmt = _page_query(select(Product), offset, cursor).execution_options(
+            populate_existing=True
         )
+
+        # Fetch one extra row to learn whether another page follows.
+        data_result = await self._db.execute(stmt.limit(limit + 1))
         products = list(data_result.scalars().all())
+        next_cursor = None
+        if len(products) > limit:
+            products = products[:limit]
+            next_cursor = encode_product_cursor(products[-1].id)
+
+        return {
+            "items": [ProductRead.model_validate(p) for p in products],
+            "total": total,
+            "total_is_estimate": total_is_estimate,
+            "limit": limit,
+            "offset": None if cursor is not None else offset,
+            "next_cursor": next_cursor,
+        }
+
+
+def _version_columns() -> Select:
+    return select(
+        Product.id,
+        Product.updated_at,
+        Product.total_stock.label("stock_quantity"),
+        Product.reserved_quantity,
+    )
+
 
-        return {"items": products, "total": total, "limit": limit, "offset": offset}
+def _page_query(stmt: Select, offset: int, cursor: str | None) -> Select:
+    stmt = stmt.order_by(Product.id)
+    if cursor is not None:
+        return stmt.where(Product.id > decode_product_cursor(cursor))
+    return stmt.offset(offset)
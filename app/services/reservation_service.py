@@ -0,0 +1,256 @@
+"""Reservation service — time-limited stock holds and their expiry sweep."""
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import timedelta
+
+from sqlalchemy import Integer, column, delete, func, insert, select, update, values
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.config import get_settings
+from app.exceptions import NotFoundError
+from app.models.product import Product
+from app.models.reservation import Reservation, ReservationItem
+from app.schemas.reservation import (
+    ReservationCreate,
+    ReservationItemRead,
+    ReservationRead,
+)
+from app.services.events import notify, stock_changed
+from app.services.order_service import OrderService, aggregate_quantities
+from app.services.product_cache import ProductCache
+from app.singleflight import READ_FLIGHTS
+
+logger = logging.getLogger(__name__)
+
+
+class ReservationService:
+    """
+    Holds move stock out of the products' available stock into
+    ``reservation_items`` for a limited time. Making one takes the stock
+    the way the "conditional_update" order strategy does, so no product row
+    is locked for longer than the statements and the commit; an order
+    consuming the hold (``OrderCreate.reservation_id``) then touches no
+    product row at all.
+    """
+
+    def __init__(
+        self, db: AsyncSession, product_cache: ProductCache | None = None
+    ) -> None:
+        self._db = db
+        self._product_cache = product_cache
+        self._publish_events = get_settings().events_enabled
+
+    async def reserve(self, payload: ReservationCreate) -> ReservationRead:
+        """
+        Hold ``payload.items`` for ``payload.ttl_seconds`` (default: the
+        ``reservation_ttl_seconds`` setting). All items are held or none:
+        a missing product or short stock rolls back and raises like an
+        order would.
+        """
+        quantity_map = aggregate_quantities(payload.items)
+        ttl = payload.ttl_seconds or get_settings().reservation_ttl_seconds
+        result = await self._db.execute(
+            insert(Reservation)
+            .values(expires_at=func.now() + timedelta(seconds=ttl))
+            .returning(Reservation.id, Reservation.expires_at, Reservation.created_at)
+        )
+        reservation = result.one()
+        await OrderService(self._db).take_stock(quantity_map, "reservation")
+
+        stmt = insert(ReservationItem).values(
+            [
+                {
+                    "reservation_id": reservation.id,
+                    "product_id": product_id,
+                    "quantity": quantity,
+                }
+                for product_id, quantity in sorted(quantity_map.items())
+            ]
+        )
+        if self._publish_events:
+            stmt = stmt.returning(notify([stock_changed(quantity_map)]))
+        await self._db.execute(stmt)
+        await self._db.commit()
+        await self._stock_changed(quantity_map)
+
+        logger.info(
+            "Reserved %d product(s) as reservation id=%d until %s",
+            len(quantity_map),
+            reservation.id,
+            reservation.expires_at,
+        )
+        return ReservationRead(
+            id=reservation.id,
+            expires_at=reservation.expires_at,
+            created_at=reservation.created_at,
+            items=[
+                ReservationItemRead(product_id=product_id, quantity=quantity)
+                for product_id, quantity in sorted(quantity_map.items())
+            ],
+        )
+
+    async def get_reservation(self, reservation_id: int) -> ReservationRead:
+        result = await self._db.execute(
+            select(
+                Reservation.id,
+                Reservation.expires_at,
+                Reservation.created_at,
+                ReservationItem.product_id,
+                ReservationItem.quantity,
+            )
+            .join(ReservationItem, ReservationItem.reservation_id == Reservation.id)
+            .where(Reservation.id == reservation_id)
+            .order_by(ReservationItem.product_id)
+        )
+        rows = result.all()
+        if not rows:
+            raise NotFoundError("Reservation", reservation_id)
+        return ReservationRead(
+            id=rows[0].id,
+            expires_at=rows[0].expires_at,
+            created_at=rows[0].created_at,
+            items=[ReservationItemRead.model_validate(row) for row in rows],
+        )
+
+    async def release(self, reservation_id: int) -> None:
+        """Return a hold's stock now, e.g. when a checkout is abandoned."""
+        released, product_ids = await _return_holds(
+            self._db, Reservation.id == reservation_id, self._publish_events
+        )
+        if not released:
+            await self._db.rollback()
+            raise NotFoundError("Reservation", reservation_id)
+        await self._db.commit()
+        await self._stock_changed(product_ids)
+        logger.info("Released reservation id=%d", reservation_id)
+
+    async def _stock_changed(self, product_ids: Iterable[int]) -> None:
+        READ_FLIGHTS.forget()
+        if self._product_cache is not None:
+            await self._product_cache.invalidate_products(product_ids)
+
+
+async def _return_holds(
+    db: AsyncSession, which: ColumnElement[bool], publish_events: bool = True
+) -> tuple[int, list[int]]:
+    """
+    Delete the reservations matching ``which`` and add their items back to
+    the products' stock, within the caller's transaction. Striped products
+    get it on the product row, which the rebalancer spreads over their
+    stripes. Returns the number of holds deleted and the restocked products.
+    """
+    deleted = (
+        delete(Reservation).where(which).returning(Reservation.id).cte("deleted")
+    )
+    items = (
+        delete(ReservationItem)
+        .where(ReservationItem.reservation_id.in_(select(deleted.c.id)))
+        .returning(
+            ReservationItem.reservation_id,
+            ReservationItem.product_id,
+            ReservationItem.quantity,
+        )
+        .cte("items")
+    )
+    result = await db.execute(select(items))
+    holds: set[int] = set()
+    totals: dict[int, int] = defaultdict(int)
+    for row in result:
+        holds.add(row.reservation_id)
+        totals[row.product_id] += row.quantity
+    if not totals:
+        return 0, []
+
+    # The row lock order of UPDATE ... FROM (VALUES ...) follows the plan,
+    # not the list, so lock the products in id order first, as orders do.
+    await db.execute(
+        select(Product.id)
+        .where(Product.id.in_(sorted(totals)))
+        .order_by(Product.id)
+        .with_for_update()
+    )
+    returned = values(
+        column("id", Integer), column("qty", Integer), name="returned"
+    ).data(sorted(totals.items()))
+    stmt = (
+        update(Product)
+        .where(Product.id == returned.c.id)
+        .values(stock_quantity=Product.stock_quantity + returned.c.qty)
+        .execution_options(synchronize_session=False)
+    )
+    if publish_events:
+        stmt = stmt.returning(notify([stock_changed(totals)]))
+    await db.execute(stmt)
+    return len(holds), sorted(totals)
+
+
+class ReservationSweeper:
+    """
+    Background task that returns the stock of expired holds, oldest first,
+    at most ``batch_size`` holds per transaction. Holds are claimed with
+    SKIP LOCKED, so workers sweeping at once split the work, and an order
+    consuming a hold at the same moment either gets it or finds it gone.
+    A hold keeps its stock for its TTL and at most one interval (plus the
+    sweep) longer, though it can no longer be consumed after its TTL.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval_seconds: float,
+        batch_size: int = 500,
+        product_cache: ProductCache | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._interval = interval_seconds
+        self._batch_size = batch_size
+        self._product_cache = product_cache
+        self._task: asyncio.Task[None] | None = None
+
+    async def run_once(self) -> int:
+        expired = (
+            select(Reservation.id)
+            .where(Reservation.expires_at <= func.now())
+            .order_by(Reservation.expires_at)
+            .limit(self._batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        publish_events = get_settings().events_enabled
+        swept = 0
+        async with self._session_factory() as session:
+            while True:
+                released, product_ids = await _return_holds(
+                    session,
+                    Reservation.id.in_(expired.scalar_subquery()),
+                    publish_events,
+                )
+                await session.commit()
+                if released:
+                    READ_FLIGHTS.forget()
+                    if self._product_cache is not None:
+                        await self._product_cache.invalidate_products(product_ids)
+                swept += released
+                if released < self._batch_size:
+                    break
+        if swept:
+            logger.info("Returned the stock of %d expired reservation(s)", swept)
+        return swept
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Reservation sweep failed")
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
@@ -0,0 +1,294 @@
+"""Sales analytics — incremental aggregate maintenance, reporting and rebuild."""
+import asyncio
+import logging
+from collections.abc import Iterable
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Literal
+
+from sqlalchemy import (
+    CTE,
+    Date,
+    Integer,
+    Numeric,
+    Select,
+    SmallInteger,
+    cast,
+    column,
+    delete,
+    func,
+    select,
+    values,
+)
+from sqlalchemy.dialects.postgresql import Insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.models.order import Order, OrderStatus
+from app.models.order_item import OrderItem
+from app.models.product import Product
+from app.models.product_daily_sales import ProductDailySales
+from app.schemas.analytics import ProductSales, SalesBucket, SalesReport
+
+logger = logging.getLogger(__name__)
+
+Granularity = Literal["day", "week", "month"]
+
+
+def record_sales(
+    items: Iterable[tuple[int, int, int, Decimal]],
+    spread: dict[int, int] | None = None,
+) -> CTE:
+    """
+    Upsert that adds (order_id, product_id, quantity, price) rows to today's
+    totals, as a CTE to attach to the statement inserting those items.
+
+    ``CURRENT_DATE`` is evaluated at transaction start, like the ``now()``
+    that fills ``orders.created_at``, so both agree on the day.
+
+    ``spread`` maps striped products to their stripe count. Their totals are
+    split over that many slots, picked by backend pid, so concurrent orders
+    on separate connections do not queue on one aggregate row.
+    """
+    spread = spread or {}
+    totals: dict[int, list] = {}
+    for _order_id, product_id, quantity, price in items:
+        total = totals.setdefault(product_id, [0, 0, Decimal("0")])
+        total[0] += 1
+        total[1] += quantity
+        total[2] += quantity * price
+    # Rows go through a VALUES list rather than insert().values(): the CTE
+    # shares the item INSERT's bind namespace, and both would name their
+    # parameters after the same columns.
+    sold = values(
+        column("product_id", Integer),
+        column("slots", Integer),
+        column("order_count", Integer),
+        column("units", Integer),
+        column("revenue", Numeric(14, 2)),
+        name="sold",
+    ).data(
+        [
+            (product_id, spread.get(product_id, 0), order_count, units, revenue)
+            for product_id, (order_count, units, revenue) in sorted(totals.items())
+        ]
+    )
+    slot = func.pg_backend_pid() % func.greatest(sold.c.slots, 1)
+    stmt = pg_insert(ProductDailySales).from_select(
+        ["product_id", "day", "slot", "order_count", "units", "revenue"],
+        select(
+            sold.c.product_id,
+            func.current_date(),
+            cast(slot, SmallInteger),
+            sold.c.order_count,
+            sold.c.units,
+            sold.c.revenue,
+        ),
+    )
+    return _accumulate(stmt).cte("recorded_sales")
+
+
+def reverse_sales(cancelled: CTE) -> CTE:
+    """
+    Subtract the items of the orders returned by ``cancelled`` (a CTE with
+    ``id`` and ``created_at`` columns) from their day's totals.
+
+    The negated totals are added to slot 0, which may not exist yet when a
+    striped product's sales landed in other slots; readers sum all slots.
+    """
+    day = cast(cancelled.c.created_at, Date)
+    stmt = pg_insert(ProductDailySales).from_select(
+        ["product_id", "day", "order_count", "units", "revenue"],
+        select(
+            OrderItem.product_id,
+            day,
+            -func.count(),
+            -func.sum(OrderItem.quantity),
+            -func.sum(OrderItem.quantity * OrderItem.price_at_time),
+        )
+        .join_from(cancelled, OrderItem, OrderItem.order_id == cancelled.c.id)
+        .group_by(OrderItem.product_id, day),
+    )
+    return _accumulate(stmt).cte("reversed_sales")
+
+
+def _accumulate(stmt: Insert) -> Insert:
+    """ON CONFLICT clause adding the inserted totals to an existing row."""
+    return stmt.on_conflict_do_update(
+        index_elements=[
+            ProductDailySales.product_id,
+            ProductDailySales.day,
+            ProductDailySales.slot,
+        ],
+        set_={
+            "order_count": ProductDailySales.order_count + stmt.excluded.order_count,
+            "units": ProductDailySales.units + stmt.excluded.units,
+            "revenue": ProductDailySales.revenue + stmt.excluded.revenue,
+        },
+    )
+
+
+class SalesService:
+    """Read-side queries over ``product_daily_sales``."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+
+    async def sales_report(
+        self,
+        granularity: Granularity = "day",
+        date_from: date | None = None,
+        date_to: date | None = None,
+        product_id: int | None = None,
+        top: int = 10,
+    ) -> SalesReport:
+        """
+        Units and revenue per day, week (ISO, starting Monday) or month, plus
+        the ``top`` products by revenue over the same range. ``date_from`` is
+        inclusive and ``date_to`` exclusive.
+        """
+        filters = []
+        if date_from is not None:
+            filters.append(ProductDailySales.day >= date_from)
+        if date_to is not None:
+            filters.append(ProductDailySales.day < date_to)
+        if product_id is not None:
+            filters.append(ProductDailySales.product_id == product_id)
+
+        period = cast(func.date_trunc(granularity, ProductDailySales.day), Date)
+        result = await self._db.execute(
+            select(
+                period.label("period"),
+                func.sum(ProductDailySales.units).label("units"),
+                func.sum(ProductDailySales.revenue).label("revenue"),
+            )
+            .where(*filters)
+            .group_by(period)
+            .order_by(period)
+        )
+        buckets = [SalesBucket.model_validate(row) for row in result]
+
+        top_products: list[ProductSales] = []
+        if top > 0:
+            revenue = func.sum(ProductDailySales.revenue)
+            result = await self._db.execute(
+                select(
+                    ProductDailySales.product_id,
+                    Product.name,
+                    func.sum(ProductDailySales.order_count).label("order_count"),
+                    func.sum(ProductDailySales.units).label("units"),
+                    revenue.label("revenue"),
+                )
+                .join(Product, Product.id == ProductDailySales.product_id)
+                .where(*filters)
+                .group_by(ProductDailySales.product_id, Product.name)
+                .order_by(revenue.desc(), ProductDailySales.product_id)
+                .limit(top)
+            )
+            top_products = [ProductSales.model_validate(row) for row in result]
+
+        return SalesReport(
+            granularity=granularity,
+            date_from=date_from,
+            date_to=date_to,
+            buckets=buckets,
+            top_products=top_products,
+        )
+
+
+def _history(start: date, end: date) -> Select:
+    """Totals for non-cancelled orders created in [start, end)."""
+    day = cast(Order.created_at, Date)
+    return (
+        select(
+            OrderItem.product_id,
+            day.label("day"),
+            func.count(),
+            func.sum(OrderItem.quantity),
+            func.sum(OrderItem.quantity * OrderItem.price_at_time),
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(
+            Order.status != OrderStatus.CANCELLED,
+            Order.created_at >= start,
+            Order.created_at < end,
+        )
+        .group_by(OrderItem.product_id, day)
+    )
+
+
+async def _rebuild_chunk(engine: AsyncEngine, start: date, end: date) -> int:
+    stmt = pg_insert(ProductDailySales).from_select(
+        ["product_id", "day", "order_count", "units", "revenue"], _history(start, end)
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            ProductDailySales.product_id,
+            ProductDailySales.day,
+            ProductDailySales.slot,
+        ],
+        set_={
+            "order_count": stmt.excluded.order_count,
+            "units": stmt.excluded.units,
+            "revenue": stmt.excluded.revenue,
+        },
+    )
+    async with engine.begin() as conn:
+        await conn.execute(
+            delete(ProductDailySales).where(
+                ProductDailySales.day >= start, ProductDailySales.day < end
+            )
+        )
+        result = await conn.execute(stmt)
+    logger.info("Rebuilt sales %s..%s: %d row(s)", start, end, result.rowcount)
+    return result.rowcount
+
+
+async def rebuild_sales(
+    engine: AsyncEngine,
+    chunk_days: int = 31,
+    workers: int = 4,
+    since: date | None = None,
+    until: date | None = None,
+) -> int:
+    """
+    Recompute ``product_daily_sales`` from orders in [since, until).
+
+    The range is split into ``chunk_days`` windows, each replaced in its own
+    transaction, with up to ``workers`` windows in flight on separate
+    connections. Without bounds the whole order history is covered.
+
+    Past days are exact. An order that creates a brand-new (product, day)
+    row while its window is being rebuilt can be overwritten, so exclude
+    today (``until``) when running under live traffic.
+    """
+    if since is None or until is None:
+        async with engine.connect() as conn:
+            first, last = (
+                await conn.execute(
+                    select(
+                        func.min(cast(Order.created_at, Date)),
+                        func.max(cast(Order.created_at, Date)),
+                    )
+                )
+            ).one()
+        if first is None:
+            return 0
+        since = since or first
+        until = until or last + timedelta(days=1)
+
+    windows = []
+    start = since
+    while start < until:
+        end = min(start + timedelta(days=chunk_days), until)
+        windows.append((start, end))
+        start = end
+
+    semaphore = asyncio.Semaphore(workers)
+
+    async def run(start: date, end: date) -> int:
+        async with semaphore:
+            return await _rebuild_chunk(engine, start, end)
+
+    counts = await asyncio.gather(*(run(s, e) for s, e in windows))
+    return sum(counts)
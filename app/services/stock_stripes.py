@@ -0,0 +1,312 @@
+"""Striped stock — draws, redistribution and background rebalancing."""
+import asyncio
+import logging
+import random
+from collections.abc import Iterable
+
+from sqlalchemy import (
+    Integer,
+    SmallInteger,
+    column,
+    delete,
+    insert,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.product import Product
+from app.models.product_stock_stripe import ProductStockStripe as Stripe
+
+logger = logging.getLogger(__name__)
+
+# Key of the product row's own stock (stock added since the last rebalance)
+# in ``StockStripes.lock`` results; real stripes are numbered from 0.
+RESIDUAL = -1
+
+
+class StockStripes:
+    """
+    Stock operations on ``product_stock_stripes`` within the caller's
+    transaction. Every decrement is guarded (``quantity >= n``) or runs on
+    rows locked beforehand, and the CHECK constraint backs both, so stripes
+    cannot oversell any more than a single counter can.
+    """
+
+    def __init__(self, db: AsyncSession, rng: random.Random | None = None) -> None:
+        self._db = db
+        self._rng = rng or random.Random()
+
+    async def draw(self, requests: dict[int, tuple[int, int]]) -> dict[int, int]:
+        """
+        Take stock for ``{product_id: (quantity, stripe_count)}``.
+
+        Each product first tries one random stripe; all products share a
+        single guarded UPDATE. A product whose stripe is short retries on the
+        fullest stripe nobody else holds (SKIP LOCKED). If any product is
+        still unserved, everything is undone and the products' rows and all
+        their stripes are locked, in order, to draw across them, including
+        stock returned to the product row since the last rebalance.
+
+        The fast tiers run in a savepoint: a guarded UPDATE that waited on a
+        stripe and then found it short still holds its lock, and keeping it
+        while waiting for the remaining stripes could deadlock with another
+        order doing the same.
+
+        Returns ``{product_id: available}`` for products that could not be
+        served; the caller must roll back, as the others were already taken.
+        """
+        picks = sorted(
+            (product_id, self._rng.randrange(stripes), quantity)
+            for product_id, (quantity, stripes) in requests.items()
+        )
+        savepoint = await self._db.begin_nested()
+        served = set(await self._take(picks, guarded=True))
+        for product_id, _stripe, quantity in picks:
+            if product_id in served:
+                continue
+            candidate = (
+                select(Stripe.stripe)
+                .where(Stripe.product_id == product_id, Stripe.quantity >= quantity)
+                .order_by(Stripe.quantity.desc())
+                .limit(1)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            result = await self._db.execute(
+                update(Stripe)
+                .where(Stripe.product_id == product_id, Stripe.stripe == candidate)
+                .values(quantity=Stripe.quantity - quantity)
+                .returning(Stripe.stripe)
+                .execution_options(synchronize_session=False)
+            )
+            if result.first() is None:
+                await savepoint.rollback()
+                break
+        else:
+            await savepoint.commit()
+            return {}
+
+        consumed = {product_id: quantity for product_id, _, quantity in picks}
+        locked = await self.lock(consumed)
+        short = {
+            product_id: available
+            for product_id, quantity in consumed.items()
+            if (available := sum(locked.get(product_id, {}).values())) < quantity
+        }
+        if not short:
+            await self.take(locked, consumed)
+        return short
+
+    async def lock(self, product_ids: Iterable[int]) -> dict[int, dict[int, int]]:
+        """
+        Lock the rows of ``product_ids`` and then every stripe of them;
+        returns product -> stripe -> qty, with the stock on the product row
+        itself under ``RESIDUAL``. Missing products are left out.
+        """
+        product_ids = sorted(product_ids)
+        result = await self._db.execute(
+            select(Product.id, Product.stock_quantity)
+            .where(Product.id.in_(product_ids))
+            .order_by(Product.id)
+            .with_for_update()
+        )
+        locked: dict[int, dict[int, int]] = {
+            row.id: {RESIDUAL: row.stock_quantity} for row in result
+        }
+        result = await self._db.execute(
+            select(Stripe.product_id, Stripe.stripe, Stripe.quantity)
+            .where(Stripe.product_id.in_(product_ids))
+            .order_by(Stripe.product_id, Stripe.stripe)
+            .with_for_update()
+        )
+        for row in result:
+            locked[row.product_id][row.stripe] = row.quantity
+        return locked
+
+    async def take(
+        self, locked: dict[int, dict[int, int]], consumed: dict[int, int]
+    ) -> None:
+        """
+        Draw ``consumed`` from the stripes and product rows returned by
+        ``lock``, fullest first.
+        """
+        picks = []
+        from_rows = []
+        for product_id, quantity in sorted(consumed.items()):
+            stripes = locked[product_id]
+            for stripe in sorted(stripes, key=stripes.__getitem__, reverse=True):
+                if quantity == 0:
+                    break
+                amount = min(quantity, stripes[stripe])
+                if amount:
+                    if stripe == RESIDUAL:
+                        from_rows.append((product_id, amount))
+                    else:
+                        picks.append((product_id, stripe, amount))
+                    stripes[stripe] -= amount
+                    quantity -= amount
+        await self._take(picks, guarded=False)
+        if from_rows:
+            requested = values(
+                column("id", Integer), column("qty", Integer), name="requested"
+            ).data(from_rows)
+            await self._db.execute(
+                update(Product)
+                .where(Product.id == requested.c.id)
+                .values(stock_quantity=Product.stock_quantity - requested.c.qty)
+                .execution_options(synchronize_session=False)
+            )
+
+    async def _take(
+        self, picks: list[tuple[int, int, int]], guarded: bool
+    ) -> list[int]:
+        if not picks:
+            return []
+        requested = values(
+            column("product_id", Integer),
+            column("stripe", SmallInteger),
+            column("qty", Integer),
+            name="requested",
+        ).data(picks)
+        stmt = (
+            update(Stripe)
+            .where(
+                Stripe.product_id == requested.c.product_id,
+                Stripe.stripe == requested.c.stripe,
+            )
+            .values(quantity=Stripe.quantity - requested.c.qty)
+            .returning(Stripe.product_id)
+            .execution_options(synchronize_session=False)
+        )
+        if guarded:
+            stmt = stmt.where(Stripe.quantity >= requested.c.qty)
+        result = await self._db.execute(stmt)
+        return list(result.scalars())
+
+    async def set_stripes(self, product_id: int, stripes: int) -> bool:
+        """
+        Re-split a product's total stock across ``stripes`` counters, or fold
+        it back into ``products.stock_quantity`` when ``stripes`` is 0.
+        Returns False if the product does not exist.
+        """
+        locked = await self.lock([product_id])
+        if product_id not in locked:
+            return False
+        total = sum(locked[product_id].values())
+        await self._db.execute(delete(Stripe).where(Stripe.product_id == product_id))
+        if stripes:
+            await self._db.execute(
+                insert(Stripe),
+                [
+                    {"product_id": product_id, "stripe": stripe, "quantity": quantity}
+                    for stripe, quantity in enumerate(_split(total, stripes))
+                ],
+            )
+        await self._db.execute(
+            update(Product)
+            .where(Product.id == product_id)
+            .values(
+                stock_quantity=0 if stripes else total,
+                stock_stripes=stripes,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return True
+
+    async def rebalance(self, product_id: int) -> bool:
+        """
+        Even out the stripes of one product, folding in any stock added to
+        the product row since the last pass. Stripes currently held by orders
+        are skipped rather than waited for; the total is unchanged. Returns
+        True if anything was rewritten.
+        """
+        residual = (
+            await self._db.scalar(
+                select(Product.stock_quantity)
+                .where(Product.id == product_id, Product.stock_stripes > 0)
+                .with_for_update(skip_locked=True)
+            )
+            or 0
+        )
+        result = await self._db.execute(
+            select(Stripe.stripe, Stripe.quantity)
+            .where(Stripe.product_id == product_id)
+            .order_by(Stripe.stripe)
+            .with_for_update(skip_locked=True)
+        )
+        current = {row.stripe: row.quantity for row in result}
+        if not current:
+            return False
+        target = _split(residual + sum(current.values()), len(current))
+        if not residual and max(current.values()) - min(current.values()) <= 1:
+            return False
+
+        changes = [
+            (product_id, stripe, current[stripe] - quantity)
+            for stripe, quantity in zip(current, target)
+            if current[stripe] != quantity
+        ]
+        await self._take(changes, guarded=False)
+        if residual:
+            await self._db.execute(
+                update(Product)
+                .where(Product.id == product_id)
+                .values(stock_quantity=Product.stock_quantity - residual)
+                .execution_options(synchronize_session=False)
+            )
+        return True
+
+
+def _split(total: int, parts: int) -> list[int]:
+    base, extra = divmod(total, parts)
+    return [base + 1 if i < extra else base for i in range(parts)]
+
+
+class StockRebalancer:
+    """
+    Background task that periodically evens out every striped product, so
+    random draws rarely land on an empty stripe and need the slow path.
+    Each product is rebalanced in its own short transaction.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval_seconds: float,
+    ) -> None:
+        self._session_factory = session_factory
+        self._interval = interval_seconds
+        self._task: asyncio.Task[None] | None = None
+
+    async def run_once(self) -> int:
+        async with self._session_factory() as session:
+            product_ids = list(
+                await session.scalars(
+                    select(Product.id).where(Product.stock_stripes > 0)
+                )
+            )
+            await session.rollback()
+            rebalanced = 0
+            for product_id in product_ids:
+                if await StockStripes(session).rebalance(product_id):
+                    rebalanced += 1
+                await session.commit()
+        return rebalanced
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Stock rebalance pass failed")
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
@@ -0,0 +1,113 @@
+"""
+Single-flight coalescing for identical concurrent reads.
+
+When many requests ask for the same thing at the same moment (a product that
+just went live, the first page of a list), only the first runs the query;
+the others wait for it and get the same result. Nothing is kept once the
+query completes, so this never serves anything older than a query that was
+already running when the caller arrived.
+"""
+import asyncio
+import functools
+import inspect
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar, cast
+
+from app.config import get_settings
+from app.metrics import SINGLE_FLIGHT_COLLAPSED
+
+T = TypeVar("T")
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one. The first caller
+    runs ``loader``; every caller that arrives while it is in flight awaits
+    the same result or exception.
+
+    Callers that join are shielded: cancelling one does not cancel the
+    shared call, and if the caller running it is cancelled the others run
+    their own loaders instead. ``forget`` detaches the calls in flight, so
+    later callers start afresh; call it after committing a write.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future[Any]] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self, call: str, key: Hashable, loader: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Run or join ``loader`` under ``(call, key)``; ``call`` labels metrics."""
+        key = (call, key)
+        future = self._calls.get(key)
+        if future is not None:
+            SINGLE_FLIGHT_COLLAPSED.inc(call)
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not future.cancelled() or (task is not None and task.cancelling()):
+                    raise
+            return await loader()
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark exceptions retrieved, or one nobody joined is logged at GC.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._calls[key] = future
+        try:
+            result = await loader()
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if not future.done():
+                future.cancel()
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def forget(self) -> None:
+        self._calls.clear()
+
+
+# Shared by every service in the process; see ``single_flight``.
+READ_FLIGHTS = SingleFlight()
+
+
+def single_flight(call: str) -> Callable[[F], F]:
+    """
+    Route a service read method through ``READ_FLIGHTS``. Calls collapse
+    when their arguments (defaults applied), the engine of the service's
+    session (``self._db``) and its product cache (``self._cache``, if any)
+    are equal, so primary and replica reads never mix, and a caller that
+    bypasses the cache never gets a result served from it. Writers must not
+    use decorated methods to read their own uncommitted rows.
+    """
+
+    def decorate(method: F) -> F:
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            if not get_settings().read_single_flight:
+                return await method(self, *args, **kwargs)
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = tuple(bound.arguments.items())[1:]
+            cache = getattr(self, "_cache", None)
+            return await READ_FLIGHTS.do(
+                call,
+                (self._db.bind, cache and cache.flight_key, arguments),
+                lambda: method(self, *args, **kwargs),
+            )
+
+        return cast(F, wrapper)
+
+    return decorate
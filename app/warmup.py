@@ -0,0 +1,103 @@
+"""Connection-pool warm-up, reported by the readiness endpoint."""
+import asyncio
+import logging
+import time
+from collections.abc import Sequence
+from contextlib import AsyncExitStack
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from app.services.order_service import OrderService
+from app.services.product_service import ProductService
+
+logger = logging.getLogger(__name__)
+
+
+def _pool_size(session_factory: async_sessionmaker[AsyncSession]) -> int:
+    pool = session_factory.kw["bind"].pool
+    # Without persistent connections, still fill SQLAlchemy's compiled cache.
+    return pool.size() if isinstance(pool, QueuePool) else 1
+
+
+class PoolWarmer:
+    """
+    Opens ``connections`` connections from each session factory's pool at
+    once (by default, and at most, every persistent connection: overflow
+    ones are closed when returned) and runs the hot statements on each (see
+    the services' ``warm_up``), so SQLAlchemy has compiled them and asyncpg
+    has prepared them on every connection the pool keeps. ``ready`` turns
+    true once that is done, or straight away with ``connections=0``.
+
+    Runs in the background so the server listens meanwhile; a failed
+    warm-up, e.g. while the database is still starting, is retried every
+    ``retry_seconds``.
+    """
+
+    def __init__(
+        self,
+        session_factories: Sequence[async_sessionmaker[AsyncSession]],
+        connections: int | None = None,
+        retry_seconds: float = 1.0,
+    ) -> None:
+        self._session_factories = session_factories
+        self._connections = connections
+        self._retry = retry_seconds
+        self._task: asyncio.Task[None] | None = None
+        self.ready = connections == 0
+
+    async def run_once(self) -> int:
+        """Warm every pool; returns the number of connections warmed."""
+        started = time.perf_counter()
+        warmed = 0
+        for session_factory in self._session_factories:
+            warmed += await self._warm(session_factory)
+        self.ready = True
+        logger.info(
+            "Warmed %d connection(s) in %.3fs", warmed, time.perf_counter() - started
+        )
+        return warmed
+
+    async def _warm(self, session_factory: async_sessionmaker[AsyncSession]) -> int:
+        count = _pool_size(session_factory)
+        if self._connections is not None:
+            count = min(self._connections, count)
+        async with AsyncExitStack() as stack:
+            # Hold every session until all are connected, so each gets its
+            # own connection instead of reusing one just returned.
+            sessions = [
+                await stack.enter_async_context(session_factory())
+                for _ in range(count)
+            ]
+            await asyncio.gather(*(session.connection() for session in sessions))
+            # One at a time: concurrent identical reads would be collapsed by
+            # single-flight and prepared on one connection only.
+            for session in sessions:
+                await self._warm_session(session)
+        return count
+
+    @staticmethod
+    async def _warm_session(session: AsyncSession) -> None:
+        try:
+            await ProductService(session).warm_up()
+            await OrderService(session).warm_up()
+        finally:
+            await session.rollback()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+                return
+            except Exception:
+                logger.exception("Pool warm-up failed; retrying")
+            await asyncio.sleep(self._retry)
+
+    def start(self) -> None:
+        if not self.ready:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
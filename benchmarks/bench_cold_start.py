@@ -0,0 +1,156 @@
+"""
+Measure how quickly a fresh server process is useful, with and without the
+connection-pool warm-up.
+
+* import: wall time of ``import app.main`` in a new interpreter (median of
+  ``--imports`` runs).
+* listening / ready: from spawning ``python -m app.serve`` until ``/health``
+  and then ``/ready`` first answer 200.
+* first burst: latency of the first ``--burst`` concurrent requests (product
+  reads, product lists and orders) sent once ready, against the same burst
+  repeated after ``--steady`` more requests.
+
+    python -m benchmarks.bench_cold_start --burst 32
+
+With ``DB_WARMUP_CONNECTIONS=0`` the server is ready as soon as it listens
+and the first burst pays for connecting and preparing statements; with the
+warm-up that cost moves before ``/ready``.
+
+The target database is wiped: by default the test DSN
+(``TEST_ASYNC_DATABASE_URL``), never the application database.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import get_settings
+from benchmarks.harness import (
+    OrderWorkload,
+    Request,
+    drive,
+    free_port,
+    seed_catalog,
+    start_server,
+    summarize,
+    wait_for,
+)
+
+_IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def import_seconds(runs: int, env: dict[str, str]) -> float:
+    timings = [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", _IMPORT_SNIPPET],
+                env=os.environ | env,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+        )
+        for _ in range(runs)
+    ]
+    return statistics.median(timings)
+
+
+def _burst(product_ids: list[int], size: int, seed: int) -> list[Request]:
+    workload = OrderWorkload(product_ids, seed=seed)
+    reads = [
+        Request("GET", "/api/v1/products?limit=20"),
+        Request("GET", "/api/v1/orders?limit=20"),
+    ]
+    requests = []
+    for i in range(size):
+        if i % 4 == 0:
+            product_id = product_ids[(seed * size + i) % len(product_ids)]
+            requests.append(Request("GET", f"/api/v1/products/{product_id}"))
+        elif i % 4 == 3:
+            requests.append(workload.next_request())
+        else:
+            requests.append(reads[i % 4 - 1])
+    return requests
+
+
+async def cold_start(
+    args: argparse.Namespace, env: dict[str, str]
+) -> dict[str, float | dict[str, float]]:
+    engine = create_async_engine(args.database_url)
+    product_ids = await seed_catalog(engine, args.products, args.stock)
+    await engine.dispose()
+
+    port = free_port()
+    started = time.perf_counter()
+    server = start_server(1, port, env)
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}",
+            timeout=60,
+            limits=httpx.Limits(max_connections=args.burst),
+        ) as client:
+            await wait_for(client, "/health")
+            listening = time.perf_counter() - started
+            await wait_for(client, "/ready")
+            ready = time.perf_counter() - started
+
+            first, _, _ = await drive(
+                client, _burst(product_ids, args.burst, seed=1), args.burst
+            )
+            await drive(
+                client, _burst(product_ids, args.steady, seed=2), args.burst
+            )
+            steady, _, _ = await drive(
+                client, _burst(product_ids, args.burst, seed=3), args.burst
+            )
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    return {
+        "listening_s": round(listening, 3),
+        "ready_s": round(ready, 3),
+        "first_burst_ms": summarize(first, 1, 0).latency_ms,
+        "steady_burst_ms": summarize(steady, 1, 0).latency_ms,
+    }
+
+
+async def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", default=settings.test_async_database_url)
+    parser.add_argument("--imports", type=int, default=5)
+    parser.add_argument("--burst", type=int, default=32)
+    parser.add_argument("--steady", type=int, default=500)
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--stock", type=int, default=100_000)
+    args = parser.parse_args()
+
+    env = {
+        "APP_ENV": "benchmark",
+        "LOG_LEVEL": "WARNING",
+        "ASYNC_DATABASE_URL": args.database_url,
+    }
+    print(f"import app.main: {import_seconds(args.imports, env) * 1000:.0f} ms")
+    runs = (("no warm-up", {"DB_WARMUP_CONNECTIONS": "0"}), ("warm-up", {}))
+    for label, warmup in runs:
+        result = await cold_start(args, env | warmup)
+        print(
+            f"{label:>10}: listening={result['listening_s']}s "
+            f"ready={result['ready_s']}s\n"
+            f"{'':>12}first burst={result['first_burst_ms']}\n"
+            f"{'':>12}steady burst={result['steady_burst_ms']}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+"""
+Compare the ORM and Core read paths for one page of ``GET /orders``.
+
+The ORM path is the one ``OrderService.list_orders`` used to take: load
+``Order`` objects (``selectin`` then loads their items and each item's
+product) and run every object through ``OrderRead.model_validate``. The
+Core path is the current ``list_orders``: one statement that aggregates
+items as JSON and builds ``OrderRead`` from the rows. Reports wall time,
+client CPU time and peak Python memory per page.
+
+    python -m benchmarks.bench_order_reads --orders 2000 --items 3 --page-size 100
+
+The target database is wiped: by default the test DSN
+(``TEST_ASYNC_DATABASE_URL``) is used, never the application database.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import get_settings
+from app.database import Base
+from app.models.order import Order, OrderStatus
+from app.models.order_item import OrderItem
+from app.models.product import Product
+from app.schemas.order import OrderRead
+from app.services.order_service import OrderService
+
+
+async def orm_page(session: AsyncSession, limit: int) -> list[OrderRead]:
+    result = await session.execute(
+        select(Order).order_by(Order.created_at.desc(), Order.id.desc()).limit(limit)
+    )
+    orders = [OrderRead.model_validate(o) for o in result.scalars().all()]
+    session.expunge_all()
+    return orders
+
+
+async def core_page(session: AsyncSession, limit: int) -> list[OrderRead]:
+    page = await OrderService(session).list_orders(limit=limit)
+    return page["items"]  # type: ignore[return-value]
+
+
+async def seed(
+    session_factory: async_sessionmaker[AsyncSession], orders: int, items: int
+) -> None:
+    async with session_factory() as session:
+        product_ids = list(
+            (
+                await session.execute(
+                    insert(Product).returning(Product.id),
+                    [
+                        {"name": f"SKU {i}", "price": "9.99", "stock_quantity": 10**6}
+                        for i in range(max(items, 10))
+                    ],
+                )
+            ).scalars()
+        )
+        order_ids = list(
+            (
+                await session.execute(
+                    insert(Order).returning(Order.id),
+                    [{"status": OrderStatus.PENDING}] * orders,
+                )
+            ).scalars()
+        )
+        await session.execute(
+            insert(OrderItem),
+            [
+                {
+                    "order_id": order_id,
+                    "product_id": product_ids[(order_id + i) % len(product_ids)],
+                    "quantity": 1 + i,
+                    "price_at_time": "9.99",
+                }
+                for order_id in order_ids
+                for i in range(items)
+            ],
+        )
+        await session.commit()
+
+
+async def measure(
+    session_factory: async_sessionmaker[AsyncSession],
+    read_page: Callable[[AsyncSession, int], Awaitable[list[OrderRead]]],
+    page_size: int,
+    rounds: int,
+) -> dict[str, float]:
+    wall: list[float] = []
+    cpu: list[float] = []
+    peak: list[int] = []
+    async with session_factory() as session:
+        await read_page(session, page_size)  # warm up connection and caches
+        for _ in range(rounds):
+            tracemalloc.start()
+            started, started_cpu = time.perf_counter(), time.process_time()
+            page = await read_page(session, page_size)
+            wall.append(time.perf_counter() - started)
+            cpu.append(time.process_time() - started_cpu)
+            peak.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            assert len(page) == page_size
+            await session.rollback()
+    return {
+        "wall_ms": round(statistics.median(wall) * 1000, 2),
+        "cpu_ms": round(statistics.median(cpu) * 1000, 2),
+        "peak_kib": round(statistics.median(peak) / 1024, 1),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--database-url", default=get_settings().test_async_database_url
+    )
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=3, help="items per order")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.database_url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(session_factory, args.orders, args.items)
+
+    for name, read_page in (("orm", orm_page), ("core", core_page)):
+        result = await measure(session_factory, read_page, args.page_size, args.rounds)
+        print(
+            f"{name:>5}: wall={result['wall_ms']}ms  cpu={result['cpu_ms']}ms  "
+            f"peak={result['peak_kib']}KiB per {args.page_size}-order page"
+        )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
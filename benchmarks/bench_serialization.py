@@ -0,0 +1,114 @@
+"""
+Microbenchmark: FastAPI's default response path against ``PydanticJSONResponse``.
+
+The default path validates the model against the ``response_model``, turns it
+into plain Python objects and renders them with ``json.dumps``; the fast path
+writes the model to JSON with ``model_dump_json``. Both are timed on a page of
+orders (with items) and a page of products. No database is needed.
+
+    python -m benchmarks.bench_serialization --page-size 100 --items 3
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import BaseModel
+
+from app.responses import PydanticJSONResponse
+from app.schemas.common import PaginatedResponse
+from app.schemas.order import OrderItemRead, OrderRead
+from app.schemas.product import ProductRead
+
+
+def order_page(size: int, items: int) -> PaginatedResponse[OrderRead]:
+    now = datetime.now(timezone.utc)
+    return PaginatedResponse[OrderRead](
+        items=[
+            OrderRead(
+                id=i,
+                status="Pending",
+                created_at=now,
+                updated_at=now,
+                items=[
+                    OrderItemRead(
+                        id=i * items + n,
+                        product_id=n + 1,
+                        quantity=n + 1,
+                        price_at_time=Decimal("19.99"),
+                    )
+                    for n in range(items)
+                ],
+            )
+            for i in range(size)
+        ],
+        total=size * 10,
+        limit=size,
+        offset=0,
+    )
+
+
+def product_page(size: int) -> PaginatedResponse[ProductRead]:
+    now = datetime.now(timezone.utc)
+    return PaginatedResponse[ProductRead](
+        items=[
+            ProductRead(
+                id=i,
+                name=f"Product {i}",
+                price=Decimal("1234.50"),
+                stock_quantity=i,
+                created_at=now,
+                updated_at=now,
+            )
+            for i in range(size)
+        ],
+        total=size * 10,
+        limit=size,
+        offset=0,
+    )
+
+
+async def time_default(model: Any, content: BaseModel, rounds: int) -> float:
+    field = create_response_field(name="response", type_=model)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        JSONResponse(await serialize_response(field=field, response_content=content))
+    return (time.perf_counter() - started) / rounds
+
+
+def time_fast(content: BaseModel, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        PydanticJSONResponse(content)
+    return (time.perf_counter() - started) / rounds
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--items", type=int, default=3, help="items per order")
+    parser.add_argument("--rounds", type=int, default=500)
+    args = parser.parse_args()
+
+    orders = order_page(args.page_size, args.items)
+    products = product_page(args.page_size)
+    pages = [
+        ("orders", PaginatedResponse[OrderRead], orders),
+        ("products", PaginatedResponse[ProductRead], products),
+    ]
+    for name, model, content in pages:
+        default = await time_default(model, content, args.rounds)
+        fast = time_fast(content, args.rounds)
+        print(
+            f"{name:>8}: default={default * 1e6:.0f}us  "
+            f"pydantic={fast * 1e6:.0f}us  speedup={default / fast:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
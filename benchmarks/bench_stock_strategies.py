@@ -0,0 +1,130 @@
+"""
+Compare the "lock" and "conditional_update" stock strategies under contention.
+
+Every worker places single-item orders against the same hot product through
+``OrderService.create_order`` on its own pooled session, so all of them fight
+for one ``products`` row. The "coalesced" run sends the same orders through
+``OrderCoalescer`` instead, which groups them into shared transactions.
+Reports orders/sec and latency percentiles per strategy and checks that
+stock was never oversold.
+
+    python -m benchmarks.bench_stock_strategies --concurrency 32 --orders 2000
+
+The target database is wiped: by default the test DSN
+(``TEST_ASYNC_DATABASE_URL``) is used, never the application database.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.config import get_settings
+from app.database import Base
+from app.exceptions import InsufficientStockError
+from app.models.product import Product
+from app.schemas.order import OrderCreate
+from app.services.order_coalescer import OrderCoalescer
+from app.services.order_service import OrderService
+
+STRATEGIES = ("lock", "conditional_update", "coalesced")
+
+
+async def run_strategy(
+    database_url: str, strategy: str, concurrency: int, orders: int, stock: int
+) -> dict[str, float | int | str]:
+    engine = create_async_engine(
+        database_url, pool_size=concurrency, max_overflow=concurrency
+    )
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_factory() as session:
+        product = Product(name="Hot SKU", price="9.99", stock_quantity=stock)
+        session.add(product)
+        await session.commit()
+        product_id = product.id
+
+    payload = OrderCreate(items=[{"product_id": product_id, "quantity": 1}])
+    queue: asyncio.Queue[None] = asyncio.Queue()
+    for _ in range(orders):
+        queue.put_nowait(None)
+    latencies: list[float] = []
+    rejected = 0
+    coalescer = OrderCoalescer(session_factory, window_ms=2, max_batch=concurrency)
+
+    async def worker() -> None:
+        nonlocal rejected
+        async with session_factory() as session:
+            service = OrderService(session, stock_strategy=strategy)
+            while not queue.empty():
+                queue.get_nowait()
+                started = time.perf_counter()
+                try:
+                    if strategy == "coalesced":
+                        await coalescer.submit(payload)
+                    else:
+                        await service.create_order(payload)
+                except InsufficientStockError:
+                    await session.rollback()
+                    rejected += 1
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    async with session_factory() as session:
+        remaining = await session.scalar(
+            select(Product.stock_quantity).where(Product.id == product_id)
+        )
+    await engine.dispose()
+
+    created = orders - rejected
+    assert remaining == stock - created, "stock and created orders disagree"
+    assert remaining >= 0, "stock was oversold"
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "strategy": strategy,
+        "orders_per_sec": round(created / elapsed, 1),
+        "created": created,
+        "rejected": rejected,
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--database-url", default=get_settings().test_async_database_url
+    )
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument(
+        "--stock", type=int, default=None, help="initial stock (default: --orders)"
+    )
+    args = parser.parse_args()
+
+    for strategy in STRATEGIES:
+        result = await run_strategy(
+            args.database_url,
+            strategy,
+            args.concurrency,
+            args.orders,
+            args.stock if args.stock is not None else args.orders,
+        )
+        print(
+            f"{result['strategy']:>20}: {result['orders_per_sec']:>8} orders/s  "
+            f"p50={result['p50_ms']}ms  p99={result['p99_ms']}ms  "
+            f"created={result['created']} rejected={result['rejected']}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,146 @@
+"""
+Measure single-SKU order throughput as the product is split into N stripes.
+
+Every worker places single-item orders against the same hot product through
+``OrderService.create_order`` on its own pooled session. With N=0 they all
+fight for the one ``products`` row; with N stripes each order draws from a
+random stripe and falls back to the others when it runs dry. Reports
+orders/sec and latency percentiles per N and checks that stock was never
+oversold.
+
+    python -m benchmarks.bench_stock_stripes --concurrency 32 --stripes 0 1 4 16
+
+The target database is wiped: by default the test DSN
+(``TEST_ASYNC_DATABASE_URL``) is used, never the application database.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.config import get_settings
+from app.database import Base
+from app.exceptions import InsufficientStockError
+from app.models.product import Product
+from app.models.product_stock_stripe import ProductStockStripe
+from app.schemas.order import OrderCreate
+from app.services.order_service import OrderService
+from app.services.stock_stripes import StockStripes
+
+
+async def run_stripes(
+    database_url: str,
+    stripes: int,
+    strategy: str,
+    concurrency: int,
+    orders: int,
+    stock: int,
+) -> dict[str, float | int]:
+    engine = create_async_engine(
+        database_url, pool_size=concurrency, max_overflow=concurrency
+    )
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_factory() as session:
+        product = Product(name="Hot SKU", price="9.99", stock_quantity=stock)
+        session.add(product)
+        await session.commit()
+        product_id = product.id
+        await StockStripes(session).set_stripes(product_id, stripes)
+        await session.commit()
+
+    payload = OrderCreate(items=[{"product_id": product_id, "quantity": 1}])
+    queue: asyncio.Queue[None] = asyncio.Queue()
+    for _ in range(orders):
+        queue.put_nowait(None)
+    latencies: list[float] = []
+    rejected = 0
+
+    async def worker() -> None:
+        nonlocal rejected
+        async with session_factory() as session:
+            service = OrderService(session, stock_strategy=strategy)
+            while not queue.empty():
+                queue.get_nowait()
+                started = time.perf_counter()
+                try:
+                    await service.create_order(payload)
+                except InsufficientStockError:
+                    await session.rollback()
+                    rejected += 1
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    async with session_factory() as session:
+        residual = await session.scalar(
+            select(Product.stock_quantity).where(Product.id == product_id)
+        )
+        striped, lowest = (
+            await session.execute(
+                select(
+                    func.coalesce(func.sum(ProductStockStripe.quantity), 0),
+                    func.min(ProductStockStripe.quantity),
+                ).where(ProductStockStripe.product_id == product_id)
+            )
+        ).one()
+    await engine.dispose()
+
+    created = orders - rejected
+    remaining = residual + striped
+    assert remaining == stock - created, "stock and created orders disagree"
+    assert residual >= 0 and (lowest is None or lowest >= 0), "stock was oversold"
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "stripes": stripes,
+        "orders_per_sec": round(created / elapsed, 1),
+        "created": created,
+        "rejected": rejected,
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--database-url", default=get_settings().test_async_database_url
+    )
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument(
+        "--stock", type=int, default=None, help="initial stock (default: --orders)"
+    )
+    parser.add_argument("--stripes", type=int, nargs="+", default=[0, 1, 4, 16])
+    parser.add_argument(
+        "--strategy", choices=("lock", "conditional_update"), default="lock"
+    )
+    args = parser.parse_args()
+
+    for stripes in args.stripes:
+        result = await run_stripes(
+            args.database_url,
+            stripes,
+            args.strategy,
+            args.concurrency,
+            args.orders,
+            args.stock if args.stock is not None else args.orders,
+        )
+        print(
+            f"stripes={result['stripes']:>3}: {result['orders_per_sec']:>8} orders/s  "
+            f"p50={result['p50_ms']}ms  p99={result['p99_ms']}ms  "
+            f"created={result['created']} rejected={result['rejected']}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+"""
+Measure HTTP throughput as ``python -m app.serve`` scales from 1 to N workers.
+
+For each worker count the server is started as a subprocess on a freshly
+seeded database, warmed up, then driven over HTTP with a mix of
+``POST /api/v1/orders`` and ``GET /api/v1/products`` at a fixed
+concurrency. Every run shares the same ``DB_CONNECTION_BUDGET``, so more
+workers means smaller pools per worker. Reports requests/sec, latency
+percentiles and the speed-up over the first run, and checks that stock was
+never oversold.
+
+    python -m benchmarks.bench_workers --workers 1 2 4 --concurrency 64
+
+The load generator is one Python process on the same machine and competes
+with the workers for CPU: scaling flattens out at the cores it leaves free.
+
+The target database is wiped: by default the test DSN
+(``TEST_ASYNC_DATABASE_URL``), never the application database.
+"""
+import argparse
+import asyncio
+import random
+
+import httpx
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import get_settings
+from benchmarks.harness import (
+    OrderWorkload,
+    Request,
+    drive,
+    free_port,
+    seed_catalog,
+    start_server,
+    summarize,
+    verify_stock,
+    wait_for,
+)
+
+
+def _requests(
+    product_ids: list[int], count: int, read_ratio: float, seed: int
+) -> list[Request]:
+    workload = OrderWorkload(product_ids, items_per_order=(1, 3), seed=seed)
+    rng = random.Random(seed)
+    return [
+        Request("GET", "/api/v1/products?limit=20")
+        if rng.random() < read_ratio
+        else workload.next_request()
+        for _ in range(count)
+    ]
+
+
+async def run_workers(
+    args: argparse.Namespace, workers: int
+) -> dict[str, float | int | dict[str, float]]:
+    engine = create_async_engine(args.database_url)
+    product_ids = await seed_catalog(engine, args.products, args.stock)
+
+    port = free_port()
+    server = start_server(
+        workers,
+        port,
+        {
+            "APP_ENV": "benchmark",
+            "LOG_LEVEL": "WARNING",
+            "ASYNC_DATABASE_URL": args.database_url,
+            "DB_CONNECTION_BUDGET": str(args.budget),
+        },
+    )
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}",
+            timeout=60,
+            limits=httpx.Limits(max_connections=args.concurrency),
+        ) as client:
+            await wait_for(client, "/ready")
+            await drive(
+                client,
+                _requests(product_ids, args.warmup, args.read_ratio, seed=1),
+                args.concurrency,
+            )
+            samples, duration, errors = await drive(
+                client,
+                _requests(product_ids, args.requests, args.read_ratio, seed=2),
+                args.concurrency,
+            )
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    oversold, mismatched = await verify_stock(engine, product_ids, args.stock)
+    await engine.dispose()
+    assert not oversold and not mismatched, "stock was oversold or miscounted"
+
+    report = summarize(samples, duration, errors)
+    return {
+        "workers": workers,
+        "rps": report.throughput_rps,
+        "latency_ms": report.latency_ms,
+        "errors": errors + sum(
+            n for code, n in report.status_codes.items() if code.startswith("5")
+        ),
+    }
+
+
+async def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", default=settings.test_async_database_url)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=500)
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--stock", type=int, default=100_000)
+    parser.add_argument(
+        "--read-ratio", type=float, default=0.5, help="share of GET /products"
+    )
+    parser.add_argument("--budget", type=int, default=settings.db_connection_budget)
+    args = parser.parse_args()
+
+    baseline = None
+    for workers in args.workers:
+        result = await run_workers(args, workers)
+        baseline = baseline or result["rps"]
+        print(
+            f"workers={workers:>2}: {result['rps']:>8} req/s  "
+            f"x{result['rps'] / baseline:.2f}  latency={result['latency_ms']}  "
+            f"errors={result['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,337 @@
+"""
+Building blocks for load tests against the order path.
+
+Nothing here imports ``app`` at module level: the load-test CLI configures the
+environment (database URL, app env) before the application is first imported.
+"""
+import asyncio
+import bisect
+import itertools
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    json: Any = None
+
+
+@dataclass
+class Sample:
+    latency: float
+    status: int
+    insufficient_stock: bool = False
+
+
+@dataclass
+class Report:
+    requests: int = 0
+    duration_s: float = 0.0
+    throughput_rps: float = 0.0
+    latency_ms: dict[str, float] = field(default_factory=dict)
+    status_codes: dict[str, int] = field(default_factory=dict)
+    insufficient_stock_rate: float = 0.0
+    transport_errors: int = 0
+    lock_wait_s: float = 0.0
+    deadlocks: int = 0
+    oversold_products: list[int] = field(default_factory=list)
+    stock_mismatches: list[int] = field(default_factory=list)
+
+
+class OrderWorkload:
+    """
+    Generates ``POST /api/v1/orders`` requests over a seeded catalog.
+
+    ``skew="zipf"`` picks product ranks with probability proportional to
+    ``1 / rank**zipf_s``, so a handful of SKUs take most of the traffic.
+    """
+
+    def __init__(
+        self,
+        product_ids: list[int],
+        skew: str = "uniform",
+        zipf_s: float = 1.1,
+        items_per_order: tuple[int, int] = (1, 1),
+        max_quantity: int = 1,
+        seed: int | None = None,
+    ) -> None:
+        self._product_ids = product_ids
+        self._items_per_order = items_per_order
+        self._max_quantity = max_quantity
+        self._random = random.Random(seed)
+        self._cumulative: list[float] | None = None
+        if skew == "zipf":
+            weights = [1 / rank**zipf_s for rank in range(1, len(product_ids) + 1)]
+            self._cumulative = list(itertools.accumulate(weights))
+        elif skew != "uniform":
+            raise ValueError(f"Unknown skew: {skew!r}")
+
+    def _pick_product(self) -> int:
+        if self._cumulative is None:
+            return self._random.choice(self._product_ids)
+        point = self._random.random() * self._cumulative[-1]
+        return self._product_ids[bisect.bisect(self._cumulative, point)]
+
+    def next_request(self) -> Request:
+        count = self._random.randint(*self._items_per_order)
+        items = [
+            {
+                "product_id": self._pick_product(),
+                "quantity": self._random.randint(1, self._max_quantity),
+            }
+            for _ in range(count)
+        ]
+        return Request("POST", "/api/v1/orders", {"items": items})
+
+
+def load_replay(path: Path) -> tuple[list[Request], int]:
+    """
+    Read captured traffic: one JSON object per line with ``method``, ``path``
+    and an optional ``json`` body. Lines without ``method``/``path`` are
+    skipped and counted, so mixed captures can be replayed as-is.
+    """
+    requests: list[Request] = []
+    skipped = 0
+    with path.open() as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not isinstance(record, dict) or not {"method", "path"} <= record.keys():
+                skipped += 1
+                continue
+            requests.append(
+                Request(record["method"].upper(), record["path"], record.get("json"))
+            )
+    return requests, skipped
+
+
+async def seed_catalog(engine: AsyncEngine, products: int, stock: int) -> list[int]:
+    """Recreate the schema and insert ``products`` rows with ``stock`` each."""
+    import app.models  # noqa: F401 — registers all models with Base.metadata
+    from app.database import Base
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        result = await conn.execute(
+            text(
+                "INSERT INTO products (name, price, stock_quantity) "
+                "SELECT 'SKU-' || g, 9.99, :stock FROM generate_series(1, :n) g "
+                "RETURNING id"
+            ),
+            {"stock": stock, "n": products},
+        )
+        return sorted(result.scalars().all())
+
+
+class LockWaitSampler:
+    """
+    Estimates time spent waiting on heavyweight locks by polling
+    ``pg_stat_activity``: each sample adds ``interval`` seconds for every
+    backend of the target database currently in a Lock wait.
+    """
+
+    def __init__(self, engine: AsyncEngine, interval: float = 0.01) -> None:
+        self._engine = engine
+        self._interval = interval
+        self.lock_wait_s = 0.0
+        self._task: asyncio.Task[None] | None = None
+
+    async def _run(self) -> None:
+        async with self._engine.connect() as conn:
+            while True:
+                waiting = await conn.scalar(
+                    text(
+                        "SELECT count(*) FROM pg_stat_activity "
+                        "WHERE datname = current_database() "
+                        "AND wait_event_type = 'Lock'"
+                    )
+                )
+                await conn.rollback()
+                self.lock_wait_s += (waiting or 0) * self._interval
+                await asyncio.sleep(self._interval)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+async def deadlock_count(engine: AsyncEngine) -> int:
+    async with engine.connect() as conn:
+        return await conn.scalar(
+            text(
+                "SELECT deadlocks FROM pg_stat_database "
+                "WHERE datname = current_database()"
+            )
+        )
+
+
+async def verify_stock(
+    engine: AsyncEngine, product_ids: list[int], initial_stock: int
+) -> tuple[list[int], list[int]]:
+    """
+    Return (oversold, mismatched) ids among the seeded ``product_ids``. A
+    product is oversold when its stock went negative and mismatched when
+    ``initial - current`` differs from the quantity in its order_items plus
+    what reservations hold. Cancelling an order does not restock, so every
+    order counts; current stock includes the product's stripes.
+    """
+    async with engine.connect() as conn:
+        rows = await conn.execute(
+            text(
+                "SELECT p.id, p.stock_quantity + COALESCE("
+                "(SELECT SUM(s.quantity) FROM product_stock_stripes s "
+                "WHERE s.product_id = p.id), 0) AS stock, "
+                "COALESCE((SELECT SUM(oi.quantity) FROM order_items oi "
+                "WHERE oi.product_id = p.id), 0) "
+                "+ COALESCE((SELECT SUM(ri.quantity) FROM reservation_items ri "
+                "WHERE ri.product_id = p.id), 0) AS taken "
+                "FROM products p "
+                "WHERE p.id = ANY(:ids)"
+            ),
+            {"ids": product_ids},
+        )
+        oversold, mismatched = [], []
+        for product_id, stock, taken in rows:
+            if stock < 0:
+                oversold.append(product_id)
+            if initial_stock - stock != taken:
+                mismatched.append(product_id)
+        return oversold, mismatched
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    requests: list[Request],
+    concurrency: int,
+) -> tuple[list[Sample], float, int]:
+    """
+    Send ``requests`` from ``concurrency`` tasks. Returns the samples, the
+    elapsed seconds and the number of transport errors.
+    """
+    pending = iter(requests)
+    samples: list[Sample] = []
+    transport_errors = 0
+
+    async def worker() -> None:
+        nonlocal transport_errors
+        for request in pending:
+            started = time.perf_counter()
+            try:
+                response = await client.request(
+                    request.method, request.path, json=request.json
+                )
+            except httpx.HTTPError:
+                transport_errors += 1
+                continue
+            latency = time.perf_counter() - started
+            shortfall = (
+                response.status_code == 400 and "available" in response.text
+            )
+            samples.append(Sample(latency, response.status_code, shortfall))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - started, transport_errors
+
+
+def start_server(workers: int, port: int, env: dict[str, str]) -> subprocess.Popen:
+    """Run ``python -m app.serve`` on 127.0.0.1 with ``env`` added to ours."""
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "app.serve",
+            f"--workers={workers}",
+            "--host=127.0.0.1",
+            f"--port={port}",
+        ],
+        env=os.environ | env,
+    )
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for(client: httpx.AsyncClient, path: str, timeout: float = 60) -> None:
+    """Poll ``path`` until it answers 200, e.g. a server's ``/ready``."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if (await client.get(path)).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"{path} did not answer 200 within {timeout}s")
+        await asyncio.sleep(0.01)
+
+
+def summarize(samples: list[Sample], duration: float, transport_errors: int) -> Report:
+    latencies = sorted(s.latency for s in samples)
+    report = Report(
+        requests=len(samples),
+        duration_s=round(duration, 3),
+        throughput_rps=round(len(samples) / duration, 1) if duration else 0.0,
+        status_codes=dict(Counter(str(s.status) for s in samples)),
+        transport_errors=transport_errors,
+    )
+    if len(latencies) >= 2:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        report.latency_ms = {
+            "p50": round(cuts[49] * 1000, 2),
+            "p95": round(cuts[94] * 1000, 2),
+            "p99": round(cuts[98] * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2),
+        }
+    if samples:
+        shortfalls = sum(1 for s in samples if s.insufficient_stock)
+        report.insufficient_stock_rate = round(shortfalls / len(samples), 4)
+    return report
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_result(path: Path, config: dict[str, Any], report: Report) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "git_revision": git_revision(),
+        "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": config,
+        "report": asdict(report),
+    }
+    path.write_text(json.dumps(document, indent=2, default=str) + "\n")
@@ -0,0 +1,173 @@
+"""
+Load test for the order path.
+
+Seeds a catalog into a local Postgres, drives ``POST /api/v1/orders`` (or a
+replayed capture) at a fixed concurrency, and reports throughput, latency
+percentiles, lock wait time, deadlocks, ``InsufficientStockError`` rate and
+whether any stock was oversold. Results are written as JSON so runs can be
+compared across commits.
+
+In-process (the ASGI app is imported and called directly)::
+
+    python -m benchmarks.load_test --concurrency 64 --requests 5000 \\
+        --products 1000 --skew zipf --items 1-3
+
+Over HTTP against a running server, which must point at the same database::
+
+    python -m benchmarks.load_test --target http://localhost:8000 ...
+
+Replay captured traffic (JSON lines with ``method``, ``path`` and ``json``)::
+
+    python -m benchmarks.load_test --replay capture.jsonl
+
+The target database is dropped and re-seeded. It defaults to the test DSN
+(``TEST_ASYNC_DATABASE_URL``), never the application database.
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.harness import (
+    LockWaitSampler,
+    OrderWorkload,
+    Request,
+    deadlock_count,
+    drive,
+    load_replay,
+    seed_catalog,
+    summarize,
+    verify_stock,
+    write_result,
+)
+
+
+def _parse_range(value: str) -> tuple[int, int]:
+    low, _, high = value.partition("-")
+    return int(low), int(high or low)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--target", default="asgi", help='"asgi" (in-process) or a base URL'
+    )
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--stock", type=int, default=1000)
+    parser.add_argument("--skew", choices=["uniform", "zipf"], default="uniform")
+    parser.add_argument("--zipf-s", type=float, default=1.1)
+    parser.add_argument(
+        "--items", type=_parse_range, default=(1, 1), help="items per order, e.g. 1-5"
+    )
+    parser.add_argument("--max-quantity", type=int, default=1)
+    parser.add_argument("--replay", type=Path, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="result file (default: benchmarks/results/<timestamp>.json)",
+    )
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = _parse_args()
+
+    # Configure the app before its settings are first read.
+    os.environ.setdefault("APP_ENV", "benchmark")
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    from app.config import get_settings
+
+    database_url = args.database_url or get_settings().test_async_database_url
+    if args.target == "asgi":
+        os.environ["ASYNC_DATABASE_URL"] = database_url
+        get_settings.cache_clear()
+
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine(database_url)
+    product_ids = await seed_catalog(engine, args.products, args.stock)
+
+    skipped = 0
+    if args.replay is not None:
+        requests, skipped = load_replay(args.replay)
+    else:
+        workload = OrderWorkload(
+            product_ids,
+            skew=args.skew,
+            zipf_s=args.zipf_s,
+            items_per_order=args.items,
+            max_quantity=args.max_quantity,
+            seed=args.seed,
+        )
+        requests = [workload.next_request() for _ in range(args.requests)]
+
+    lifespan = contextlib.nullcontext()
+    if args.target == "asgi":
+        from app.main import app
+
+        # ASGITransport sends no lifespan events; the engine is created there.
+        lifespan = app.router.lifespan_context(app)
+        transport: httpx.AsyncBaseTransport = httpx.ASGITransport(app=app)
+        base_url = "http://benchmark"
+    else:
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=args.concurrency)
+        )
+        base_url = args.target
+
+    deadlocks_before = await deadlock_count(engine)
+    sampler = LockWaitSampler(engine)
+    sampler.start()
+    async with lifespan, httpx.AsyncClient(
+        transport=transport, base_url=base_url, timeout=60
+    ) as client:
+        samples, duration, transport_errors = await drive(
+            client, requests, args.concurrency
+        )
+    await sampler.stop()
+    # Cumulative statistics are flushed asynchronously by other backends.
+    await asyncio.sleep(1)
+
+    report = summarize(samples, duration, transport_errors)
+    report.lock_wait_s = round(sampler.lock_wait_s, 3)
+    report.deadlocks = await deadlock_count(engine) - deadlocks_before
+    report.oversold_products, report.stock_mismatches = await verify_stock(
+        engine, product_ids, args.stock
+    )
+    await engine.dispose()
+
+    config = {k: v for k, v in vars(args).items() if k != "database_url"}
+    config["replay_skipped"] = skipped
+    output = args.output or Path(
+        "benchmarks/results", time.strftime("%Y%m%d-%H%M%S") + ".json"
+    )
+    write_result(output, config, report)
+
+    print(
+        f"{report.requests} requests in {report.duration_s}s "
+        f"({report.throughput_rps} req/s), latency {report.latency_ms}"
+    )
+    print(
+        f"status={report.status_codes} insufficient_stock_rate="
+        f"{report.insufficient_stock_rate} lock_wait={report.lock_wait_s}s "
+        f"deadlocks={report.deadlocks}"
+    )
+    if report.oversold_products or report.stock_mismatches:
+        print(
+            f"STOCK VIOLATION oversold={report.oversold_products} "
+            f"mismatched={report.stock_mismatches}"
+        )
+    print(f"Wrote {output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
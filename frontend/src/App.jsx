@@ -1,15 +1,9 @@
-import React, { useState } from 'react';
+import React from 'react';
 import ProductList from './components/ProductList';
 import OrderDashboard from './components/OrderDashboard';
 
 function App() {
-  const [productRefreshToken, setProductRefreshToken] = useState(0);
-
-  // Called by OrderDashboard when an order is created → refresh stock in ProductList
-  const handleOrderCreated = () => {
-    setProductRefreshToken((prev) => prev + 1);
-  };
-
+  // Both panels keep themselves current from the server's event stream.
   return (
     <div className="container">
       <header>
@@ -17,8 +11,8 @@ function App() {
       </header>
       <main>
         <div className="dashboard-grid">
-          <ProductList refreshToken={productRefreshToken} />
-          <OrderDashboard onOrderCreated={handleOrderCreated} />
+          <ProductList />
+          <OrderDashboard />
         </div>
       </main>
     </div>
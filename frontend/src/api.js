@@ -2,6 +2,9 @@ import axios from 'axios';
 
 const api = axios.create({
   baseURL: 'http://localhost:8000/api/v1',
+  // Carries the cookie that routes our reads to the primary right after a
+  // write when the API reads from a replica.
+  withCredentials: true,
 });
 
 export const getProducts = async () => {
@@ -9,11 +12,31 @@ export const getProducts = async () => {
   return response.data;
 };
 
+export const getProduct = async (productId) => {
+  const response = await api.get(`/products/${productId}`);
+  return response.data;
+};
+
+// Products whose name starts with `q` (mode 'prefix') or has words starting
+// with each word of `q` (mode 'fuzzy'). Pass a page's `next_cursor` back as
+// `cursor` for the next page.
+export const searchProducts = async (q, { mode = 'prefix', limit = 10, cursor } = {}) => {
+  const response = await api.get('/products/search', {
+    params: { q, mode, limit, cursor },
+  });
+  return response.data;
+};
+
 export const getOrders = async () => {
   const response = await api.get('/orders');
   return response.data;
 };
 
+export const getOrder = async (orderId) => {
+  const response = await api.get(`/orders/${orderId}`);
+  return response.data;
+};
+
 export const shipOrder = async (orderId) => {
   const response = await api.patch(`/orders/${orderId}/status`, {
     status: 'Shipped',
@@ -32,4 +55,23 @@ export const createOrder = async (order) => {
   return response.data;
 };
 
+// Subscribes to the server's change feed. `handlers` maps event types to
+// callbacks taking the parsed event. `onResync` runs whenever events may have
+// been missed: on a `resync` event and after every reconnect (the browser
+// reconnects on its own, e.g. after a slow client is evicted).
+// Returns a function that closes the stream.
+export const subscribeToEvents = (handlers, onResync) => {
+  const source = new EventSource(`${api.defaults.baseURL}/events`);
+  let opened = false;
+  source.onopen = () => {
+    if (opened) onResync();
+    opened = true;
+  };
+  Object.entries(handlers).forEach(([type, handler]) => {
+    source.addEventListener(type, (event) => handler(JSON.parse(event.data)));
+  });
+  source.addEventListener('resync', onResync);
+  return () => source.close();
+};
+
 export default api;
@@ -1,32 +1,56 @@
-import React, { useState, useEffect } from 'react';
-import { createOrder, getProducts } from '../api';
+import React, { useState, useEffect, useRef } from 'react';
+import { createOrder, searchProducts } from '../api';
+
+// Wait this long after the last keystroke before searching.
+const SEARCH_DELAY_MS = 150;
 
 const CreateOrderForm = ({ onOrderCreated }) => {
-  const [products, setProducts] = useState([]);
-  const [selectedProductId, setSelectedProductId] = useState('');
+  const [query, setQuery] = useState('');
+  const [suggestions, setSuggestions] = useState([]);
+  const [selectedProduct, setSelectedProduct] = useState(null);
   const [quantity, setQuantity] = useState(1);
   const [error, setError] = useState(null);
   const [submitting, setSubmitting] = useState(false);
+  // Only the latest search may fill the list; slower earlier ones are dropped.
+  const latestSearch = useRef(0);
 
   useEffect(() => {
-    const fetchProducts = async () => {
+    const q = query.trim();
+    if (!q || (selectedProduct && selectedProduct.name === query)) {
+      setSuggestions([]);
+      return undefined;
+    }
+    const timer = setTimeout(async () => {
+      const search = ++latestSearch.current;
       try {
-        const data = await getProducts();
-        setProducts(data.items);
-        if (data.items.length > 0) {
-          setSelectedProductId(data.items[0].id);
+        let data = await searchProducts(q);
+        // Nothing starts with the query: match words in any order instead.
+        if (data.items.length === 0) {
+          data = await searchProducts(q, { mode: 'fuzzy' });
         }
+        if (search === latestSearch.current) setSuggestions(data.items);
       } catch (err) {
-        console.error('Failed to load products', err);
+        console.error('Failed to search products', err);
       }
-    };
-    fetchProducts();
-  }, []);
+    }, SEARCH_DELAY_MS);
+    return () => clearTimeout(timer);
+  }, [query, selectedProduct]);
+
+  const handleQueryChange = (e) => {
+    setQuery(e.target.value);
+    setSelectedProduct(null);
+  };
+
+  const handleSelect = (product) => {
+    setSelectedProduct(product);
+    setQuery(product.name);
+    setSuggestions([]);
+  };
 
   const handleSubmit = async (e) => {
     e.preventDefault();
     setError(null);
-    if (!selectedProductId) {
+    if (!selectedProduct) {
       setError('Please select a product');
       return;
     }
@@ -35,7 +59,7 @@ const CreateOrderForm = ({ onOrderCreated }) => {
       await createOrder({
         items: [
           {
-            product_id: parseInt(selectedProductId),
+            product_id: selectedProduct.id,
             quantity: parseInt(quantity),
           },
         ],
@@ -53,19 +77,30 @@ const CreateOrderForm = ({ onOrderCreated }) => {
   return (
     <form onSubmit={handleSubmit}>
       {error && <div className="error">{error}</div>}
-      <div className="form-group">
+      <div className="form-group autocomplete">
         <label>Product</label>
-        <select
-          value={selectedProductId}
-          onChange={(e) => setSelectedProductId(e.target.value)}
+        <input
+          type="text"
+          value={query}
+          onChange={handleQueryChange}
+          placeholder="Start typing a product name"
+          autoComplete="off"
           required
-        >
-          {products.map((p) => (
-            <option key={p.id} value={p.id}>
-              {p.name} — Stock: {p.stock_quantity}
-            </option>
-          ))}
-        </select>
+        />
+        {suggestions.length > 0 && (
+          <ul className="suggestions">
+            {suggestions.map((p) => (
+              <li key={p.id} onMouseDown={() => handleSelect(p)}>
+                {p.name} — Stock: {p.stock_quantity}
+              </li>
+            ))}
+          </ul>
+        )}
+        {selectedProduct && (
+          <div className="selected-stock">
+            Stock: {selectedProduct.stock_quantity}
+          </div>
+        )}
       </div>
       <div className="form-group">
         <label>Quantity</label>
@@ -1,9 +1,9 @@
 import React, { useEffect, useState } from 'react';
-import { getOrders, shipOrder } from '../api';
+import { getOrder, getOrders, shipOrder, subscribeToEvents } from '../api';
 import CreateOrderForm from './CreateOrderForm';
 import Modal from './Modal';
 
-const OrderDashboard = ({ refreshToken, onOrderCreated }) => {
+const OrderDashboard = () => {
   const [orders, setOrders] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
@@ -23,14 +23,41 @@ const OrderDashboard = ({ refreshToken, onOrderCreated }) => {
     }
   };
 
+  // Puts an order at the top of the list, or replaces it in place.
+  const upsertOrder = (order) => {
+    setOrders((prev) =>
+      prev.some((o) => o.id === order.id)
+        ? prev.map((o) => (o.id === order.id ? order : o))
+        : [order, ...prev]
+    );
+  };
+
   useEffect(() => {
     fetchOrders();
-  }, [refreshToken]);
+    // Changes from this and every other client arrive as events, so the
+    // list is patched in place instead of refetched.
+    return subscribeToEvents(
+      {
+        order_created: async ({ order_id }) => {
+          try {
+            upsertOrder(await getOrder(order_id));
+          } catch (err) {
+            console.error(err);
+          }
+        },
+        order_status_changed: ({ order_id, status }) => {
+          setOrders((prev) =>
+            prev.map((o) => (o.id === order_id ? { ...o, status } : o))
+          );
+        },
+      },
+      fetchOrders
+    );
+  }, []);
 
   const handleShip = async (orderId) => {
     try {
-      await shipOrder(orderId);
-      fetchOrders();
+      upsertOrder(await shipOrder(orderId));
     } catch (err) {
       alert('Failed to ship order');
       console.error(err);
@@ -39,8 +66,6 @@ const OrderDashboard = ({ refreshToken, onOrderCreated }) => {
 
   const handleOrderCreated = () => {
     setShowModal(false);
-    fetchOrders();
-    if (onOrderCreated) onOrderCreated(); // also triggers stock refresh in parent
   };
 
   return (
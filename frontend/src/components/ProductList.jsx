@@ -1,10 +1,12 @@
-import React, { useEffect, useState } from 'react';
-import { getProducts } from '../api';
+import React, { useEffect, useRef, useState } from 'react';
+import { getProduct, getProducts, subscribeToEvents } from '../api';
 import AddProductForm from './AddProductForm';
 import Modal from './Modal';
 
-const ProductList = ({ refreshToken }) => {
+const ProductList = () => {
   const [products, setProducts] = useState([]);
+  const productsRef = useRef(products);
+  productsRef.current = products;
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [showModal, setShowModal] = useState(false);
@@ -23,13 +25,31 @@ const ProductList = ({ refreshToken }) => {
     }
   };
 
+  // Reloads just the products whose stock changed; a product not on the
+  // page yet (e.g. one just created) means the page itself changed.
+  const refreshStock = async ({ product_ids }) => {
+    const known = new Set(productsRef.current.map((p) => p.id));
+    if (product_ids.some((id) => !known.has(id))) {
+      fetchProducts();
+      return;
+    }
+    try {
+      const updated = new Map(
+        (await Promise.all(product_ids.map(getProduct))).map((p) => [p.id, p])
+      );
+      setProducts((prev) => prev.map((p) => updated.get(p.id) ?? p));
+    } catch (err) {
+      console.error(err);
+    }
+  };
+
   useEffect(() => {
     fetchProducts();
-  }, [refreshToken]);
+    return subscribeToEvents({ stock_changed: refreshStock }, fetchProducts);
+  }, []);
 
   const handleProductAdded = () => {
     setShowModal(false);
-    fetchProducts();
   };
 
   return (
@@ -52,6 +72,7 @@ const ProductList = ({ refreshToken }) => {
               <th>Name</th>
               <th>Price</th>
               <th>Stock</th>
+              <th>Reserved</th>
             </tr>
           </thead>
           <tbody>
@@ -65,6 +86,7 @@ const ProductList = ({ refreshToken }) => {
                     {product.stock_quantity}
                   </span>
                 </td>
+                <td>{product.reserved_quantity}</td>
               </tr>
             ))}
           </tbody>
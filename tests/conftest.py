@@ -3,6 +3,7 @@ from typing import Any
 
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -12,8 +13,21 @@ from sqlalchemy.pool import NullPool
 
 from app.config import get_settings
 from app.database import Base
-from app.dependencies import get_db
+from app.cache import InMemoryCacheBackend
+from app.dependencies import (
+    get_db,
+    get_event_broker,
+    get_idempotency_cache,
+    get_product_cache,
+    get_read_db,
+    get_read_session_factory,
+    get_session_factory,
+)
 from app.main import app
+from app.services.events import EventBroker
+from app.services.idempotency import IdempotencyCache
+from app.services.list_totals import EXACT_COUNTS
+from app.services.product_cache import ProductCache
 
 settings = get_settings()
 
@@ -37,6 +51,8 @@ TestSessionLocal = async_sessionmaker(
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    # Counts cached by an earlier test would outlive its tables.
+    EXACT_COUNTS.clear()
 
     async with TestSessionLocal() as session:
         yield session
@@ -46,7 +62,67 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
 
 
 @pytest_asyncio.fixture
-async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
+async def session_factory(
+    db_session: AsyncSession,
+) -> async_sessionmaker[AsyncSession]:
+    """Factory for components that open their own sessions on the test DB."""
+    return TestSessionLocal
+
+
+class RoundTripCounter:
+    """Counts statements plus BEGIN/COMMIT/ROLLBACK sent to the test database."""
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def reset(self) -> None:
+        self.statements.clear()
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def _on_begin(self, conn) -> None:
+        self.statements.append("BEGIN")
+
+    def _on_commit(self, conn) -> None:
+        self.statements.append("COMMIT")
+
+    def _on_rollback(self, conn) -> None:
+        self.statements.append("ROLLBACK")
+
+
+@pytest_asyncio.fixture
+async def round_trips(db_session: AsyncSession) -> AsyncGenerator[RoundTripCounter, None]:
+    counter = RoundTripCounter()
+    listeners = [
+        ("before_cursor_execute", counter._on_execute),
+        ("begin", counter._on_begin),
+        ("commit", counter._on_commit),
+        ("rollback", counter._on_rollback),
+    ]
+    for name, fn in listeners:
+        event.listen(test_engine.sync_engine, name, fn)
+    yield counter
+    for name, fn in listeners:
+        event.remove(test_engine.sync_engine, name, fn)
+
+
+@pytest_asyncio.fixture
+async def event_broker() -> AsyncGenerator[EventBroker, None]:
+    """A broker on the test database; it connects on first subscription."""
+    broker = EventBroker(settings.test_async_database_url, queue_size=16)
+    yield broker
+    await broker.stop()
+
+
+@pytest_asyncio.fixture
+async def client(
+    db_session: AsyncSession, event_broker: EventBroker
+) -> AsyncGenerator[AsyncClient, None]:
     async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
         try:
             yield db_session
@@ -54,7 +130,20 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
             await db_session.rollback()
             raise
 
+    # A fresh cache per test: ids restart after each drop/create.
+    product_cache = ProductCache(InMemoryCacheBackend(max_entries=1000, ttl_seconds=60))
+    idempotency_cache = IdempotencyCache(
+        InMemoryCacheBackend(max_entries=1000, ttl_seconds=60)
+    )
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_product_cache] = lambda: product_cache
+    app.dependency_overrides[get_session_factory] = lambda: TestSessionLocal
+    # Reads share the test session; tests/test_replica.py routes them for real.
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_read_session_factory] = lambda: TestSessionLocal
+    app.dependency_overrides[get_idempotency_cache] = lambda: idempotency_cache
+    app.dependency_overrides[get_event_broker] = lambda: event_broker
 
     async with AsyncClient(
         transport=ASGITransport(app=app),
@@ -73,3 +162,8 @@ async def sample_product(client: AsyncClient) -> dict[str, Any]:
     )
     assert response.status_code == 201
     return response.json()
+
+
+def order_payload(product_id: int, quantity: int) -> dict[str, Any]:
+    """``POST /api/v1/orders`` body for a single item."""
+    return {"items": [{"product_id": product_id, "quantity": quantity}]}
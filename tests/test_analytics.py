@@ -0,0 +1,88 @@
+from datetime import date
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.product_daily_sales import ProductDailySales
+from app.services.sales_service import rebuild_sales
+from tests.conftest import test_engine
+
+
+async def _seed_sales(client: AsyncClient) -> tuple[int, int]:
+    ids = []
+    for name, price in (("A", "2.00"), ("B", "5.00")):
+        response = await client.post(
+            "/api/v1/products",
+            json={"name": name, "price": price, "stock_quantity": 50},
+        )
+        ids.append(response.json()["id"])
+    a, b = ids
+    for items in ({a: 3}, {a: 1, b: 2}, {b: 1}):
+        response = await client.post(
+            "/api/v1/orders",
+            json={
+                "items": [{"product_id": p, "quantity": q} for p, q in items.items()]
+            },
+        )
+        last_order = response.json()["id"]
+    await client.patch(
+        f"/api/v1/orders/{last_order}/status", json={"status": "Cancelled"}
+    )
+    return a, b
+
+
+@pytest.mark.asyncio
+async def test_sales_report_tracks_orders_and_cancellations(
+    client: AsyncClient,
+) -> None:
+    a, b = await _seed_sales(client)
+
+    report = (await client.get("/api/v1/analytics/sales")).json()
+    assert report["buckets"] == [
+        {"period": date.today().isoformat(), "units": 6, "revenue": "18.00"}
+    ]
+    assert [
+        (p["product_id"], p["order_count"], p["units"], p["revenue"])
+        for p in report["top_products"]
+    ] == [(b, 1, 2, "10.00"), (a, 2, 4, "8.00")]
+
+    report = (
+        await client.get(
+            "/api/v1/analytics/sales",
+            params={"granularity": "month", "product_id": a, "top": 0},
+        )
+    ).json()
+    assert report["buckets"] == [
+        {
+            "period": date.today().replace(day=1).isoformat(),
+            "units": 4,
+            "revenue": "8.00",
+        }
+    ]
+    assert report["top_products"] == []
+
+    report = (
+        await client.get(
+            "/api/v1/analytics/sales", params={"date_to": date.today().isoformat()}
+        )
+    ).json()
+    assert report["buckets"] == []
+
+
+@pytest.mark.asyncio
+async def test_rebuild_matches_incremental_totals(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    await _seed_sales(client)
+    incremental = (await client.get("/api/v1/analytics/sales")).json()
+
+    await db_session.execute(delete(ProductDailySales))
+    await db_session.commit()
+    assert (await client.get("/api/v1/analytics/sales")).json()["buckets"] == []
+
+    rows = await rebuild_sales(test_engine, chunk_days=1, workers=2)
+
+    assert rows == 2
+    assert (await client.get("/api/v1/analytics/sales")).json() == incremental
@@ -0,0 +1,138 @@
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.etag import etag_matches
+from app.services.stock_stripes import StockRebalancer
+from tests.conftest import RoundTripCounter
+
+
+async def _order(client: AsyncClient, product_id: int, quantity: int = 1) -> int:
+    response = await client.post(
+        "/api/v1/orders",
+        json={"items": [{"product_id": product_id, "quantity": quantity}]},
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+async def _revalidate(client: AsyncClient, url: str) -> tuple[str, int]:
+    """GET ``url``, then repeat it conditionally; returns (etag, second status)."""
+    first = await client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    again = await client.get(url, headers={"If-None-Match": etag})
+    return etag, again.status_code
+
+
+def test_etag_matches() -> None:
+    assert etag_matches('"a"', '"a"')
+    assert etag_matches('W/"a"', '"a"')
+    assert etag_matches('"b", "a"', '"a"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"b"', '"a"')
+    assert not etag_matches(None, '"a"')
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/v1/products",
+        "/api/v1/products/{product_id}",
+        "/api/v1/orders",
+        "/api/v1/orders?product_id={product_id}&status=Pending",
+        "/api/v1/orders/{order_id}",
+    ],
+)
+async def test_matching_if_none_match_returns_304(
+    client: AsyncClient,
+    sample_product: dict[str, Any],
+    round_trips: RoundTripCounter,
+    url: str,
+) -> None:
+    order_id = await _order(client, sample_product["id"])
+    url = url.format(product_id=sample_product["id"], order_id=order_id)
+
+    first = await client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert (await client.get(url)).headers["etag"] == etag
+
+    round_trips.reset()
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    # The metadata query, plus BEGIN/ROLLBACK at most.
+    assert round_trips.count <= 3
+
+    stale = await client.get(url, headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_unknown_resources_still_404(client: AsyncClient) -> None:
+    for url in ("/api/v1/products/999", "/api/v1/orders/999"):
+        response = await client.get(url, headers={"If-None-Match": "*"})
+        assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_writes_change_etags(
+    client: AsyncClient, sample_product: dict[str, Any]
+) -> None:
+    product_id = sample_product["id"]
+    product_url = f"/api/v1/products/{product_id}"
+    order_id = await _order(client, product_id)
+    order_url = f"/api/v1/orders/{order_id}"
+
+    product_etag, _ = await _revalidate(client, product_url)
+    list_etag, _ = await _revalidate(client, "/api/v1/orders")
+    order_etag, _ = await _revalidate(client, order_url)
+
+    await _order(client, product_id, 2)
+    product_after, status = await _revalidate(client, product_url)
+    assert status == 304
+    assert product_after != product_etag
+    assert (await client.get(product_url)).json()["stock_quantity"] == 47
+    list_after, _ = await _revalidate(client, "/api/v1/orders")
+    assert list_after != list_etag
+
+    response = await client.patch(f"{order_url}/status", json={"status": "Shipped"})
+    assert response.status_code == 200
+    response = await client.get(order_url, headers={"If-None-Match": order_etag})
+    assert response.status_code == 200
+    assert response.json()["status"] == "Shipped"
+
+
+@pytest.mark.asyncio
+async def test_striped_draws_change_product_etag(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    session_factory: async_sessionmaker[AsyncSession],
+    sample_product: dict[str, Any],
+) -> None:
+    product_id = sample_product["id"]
+    url = f"/api/v1/products/{product_id}"
+    response = await client.put(f"{url}/stripes", json={"stripes": 4})
+    assert response.status_code == 200
+
+    etag, status = await _revalidate(client, url)
+    assert status == 304
+
+    await _order(client, product_id, 5)
+    after, status = await _revalidate(client, url)
+    assert status == 304
+    assert after != etag
+    assert (await client.get(url)).json()["stock_quantity"] == 45
+
+    # Rebalancing moves stock between stripes without changing the total.
+    await db_session.commit()
+    await StockRebalancer(session_factory, 60).run_once()
+    response = await client.get(url, headers={"If-None-Match": after})
+    assert response.status_code == 304
@@ -0,0 +1,167 @@
+import asyncio
+import json
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.events import (
+    Event,
+    EventBroker,
+    Subscription,
+    notify,
+    order_created,
+)
+from tests.conftest import order_payload
+
+
+async def _receive(subscription: Subscription, count: int) -> list[Event]:
+    return [await asyncio.wait_for(anext(subscription), 5) for _ in range(count)]
+
+
+async def _assert_quiet(subscription: Subscription) -> None:
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(anext(subscription), 0.2)
+
+
+@pytest.mark.asyncio
+async def test_committed_writes_publish_events(
+    client: AsyncClient, event_broker: EventBroker
+) -> None:
+    async with event_broker.subscribe() as subscription:
+        response = await client.post(
+            "/api/v1/products",
+            json={"name": "Feed Widget", "price": "5.00", "stock_quantity": 3},
+        )
+        product_id = response.json()["id"]
+        assert await _receive(subscription, 1) == [
+            {"type": "stock_changed", "product_ids": [product_id]}
+        ]
+
+        response = await client.post("/api/v1/orders", json=order_payload(product_id, 2))
+        order_id = response.json()["id"]
+        assert await _receive(subscription, 2) == [
+            {"type": "order_created", "order_id": order_id},
+            {"type": "stock_changed", "product_ids": [product_id]},
+        ]
+
+        # Rolled back: nothing is delivered.
+        response = await client.post("/api/v1/orders", json=order_payload(product_id, 5))
+        assert response.status_code == 400
+        await _assert_quiet(subscription)
+
+        await client.patch(
+            f"/api/v1/orders/{order_id}/status", json={"status": "Shipped"}
+        )
+        assert await _receive(subscription, 1) == [
+            {"type": "order_status_changed", "order_id": order_id, "status": "Shipped"}
+        ]
+
+        response = await client.post(
+            "/api/v1/orders/batch",
+            json={"orders": [order_payload(product_id, 1), order_payload(product_id, 1)]},
+        )
+        created = [r["order"]["id"] for r in response.json()["results"] if r["order"]]
+        assert len(created) == 1
+        assert await _receive(subscription, 2) == [
+            {"type": "order_created", "order_id": created[0]},
+            {"type": "stock_changed", "product_ids": [product_id]},
+        ]
+
+
+@pytest.mark.asyncio
+async def test_large_transactions_split_notifications(
+    db_session: AsyncSession, event_broker: EventBroker
+) -> None:
+    events = [order_created(order_id) for order_id in range(2000)]
+    async with event_broker.subscribe() as subscription:
+        await db_session.execute(select(notify(events)))
+        await db_session.commit()
+        assert await _receive(subscription, len(events)) == events
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_evicted(event_broker: EventBroker) -> None:
+    async with (
+        event_broker.subscribe() as slow,
+        event_broker.subscribe() as fast,
+    ):
+        for order_id in range(40):
+            event_broker.publish([order_created(order_id)])
+            assert await _receive(fast, 1) == [order_created(order_id)]
+
+        assert slow.evicted
+        assert [event async for event in slow] == []
+        assert not fast.evicted
+        assert event_broker.subscriber_count == 1
+
+
+@pytest.mark.asyncio
+async def test_event_stream_endpoint(
+    client: AsyncClient, event_broker: EventBroker, sample_product: dict[str, Any]
+) -> None:
+    stream = asyncio.create_task(client.get("/api/v1/events"))
+    for _ in range(100):
+        if event_broker.subscriber_count:
+            break
+        await asyncio.sleep(0.05)
+    assert event_broker.subscriber_count == 1
+
+    response = await client.post(
+        "/api/v1/orders", json=order_payload(sample_product["id"], 1)
+    )
+    order_id = response.json()["id"]
+    await asyncio.sleep(0.2)
+    await event_broker.stop()
+
+    response = await stream
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith("retry: 3000\n\n")
+    assert (
+        f'event: order_created\ndata: {{"type":"order_created","order_id":{order_id}}}'
+        "\n\n"
+    ) in response.text
+    assert "event: stock_changed\n" in response.text
+
+
+@pytest.mark.asyncio
+async def test_imports_publish_stock_changed(
+    client: AsyncClient, event_broker: EventBroker, sample_product: dict[str, Any]
+) -> None:
+    rows = [{"name": "Test Widget", "price": "1.00", "stock_quantity": 7}] + [
+        {"name": f"Imported {n}", "price": "1.00", "stock_quantity": 1}
+        for n in range(1200)
+    ]
+    async with event_broker.subscribe() as subscription:
+        response = await client.post(
+            "/api/v1/products/import",
+            params={"format": "ndjson", "upsert": "true"},
+            content="\n".join(json.dumps(row) for row in rows).encode(),
+        )
+        assert response.json()["inserted"] == 1200
+        events = await _receive(subscription, 3)
+        await _assert_quiet(subscription)
+
+    assert {event["type"] for event in events} == {"stock_changed"}
+    product_ids = [pid for event in events for pid in event["product_ids"]]
+    assert len(product_ids) == 1201
+    assert sorted(product_ids) == product_ids
+    assert product_ids[0] == sample_product["id"]
+
+
+@pytest.mark.asyncio
+async def test_stripe_changes_publish_stock_changed(
+    client: AsyncClient, event_broker: EventBroker, sample_product: dict[str, Any]
+) -> None:
+    product_id = sample_product["id"]
+    async with event_broker.subscribe() as subscription:
+        for stripes in (4, 0):
+            await client.put(
+                f"/api/v1/products/{product_id}/stripes", json={"stripes": stripes}
+            )
+            assert await _receive(subscription, 1) == [
+                {"type": "stock_changed", "product_ids": [product_id]}
+            ]
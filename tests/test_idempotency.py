@@ -0,0 +1,146 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache import InMemoryCacheBackend
+from app.models.idempotency_key import IdempotencyKey
+from app.models.order import Order
+from app.models.product import Product
+from app.schemas.order import OrderCreate, OrderRead
+from app.services.idempotency import (
+    IdempotencyCache,
+    IdempotencyKeyPurger,
+    IdempotentRequest,
+)
+from app.services.order_service import OrderService
+from tests.conftest import RoundTripCounter, order_payload
+
+
+@pytest.mark.asyncio
+async def test_retry_replays_original_order(
+    client: AsyncClient,
+    sample_product: dict[str, Any],
+    round_trips: RoundTripCounter,
+) -> None:
+    product_id = sample_product["id"]
+    headers = {"Idempotency-Key": "retry-1"}
+
+    first = await client.post(
+        "/api/v1/orders", json=order_payload(product_id, 2), headers=headers
+    )
+    assert first.status_code == 201
+
+    round_trips.reset()
+    retry = await client.post(
+        "/api/v1/orders", json=order_payload(product_id, 2), headers=headers
+    )
+    assert retry.status_code == 201
+    assert retry.json() == first.json()
+    assert round_trips.count == 0
+
+    product = (await client.get(f"/api/v1/products/{product_id}")).json()
+    assert product["stock_quantity"] == 48
+
+    response = await client.post(
+        "/api/v1/orders", json=order_payload(product_id, 3), headers=headers
+    )
+    assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_failed_request_releases_key(
+    client: AsyncClient, db_session: AsyncSession, sample_product: dict[str, Any]
+) -> None:
+    product_id = sample_product["id"]
+    headers = {"Idempotency-Key": "too-many"}
+
+    response = await client.post(
+        "/api/v1/orders", json=order_payload(product_id, 60), headers=headers
+    )
+    assert response.status_code == 400
+
+    await db_session.execute(
+        update(Product).where(Product.id == product_id).values(stock_quantity=100)
+    )
+    await db_session.commit()
+    response = await client.post(
+        "/api/v1/orders", json=order_payload(product_id, 60), headers=headers
+    )
+    assert response.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_create_one_order(
+    db_session: AsyncSession,
+    session_factory: async_sessionmaker[AsyncSession],
+    sample_product: dict[str, Any],
+) -> None:
+    payload = OrderCreate.model_validate(order_payload(sample_product["id"], 1))
+    request = IdempotentRequest.for_payload("dup", payload)
+
+    async def place() -> OrderRead:
+        # Separate sessions and caches: duplicates arriving on other workers.
+        async with session_factory() as session:
+            cache = IdempotencyCache(InMemoryCacheBackend(10, ttl_seconds=60))
+            return await cache.run(
+                request, lambda: OrderService(session).create_order(payload, request)
+            )
+
+    results = await asyncio.gather(*(place() for _ in range(5)))
+
+    assert len({order.id for order in results}) == 1
+    assert await db_session.scalar(select(func.count()).select_from(Order)) == 1
+
+
+@pytest.mark.asyncio
+async def test_in_flight_duplicates_wait_for_first() -> None:
+    cache = IdempotencyCache(InMemoryCacheBackend(10, ttl_seconds=60))
+    request = IdempotentRequest("k", "0" * 64)
+    calls = 0
+
+    async def create() -> OrderRead:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return OrderRead(
+            id=1,
+            status="Pending",
+            created_at=datetime(2024, 1, 1),
+            updated_at=datetime(2024, 1, 1),
+            items=[],
+        )
+
+    results = await asyncio.gather(*(cache.run(request, create) for _ in range(5)))
+
+    assert calls == 1
+    assert {order.id for order in results} == {1}
+
+
+@pytest.mark.asyncio
+async def test_purger_deletes_expired_keys(
+    db_session: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    db_session.add_all(
+        [
+            IdempotencyKey(
+                key="old",
+                fingerprint="0" * 64,
+                created_at=datetime.now() - timedelta(days=2),
+            ),
+            IdempotencyKey(key="new", fingerprint="0" * 64),
+        ]
+    )
+    await db_session.commit()
+
+    purger = IdempotencyKeyPurger(
+        session_factory, ttl_seconds=86_400, interval_seconds=60, batch_size=1
+    )
+    assert await purger.run_once() == 1
+
+    keys = await db_session.scalars(select(IdempotencyKey.key))
+    assert list(keys) == ["new"]
@@ -0,0 +1,92 @@
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from starlette.requests import Request
+
+from app.exceptions import AppError
+from app.main import app
+from app.metrics import REGISTRY, Histogram, Registry
+from tests.conftest import order_payload
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exports_route_and_domain_metrics(
+    client: AsyncClient, sample_product: dict[str, Any]
+) -> None:
+    await client.post(
+        "/api/v1/orders",
+        json={"items": [{"product_id": sample_product["id"], "quantity": 1}]},
+    )
+    await client.get("/api/v1/orders/99999")
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert (
+        'http_requests_total{method="GET",route="/api/v1/orders/{order_id}",'
+        'status="404"}' in body
+    )
+    assert (
+        'http_request_duration_seconds_count{method="POST",route="/api/v1/orders"}'
+        in body
+    )
+    assert 'order_lock_wait_seconds_count{strategy="lock"}' in body
+    assert 'order_transaction_seconds_count{strategy="lock"}' in body
+    assert 'app_errors_total{type="NotFoundError"}' in body
+
+
+
+def _app_errors(error_type: str) -> float:
+    prefix = f'app_errors_total{{type="{error_type}"}} '
+    for line in REGISTRY.render().splitlines():
+        if line.startswith(prefix):
+            return float(line.removeprefix(prefix))
+    return 0.0
+
+
+@pytest.mark.asyncio
+async def test_only_errors_answered_as_responses_are_counted(
+    client: AsyncClient, sample_product: dict[str, Any]
+) -> None:
+    product_id = sample_product["id"]
+    before = _app_errors("InsufficientStockError")
+
+    # A batch reports failed entries in a 200 response; nothing was raised.
+    response = await client.post(
+        "/api/v1/orders/batch", json={"orders": [order_payload(product_id, 51)]}
+    )
+    assert response.json()["failed"] == 1
+    assert _app_errors("InsufficientStockError") == before
+
+    response = await client.post("/api/v1/orders", json=order_payload(product_id, 51))
+    assert response.status_code == 400
+    assert _app_errors("InsufficientStockError") == before + 1
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = Registry()
+    histogram = Histogram("demo_seconds", "Demo.", ("kind",), buckets=(0.1, 1.0))
+    registry.register(histogram)
+
+    histogram.observe(0.05, "a")
+    histogram.observe(0.5, "a")
+    histogram.observe(5.0, "a")
+
+    lines = registry.render().splitlines()
+    assert 'demo_seconds_bucket{le="0.1",kind="a"} 1.0' in lines
+    assert 'demo_seconds_bucket{le="1.0",kind="a"} 2.0' in lines
+    assert 'demo_seconds_bucket{le="+Inf",kind="a"} 3.0' in lines
+    assert 'demo_seconds_count{kind="a"} 3.0' in lines
+
+
+@pytest.mark.asyncio
+async def test_errors_without_their_own_handler_are_counted() -> None:
+    class UnmappedError(AppError):
+        pass
+
+    handler = app.exception_handlers[AppError]
+    response = await handler(Request({"type": "http"}), UnmappedError("Odd."))
+    assert response.status_code == 400
+    assert _app_errors("UnmappedError") == 1
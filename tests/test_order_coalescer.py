@@ -0,0 +1,74 @@
+import asyncio
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.dependencies import get_order_coalescer, get_session_factory
+from app.exceptions import InsufficientStockError
+from app.main import app
+from app.schemas.order import OrderCreate
+from app.services.order_coalescer import OrderCoalescer
+
+
+@pytest.mark.asyncio
+async def test_coalescer_allocates_in_arrival_order(
+    client: AsyncClient,
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    response = await client.post(
+        "/api/v1/products",
+        json={"name": "Hot SKU", "price": "4.00", "stock_quantity": 3},
+    )
+    product_id = response.json()["id"]
+    coalescer = OrderCoalescer(session_factory, window_ms=50, max_batch=100)
+    payload = OrderCreate(items=[{"product_id": product_id, "quantity": 1}])
+
+    results = await asyncio.gather(
+        *(coalescer.submit(payload) for _ in range(5)), return_exceptions=True
+    )
+
+    assert [type(r).__name__ for r in results] == [
+        "OrderRead",
+        "OrderRead",
+        "OrderRead",
+        "InsufficientStockError",
+        "InsufficientStockError",
+    ]
+    assert isinstance(results[3], InsufficientStockError)
+    assert results[3].available == 0
+    assert len({r.id for r in results[:3]}) == 3
+
+
+@pytest.mark.asyncio
+async def test_create_order_route_uses_coalescer(
+    client: AsyncClient,
+    session_factory: async_sessionmaker[AsyncSession],
+    sample_product: dict[str, Any],
+) -> None:
+    coalescer = OrderCoalescer(session_factory, window_ms=20, max_batch=100)
+    app.dependency_overrides[get_order_coalescer] = lambda: coalescer
+    # Coalesced requests leave the pool to the coalescer's own session.
+    opened: list[AsyncSession] = []
+
+    def request_sessions() -> AsyncSession:
+        opened.append(session_factory())
+        return opened[-1]
+
+    app.dependency_overrides[get_session_factory] = lambda: request_sessions
+
+    responses = await asyncio.gather(
+        *(
+            client.post(
+                "/api/v1/orders",
+                json={"items": [{"product_id": sample_product["id"], "quantity": 2}]},
+            )
+            for _ in range(4)
+        )
+    )
+
+    assert [r.status_code for r in responses] == [201] * 4
+    assert opened == []
+    products = (await client.get("/api/v1/products")).json()["items"]
+    assert products[0]["stock_quantity"] == sample_product["stock_quantity"] - 8
@@ -0,0 +1,106 @@
+import csv
+import io
+import json
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.services.order_export import OrderExporter
+
+
+async def _place_orders(client: AsyncClient, product_id: int, count: int) -> list[dict]:
+    orders = []
+    for quantity in range(1, count + 1):
+        response = await client.post(
+            "/api/v1/orders",
+            json={"items": [{"product_id": product_id, "quantity": quantity}]},
+        )
+        assert response.status_code == 201
+        orders.append(response.json())
+    return orders
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson_matches_order_reads(
+    client: AsyncClient, sample_product: dict[str, Any]
+) -> None:
+    second = (
+        await client.post(
+            "/api/v1/products",
+            json={"name": "Gadget", "price": "5.00", "stock_quantity": 10},
+        )
+    ).json()
+    multi = await client.post(
+        "/api/v1/orders",
+        json={
+            "items": [
+                {"product_id": sample_product["id"], "quantity": 1},
+                {"product_id": second["id"], "quantity": 2},
+            ]
+        },
+    )
+    orders = [multi.json(), *await _place_orders(client, sample_product["id"], 2)]
+    await client.patch(
+        f"/api/v1/orders/{orders[1]['id']}/status", json={"status": "Shipped"}
+    )
+
+    response = await client.get("/api/v1/orders/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert [o["id"] for o in exported] == [o["id"] for o in orders]
+    assert exported[0]["items"] == orders[0]["items"]
+
+    response = await client.get("/api/v1/orders/export", params={"status": "Shipped"})
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == [
+        orders[1]["id"]
+    ]
+
+    response = await client.get(
+        "/api/v1/orders/export", params={"created_to": "2000-01-01T00:00:00Z"}
+    )
+    assert response.text == ""
+
+
+@pytest.mark.asyncio
+async def test_export_csv_has_one_row_per_item(
+    client: AsyncClient, sample_product: dict[str, Any]
+) -> None:
+    orders = await _place_orders(client, sample_product["id"], 3)
+
+    response = await client.get("/api/v1/orders/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(r["order_id"]) for r in rows] == [o["id"] for o in orders]
+    assert rows[2]["quantity"] == "3"
+    assert rows[0]["price_at_time"] == sample_product["price"]
+
+
+@pytest.mark.asyncio
+async def test_export_groups_items_across_fetch_batches(
+    client: AsyncClient,
+    session_factory: async_sessionmaker[AsyncSession],
+    sample_product: dict[str, Any],
+) -> None:
+    products = [sample_product["id"]]
+    for name in ("B", "C"):
+        response = await client.post(
+            "/api/v1/products",
+            json={"name": name, "price": "1.00", "stock_quantity": 10},
+        )
+        products.append(response.json()["id"])
+    for _ in range(3):
+        await client.post(
+            "/api/v1/orders",
+            json={"items": [{"product_id": pid, "quantity": 1} for pid in products]},
+        )
+
+    # Two rows per fetch: every order's three items span a batch boundary.
+    exporter = OrderExporter(session_factory, batch_size=2)
+    chunks = [chunk async for chunk in exporter.stream("ndjson")]
+    exported = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert len(exported) == 3
+    assert all(len(o["items"]) == 3 for o in exported)
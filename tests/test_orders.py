@@ -2,6 +2,12 @@ from typing import Any
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.exceptions import InsufficientStockError, NotFoundError
+from app.schemas.order import OrderCreate
+from app.services.order_service import OrderService
+from tests.conftest import RoundTripCounter
 
 
 @pytest.mark.asyncio
@@ -89,3 +95,193 @@ async def test_create_order_product_not_found(client: AsyncClient) -> None:
         json={"items": [{"product_id": 99999, "quantity": 1}]},
     )
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_create_orders_batch_partial_success(client: AsyncClient) -> None:
+    """Orders are allocated in sequence; a short order fails alone."""
+    r1 = await client.post(
+        "/api/v1/products",
+        json={"name": "Plenty", "price": "2.50", "stock_quantity": 100},
+    )
+    r2 = await client.post(
+        "/api/v1/products",
+        json={"name": "Limited", "price": "9.00", "stock_quantity": 3},
+    )
+    p1, p2 = r1.json(), r2.json()
+
+    response = await client.post(
+        "/api/v1/orders/batch",
+        json={
+            "orders": [
+                {"items": [{"product_id": p2["id"], "quantity": 2}]},
+                {
+                    "items": [
+                        {"product_id": p1["id"], "quantity": 1},
+                        {"product_id": p2["id"], "quantity": 2},
+                    ]
+                },
+                {"items": [{"product_id": 99999, "quantity": 1}]},
+                {
+                    "items": [
+                        {"product_id": p1["id"], "quantity": 4},
+                        {"product_id": p2["id"], "quantity": 1},
+                    ]
+                },
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created"] == 2
+    assert body["failed"] == 2
+    assert [r["status"] for r in body["results"]] == [
+        "created",
+        "failed",
+        "failed",
+        "created",
+    ]
+    short = body["results"][1]["error"]
+    assert short["product_id"] == p2["id"]
+    assert short["requested"] == 2
+    assert short["available"] == 1
+    assert body["results"][2]["error"]["product_id"] == 99999
+    created = body["results"][3]["order"]
+    assert {i["product_id"]: i["quantity"] for i in created["items"]} == {
+        p1["id"]: 4,
+        p2["id"]: 1,
+    }
+
+    products = {p["id"]: p for p in (await client.get("/api/v1/products")).json()["items"]}
+    assert products[p1["id"]]["stock_quantity"] == 96
+    assert products[p2["id"]]["stock_quantity"] == 0
+
+
+@pytest.mark.asyncio
+async def test_conditional_update_strategy(
+    client: AsyncClient, db_session: AsyncSession, sample_product: dict[str, Any]
+) -> None:
+    product_id = sample_product["id"]
+    service = OrderService(db_session, stock_strategy="conditional_update")
+
+    order = await service.create_order(
+        OrderCreate(items=[{"product_id": product_id, "quantity": 20}])
+    )
+    assert order.items[0].quantity == 20
+    assert str(order.items[0].price_at_time) == sample_product["price"]
+
+    with pytest.raises(InsufficientStockError) as exc_info:
+        await service.create_order(
+            OrderCreate(items=[{"product_id": product_id, "quantity": 31}])
+        )
+    assert exc_info.value.available == 30
+
+    with pytest.raises(NotFoundError):
+        await service.create_order(
+            OrderCreate(
+                items=[
+                    {"product_id": product_id, "quantity": 1},
+                    {"product_id": 99999, "quantity": 1},
+                ]
+            )
+        )
+
+    products = (await client.get("/api/v1/products")).json()["items"]
+    assert products[0]["stock_quantity"] == 30
+
+
+@pytest.mark.asyncio
+async def test_write_path_round_trips(
+    client: AsyncClient, sample_product: dict[str, Any], round_trips: RoundTripCounter
+) -> None:
+    round_trips.reset()
+    response = await client.post(
+        "/api/v1/orders",
+        json={"items": [{"product_id": sample_product["id"], "quantity": 2}]},
+    )
+    assert response.status_code == 201
+    # BEGIN, lock, stock UPDATE, order INSERT, item INSERT, COMMIT
+    assert round_trips.count <= 6, round_trips.statements
+    order = response.json()
+    assert order["items"][0]["quantity"] == 2
+    assert order["items"][0]["price_at_time"] == sample_product["price"]
+
+    round_trips.reset()
+    response = await client.patch(
+        f"/api/v1/orders/{order['id']}/status", json={"status": "Shipped"}
+    )
+    assert response.status_code == 200
+    # BEGIN, UPDATE ... RETURNING joined with items, COMMIT
+    assert round_trips.count <= 3, round_trips.statements
+    assert response.json()["status"] == "Shipped"
+    assert response.json()["items"] == order["items"]
+
+
+@pytest.mark.asyncio
+async def test_read_path_is_one_statement_per_page(
+    client: AsyncClient, sample_product: dict[str, Any], round_trips: RoundTripCounter
+) -> None:
+    product_id = sample_product["id"]
+    created = []
+    for quantity in (1, 2):
+        response = await client.post(
+            "/api/v1/orders",
+            json={"items": [{"product_id": product_id, "quantity": quantity}]},
+        )
+        created.append(response.json())
+
+    round_trips.reset()
+    page = (await client.get("/api/v1/orders")).json()
+    # BEGIN, count, orders with their items aggregated as JSON
+    assert round_trips.count <= 3, round_trips.statements
+    assert page["items"] == created[::-1]
+
+    round_trips.reset()
+    response = await client.get(f"/api/v1/orders/{created[0]['id']}")
+    assert round_trips.count <= 2, round_trips.statements
+    assert response.json() == created[0]
+
+
+@pytest.mark.asyncio
+async def test_list_orders_filters(client: AsyncClient) -> None:
+    ids = []
+    for name in ("A", "B"):
+        response = await client.post(
+            "/api/v1/products",
+            json={"name": name, "price": "1.00", "stock_quantity": 10},
+        )
+        ids.append(response.json()["id"])
+    a, b = ids
+    orders = []
+    for items in ([a], [b], [a, b]):
+        response = await client.post(
+            "/api/v1/orders",
+            json={"items": [{"product_id": pid, "quantity": 1} for pid in items]},
+        )
+        orders.append(response.json()["id"])
+    await client.patch(
+        f"/api/v1/orders/{orders[1]}/status", json={"status": "Shipped"}
+    )
+
+    async def listed(**params: Any) -> list[int]:
+        response = await client.get("/api/v1/orders", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert page["total"] == len(page["items"])
+        return [o["id"] for o in page["items"]]
+
+    assert await listed(status="Pending") == [orders[2], orders[0]]
+    assert await listed(product_id=b) == [orders[2], orders[1]]
+    assert await listed(status="Pending", product_id=b) == [orders[2]]
+    assert await listed(created_from="2000-01-01T00:00:00+00:00") == orders[::-1]
+    assert await listed(created_to="2000-01-01T00:00:00Z") == []
+
+    seen, params = [], {"status": "Pending", "limit": 1}
+    while True:
+        page = (await client.get("/api/v1/orders", params=params)).json()
+        seen.extend(o["id"] for o in page["items"])
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert seen == [orders[2], orders[0]]
@@ -0,0 +1,124 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependencies import get_product_cache
+from app.main import app
+from tests.conftest import RoundTripCounter
+
+
+async def _create_products(client: AsyncClient, count: int) -> list[int]:
+    ids = []
+    for i in range(count):
+        response = await client.post(
+            "/api/v1/products",
+            json={"name": f"Item {i}", "price": "1.00", "stock_quantity": 100},
+        )
+        assert response.status_code == 201
+        ids.append(response.json()["id"])
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_products_cursor_pagination_walks_all_rows(client: AsyncClient) -> None:
+    ids = await _create_products(client, 5)
+
+    first = (await client.get("/api/v1/products", params={"limit": 2})).json()
+    assert [p["id"] for p in first["items"]] == ids[:2]
+    assert first["offset"] == 0
+    assert first["next_cursor"]
+
+    seen = [p["id"] for p in first["items"]]
+    cursor = first["next_cursor"]
+    while cursor:
+        page = (
+            await client.get("/api/v1/products", params={"limit": 2, "cursor": cursor})
+        ).json()
+        assert page["offset"] is None
+        assert page["total"] == 5
+        seen.extend(p["id"] for p in page["items"])
+        cursor = page["next_cursor"]
+
+    assert seen == ids
+
+
+@pytest.mark.asyncio
+async def test_orders_cursor_pagination_matches_offset_order(
+    client: AsyncClient,
+) -> None:
+    [product_id] = await _create_products(client, 1)
+    for _ in range(5):
+        response = await client.post(
+            "/api/v1/orders",
+            json={"items": [{"product_id": product_id, "quantity": 1}]},
+        )
+        assert response.status_code == 201
+
+    by_offset = (await client.get("/api/v1/orders", params={"limit": 5})).json()
+    assert by_offset["next_cursor"] is None
+
+    seen: list[int] = []
+    params: dict[str, str | int] = {"limit": 2}
+    while True:
+        page = (await client.get("/api/v1/orders", params=params)).json()
+        seen.extend(o["id"] for o in page["items"])
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+
+    assert seen == [o["id"] for o in by_offset["items"]]
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_returns_400(client: AsyncClient) -> None:
+    response = await client.get("/api/v1/orders", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def _counts(round_trips: RoundTripCounter) -> int:
+    return sum("count(" in statement for statement in round_trips.statements)
+
+
+@pytest.mark.asyncio
+async def test_total_modes(
+    client: AsyncClient, db_session: AsyncSession, round_trips: RoundTripCounter
+) -> None:
+    await _create_products(client, 3)
+    app.dependency_overrides[get_product_cache] = lambda: None
+
+    # Never analyzed: the estimate falls back to the exact count.
+    page = (await client.get("/api/v1/products?total_mode=estimate")).json()
+    assert (page["total"], page["total_is_estimate"]) == (3, False)
+
+    await db_session.execute(text("ANALYZE products"))
+    await db_session.commit()
+    page = (await client.get("/api/v1/products?total_mode=estimate")).json()
+    assert (page["total"], page["total_is_estimate"]) == (3, True)
+
+    round_trips.reset()
+    page = (await client.get("/api/v1/orders?total_mode=none")).json()
+    assert (page["total"], page["total_is_estimate"]) == (None, False)
+    assert _counts(round_trips) == 0
+
+
+@pytest.mark.asyncio
+async def test_exact_totals_are_cached_until_an_insert(
+    client: AsyncClient, round_trips: RoundTripCounter
+) -> None:
+    [product_id] = await _create_products(client, 1)
+    order = {"items": [{"product_id": product_id, "quantity": 1}]}
+    await client.post("/api/v1/orders", json=order)
+
+    round_trips.reset()
+    for _ in range(3):
+        assert (await client.get("/api/v1/orders")).json()["total"] == 1
+    assert _counts(round_trips) == 1
+
+    # Filtered lists count separately, and an estimate cannot apply to them.
+    params = {"status": "Pending", "total_mode": "estimate"}
+    page = (await client.get("/api/v1/orders", params=params)).json()
+    assert (page["total"], page["total_is_estimate"]) == (1, False)
+
+    await client.post("/api/v1/orders", json=order)
+    assert (await client.get("/api/v1/orders")).json()["total"] == 2
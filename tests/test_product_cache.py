@@ -0,0 +1,88 @@
+import asyncio
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+
+from app.cache import InMemoryCacheBackend, RedisCacheBackend
+from app.dependencies import get_product_cache
+from app.main import app
+from app.services.product_cache import ProductCache
+
+
+class FakeRedis:
+    """Local stand-in for the subset of redis.asyncio.Redis the backend uses."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+
+    async def get(self, name: str) -> bytes | None:
+        return self.data.get(name)
+
+    async def set(self, name: str, value: bytes, px: int | None = None) -> None:
+        self.data[name] = value
+
+    async def delete(self, *names: str) -> None:
+        for name in names:
+            self.data.pop(name, None)
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_lru_and_ttl() -> None:
+    backend = InMemoryCacheBackend(max_entries=2, ttl_seconds=0.05)
+    await backend.set("a", b"1")
+    await backend.set("b", b"2")
+    assert await backend.get("a") == b"1"  # "a" is now most recently used
+
+    await backend.set("c", b"3")
+    assert await backend.get("b") is None
+    assert backend.evictions == 1
+
+    await asyncio.sleep(0.06)
+    assert await backend.get("a") is None
+    assert len(backend) == 1
+
+
+@pytest.mark.asyncio
+async def test_product_reads_are_cached_and_invalidated_on_order(
+    client: AsyncClient, sample_product: dict[str, Any]
+) -> None:
+    cache: ProductCache = app.dependency_overrides[get_product_cache]()
+    url = f"/api/v1/products/{sample_product['id']}"
+
+    assert (await client.get(url)).json()["stock_quantity"] == 50
+    assert (await client.get(url)).json()["stock_quantity"] == 50
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    response = await client.post(
+        "/api/v1/orders",
+        json={"items": [{"product_id": sample_product["id"], "quantity": 5}]},
+    )
+    assert response.status_code == 201
+
+    assert (await client.get(url)).json()["stock_quantity"] == 45
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+    assert (await client.get("/cache/stats")).json() == {
+        "products": {"hits": 1, "misses": 2, "evictions": 0}
+    }
+
+
+@pytest.mark.asyncio
+async def test_shared_backend_round_trip(
+    client: AsyncClient, sample_product: dict[str, Any]
+) -> None:
+    redis = FakeRedis()
+    cache = ProductCache(RedisCacheBackend(redis, ttl_seconds=60))
+    app.dependency_overrides[get_product_cache] = lambda: cache
+
+    first = (await client.get("/api/v1/products")).json()
+    second = (await client.get("/api/v1/products")).json()
+    assert first == second
+    assert cache.stats.hits == 1
+    assert all(key.startswith("inventory:") for key in redis.data)
+
+    await client.post(
+        "/api/v1/products",
+        json={"name": "Another", "price": "3.00", "stock_quantity": 1},
+    )
+    assert (await client.get("/api/v1/products")).json()["total"] == 2
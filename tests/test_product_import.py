@@ -0,0 +1,115 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services import product_import
+from app.services.product_import import ProductImporter
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def _all_products(client: AsyncClient) -> list[dict]:
+    response = await client.get("/api/v1/products", params={"limit": 100})
+    return response.json()["items"]
+
+
+@pytest.mark.asyncio
+async def test_import_csv_reports_bad_rows(client: AsyncClient) -> None:
+    body = (
+        "name,price,stock_quantity\r\n"
+        "Widget,9.99,10\r\n"
+        '"Gadget, deluxe\nedition",19.50,3\r\n'
+        "Broken,-1,5\r\n"
+        "Short,1.00\r\n"
+        "\r\n"
+        "Gizmo,4.25,0\r\n"
+    )
+    response = await client.post(
+        "/api/v1/products/import",
+        content=body.encode(),
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["received"] == 5
+    assert result["inserted"] == 3
+    assert result["failed"] == 2
+    assert [e["line"] for e in result["errors"]] == [5, 6]
+    assert result["errors"][0]["detail"].startswith("price:")
+
+    products = await _all_products(client)
+    assert [p["name"] for p in products] == [
+        "Widget",
+        "Gadget, deluxe\nedition",
+        "Gizmo",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_ndjson_upsert_by_name(client: AsyncClient) -> None:
+    existing = (
+        await client.post(
+            "/api/v1/products",
+            json={"name": "Widget", "price": "9.99", "stock_quantity": 10},
+        )
+    ).json()
+    await client.get(f"/api/v1/products/{existing['id']}")  # warm the cache
+
+    lines = [
+        {"name": "Widget", "price": "8.00", "stock_quantity": 1},
+        {"name": "New", "price": "1.00", "stock_quantity": 5},
+        "not json",
+        {"name": "Widget", "price": "7.50", "stock_quantity": 40},
+    ]
+    body = "\n".join(l if isinstance(l, str) else json.dumps(l) for l in lines)
+    response = await client.post(
+        "/api/v1/products/import",
+        params={"format": "ndjson", "upsert": "true"},
+        content=body.encode(),
+    )
+    result = response.json()
+    assert (result["inserted"], result["updated"], result["failed"]) == (1, 1, 1)
+    assert result["errors"][0]["line"] == 3
+
+    widget = (await client.get(f"/api/v1/products/{existing['id']}")).json()
+    assert (widget["price"], widget["stock_quantity"]) == ("7.50", 40)
+    assert len(await _all_products(client)) == 2
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_missing_header_column(client: AsyncClient) -> None:
+    response = await client.post(
+        "/api/v1/products/import", content=b"name,price\nWidget,1.00\n"
+    )
+    assert response.status_code == 400
+    assert "stock_quantity" in response.json()["detail"]
+    assert await _all_products(client) == []
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_overlong_line(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(product_import, "_MAX_LINE_CHARS", 64)
+    body = b"name,price,stock_quantity\n" + b"x" * 200
+    response = await client.post("/api/v1/products/import", content=body)
+    assert response.status_code == 400
+    assert "longer than 64" in response.json()["detail"]
+    assert await _all_products(client) == []
+
+
+@pytest.mark.asyncio
+async def test_import_copies_in_chunks(db_session: AsyncSession) -> None:
+    rows = "".join(f"SKU-{i},1.00,{i}\n" for i in range(25))
+    body = f"name,price,stock_quantity\n{rows}".encode()
+    importer = ProductImporter(db_session, chunk_size=10, max_errors=1)
+
+    # Tiny body chunks split lines and multi-byte boundaries alike.
+    result = await importer.import_products(_chunks(body, 7), "csv")
+
+    assert (result.received, result.inserted, result.failed) == (25, 25, 0)
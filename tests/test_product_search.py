@@ -0,0 +1,132 @@
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.dependencies import get_product_name_index
+from app.main import app
+from app.models.product import Product
+from app.services.product_search import ProductNameIndex
+from tests.conftest import RoundTripCounter
+
+NAMES = [
+    "Widget Pro",
+    "widget",
+    "Blue Widget",
+    "Widget Mini",
+    "Gadget",
+    "Pro Widget Stand",
+    "Wide Angle Lens",
+]
+
+
+async def _create(client: AsyncClient, names: list[str]) -> None:
+    for name in names:
+        payload = {"name": name, "price": "1.00", "stock_quantity": 5}
+        assert (await client.post("/api/v1/products", json=payload)).status_code == 201
+
+
+async def _search(client: AsyncClient, **params: Any) -> list[str]:
+    """Walk every page of a search, two results at a time."""
+    params = {"limit": 2, **params}
+    names: list[str] = []
+    while True:
+        response = await client.get("/api/v1/products/search", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 2
+        assert page["total"] is None
+        names.extend(item["name"] for item in page["items"])
+        if page["next_cursor"] is None:
+            return names
+        params["cursor"] = page["next_cursor"]
+
+
+@pytest.mark.asyncio
+async def test_prefix_and_fuzzy_search(client: AsyncClient) -> None:
+    await _create(client, NAMES)
+
+    assert await _search(client, q="WID") == [
+        "Wide Angle Lens",
+        "widget",
+        "Widget Mini",
+        "Widget Pro",
+    ]
+    assert await _search(client, q="widget p") == ["Widget Pro"]
+    assert await _search(client, q="lens") == []
+
+    fuzzy = await _search(client, q="wid pro", mode="fuzzy")
+    assert sorted(fuzzy) == ["Pro Widget Stand", "Widget Pro"]
+    assert sorted(await _search(client, q="widget", mode="fuzzy")) == sorted(
+        name for name in NAMES if "widget" in name.lower()
+    )
+    assert await _search(client, q="-- !", mode="fuzzy") == []
+
+    prefix_cursor = (
+        await client.get("/api/v1/products/search", params={"q": "w", "limit": 1})
+    ).json()["next_cursor"]
+    response = await client.get(
+        "/api/v1/products/search",
+        params={"q": "w", "mode": "fuzzy", "cursor": prefix_cursor},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_name_index_serves_prefix_searches(
+    client: AsyncClient,
+    session_factory: async_sessionmaker[AsyncSession],
+    round_trips: RoundTripCounter,
+) -> None:
+    await _create(client, NAMES[:4])
+    from_database = await _search(client, q="widget")
+
+    index = ProductNameIndex(session_factory)
+    assert await index.run_once() == 4
+    app.dependency_overrides[get_product_name_index] = lambda: index
+
+    # New products are indexed as they are created.
+    await _create(client, NAMES[4:])
+    assert len(index) == len(NAMES)
+
+    round_trips.reset()
+    assert await _search(client, q="widget") == from_database
+    assert not any("lower(" in statement for statement in round_trips.statements)
+    assert await index.run_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_name_index_picks_up_ids_committed_out_of_order(
+    db_session: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    index = ProductNameIndex(session_factory)
+    await index.run_once()
+
+    async with session_factory() as slow, session_factory() as fast:
+        slow.add(Product(name="Slow", price=1, stock_quantity=1))
+        await slow.flush()
+        fast.add(Product(name="Fast", price=1, stock_quantity=1))
+        await fast.commit()
+
+        assert await index.run_once() == 1
+        await slow.commit()
+
+    assert await index.run_once() == 1
+    assert [key for key, _ in index.search("", 10)] == ["fast", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_name_index_keys_loaded_and_added_names_alike(
+    db_session: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    db_session.add(Product(name="ÉCLAIR Tray", price=1, stock_quantity=1))
+    await db_session.commit()
+    index = ProductNameIndex(session_factory)
+    assert await index.run_once() == 1
+    index.add(2, "Éclair Pan")
+
+    assert [key for key, _ in index.search("éclair", 10)] == [
+        "éclair pan",
+        "éclair tray",
+    ]
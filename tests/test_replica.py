@@ -0,0 +1,187 @@
+from collections.abc import AsyncGenerator, Iterator
+from decimal import Decimal
+from typing import Any
+
+import asyncpg
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.database import Base
+from app.dependencies import (
+    get_product_cache,
+    get_read_db,
+    get_read_session_factory,
+    get_replica_router,
+)
+from app.main import app
+from app.models.product import Product
+from app.replica import PRIMARY_READS_COOKIE, ReadYourWritesMiddleware, ReplicaRouter
+from app.services.product_cache import ProductCache
+from tests.conftest import TestSessionLocal, settings
+
+
+@pytest_asyncio.fixture
+async def replica_factory() -> AsyncGenerator[async_sessionmaker[AsyncSession], None]:
+    """
+    A second database standing in for the replica. Replication is not set
+    up, so tests write to it directly to tell the two apart.
+    """
+    engine = create_async_engine(settings.test_read_database_url, poolclass=NullPool)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    except (OSError, asyncpg.PostgresError) as exc:
+        await engine.dispose()
+        pytest.skip(f"replica test database unavailable: {exc}")
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest.fixture
+def router(
+    client: AsyncClient, replica_factory: async_sessionmaker[AsyncSession]
+) -> Iterator[ReplicaRouter]:
+    """Routes the app's reads for real, on top of the ``client`` overrides."""
+    router = ReplicaRouter(TestSessionLocal, replica_factory, max_lag_seconds=2.0)
+    app.dependency_overrides[get_replica_router] = lambda: router
+    del app.dependency_overrides[get_read_db]
+    del app.dependency_overrides[get_read_session_factory]
+    yield router
+
+
+@pytest_asyncio.fixture
+async def routed_client(router: ReplicaRouter) -> AsyncGenerator[AsyncClient, None]:
+    async with AsyncClient(
+        transport=ASGITransport(app=ReadYourWritesMiddleware(app, window_seconds=5)),
+        base_url="http://testserver",
+    ) as ac:
+        yield ac
+
+
+async def _seed_replica(
+    replica_factory: async_sessionmaker[AsyncSession], product: dict[str, Any]
+) -> None:
+    async with replica_factory() as session:
+        session.add(
+            Product(
+                id=product["id"],
+                name="Replica copy",
+                price=Decimal(product["price"]),
+                stock_quantity=product["stock_quantity"],
+            )
+        )
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_reads_use_replica_except_after_own_writes(
+    routed_client: AsyncClient,
+    router: ReplicaRouter,
+    replica_factory: async_sessionmaker[AsyncSession],
+    sample_product: dict[str, Any],
+) -> None:
+    product_id = sample_product["id"]
+    await _seed_replica(replica_factory, sample_product)
+    assert await router.run_once() == 0.0
+    url = f"/api/v1/products/{product_id}"
+
+    response = await routed_client.get(url)
+    assert response.json()["name"] == "Replica copy"
+    assert (await routed_client.get("/api/v1/orders")).json()["total"] == 0
+
+    response = await routed_client.post(
+        "/api/v1/orders",
+        json={"items": [{"product_id": product_id, "quantity": 3}]},
+    )
+    assert response.status_code == 201
+    assert PRIMARY_READS_COOKIE in response.cookies
+
+    # The writer sees its order and the new stock, not the cached replica row.
+    product = (await routed_client.get(url)).json()
+    assert (product["name"], product["stock_quantity"]) == ("Test Widget", 47)
+    assert (await routed_client.get("/api/v1/orders")).json()["total"] == 1
+
+    routed_client.cookies.clear()
+    assert (await routed_client.get(url)).json()["name"] == "Replica copy"
+    assert (await routed_client.get("/api/v1/orders")).json()["total"] == 0
+
+
+async def _product_name(client: AsyncClient) -> str:
+    return (await client.get("/api/v1/products")).json()["items"][0]["name"]
+
+
+@pytest.mark.asyncio
+async def test_lagging_or_unknown_replica_falls_back_to_primary(
+    routed_client: AsyncClient,
+    router: ReplicaRouter,
+    replica_factory: async_sessionmaker[AsyncSession],
+    sample_product: dict[str, Any],
+) -> None:
+    await _seed_replica(replica_factory, sample_product)
+    # Every read should hit a database.
+    app.dependency_overrides[get_product_cache] = lambda: None
+
+    # Not checked yet: the lag is unknown.
+    assert router.lag is None
+    assert await _product_name(routed_client) == "Test Widget"
+
+    await router.run_once()
+    assert await _product_name(routed_client) == "Replica copy"
+
+    router.lag = 2.5
+    assert not router.replica_healthy
+    assert await _product_name(routed_client) == "Test Widget"
+
+
+@pytest.mark.asyncio
+async def test_replica_reads_do_not_fill_the_product_cache(
+    routed_client: AsyncClient,
+    router: ReplicaRouter,
+    replica_factory: async_sessionmaker[AsyncSession],
+    sample_product: dict[str, Any],
+) -> None:
+    await _seed_replica(replica_factory, sample_product)
+    url = f"/api/v1/products/{sample_product['id']}"
+    await router.run_once()
+    assert (await routed_client.get(url)).json()["name"] == "Replica copy"
+
+    # Falling back to the primary finds no replica row cached, and fills it.
+    router.lag = 2.5
+    assert (await routed_client.get(url)).json()["name"] == "Test Widget"
+
+    # The replica's reads are served that entry.
+    router.lag = 0.0
+    assert (await routed_client.get(url)).json()["name"] == "Test Widget"
+    cache: ProductCache = app.dependency_overrides[get_product_cache]()
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+
+
+class _DisconnectedStandby:
+    """
+    A replica session that answers the lag query the way a standby whose
+    WAL receiver lost the primary does.
+    """
+
+    async def __aenter__(self) -> "_DisconnectedStandby":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    async def scalar(self, statement: object) -> None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_standby_without_a_wal_receiver_is_unhealthy() -> None:
+    router = ReplicaRouter(TestSessionLocal, _DisconnectedStandby, max_lag_seconds=2.0)
+    router.lag = 0.0
+    assert router.replica_healthy
+
+    assert await router.run_once() is None
+    assert not router.replica_healthy
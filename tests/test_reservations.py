@@ -0,0 +1,170 @@
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.dependencies import get_product_cache
+from app.main import app
+from app.models.reservation import Reservation
+from app.services.reservation_service import ReservationSweeper
+from tests.conftest import RoundTripCounter
+
+
+def _items(*items: tuple[int, int]) -> list[dict[str, int]]:
+    return [{"product_id": pid, "quantity": qty} for pid, qty in items]
+
+
+async def _stock(client: AsyncClient, product_id: int) -> tuple[int, int]:
+    product = (await client.get(f"/api/v1/products/{product_id}")).json()
+    return product["stock_quantity"], product["reserved_quantity"]
+
+
+async def _striped_product(client: AsyncClient) -> int:
+    payload = {"name": "Hot Widget", "price": "5.00", "stock_quantity": 20}
+    product_id = (await client.post("/api/v1/products", json=payload)).json()["id"]
+    await client.put(f"/api/v1/products/{product_id}/stripes", json={"stripes": 4})
+    return product_id
+
+
+@pytest.mark.asyncio
+async def test_order_consumes_hold_without_touching_stock(
+    client: AsyncClient,
+    sample_product: dict[str, Any],
+    round_trips: RoundTripCounter,
+) -> None:
+    product_id = sample_product["id"]
+    striped_id = await _striped_product(client)
+
+    response = await client.post(
+        "/api/v1/reservations",
+        json={"items": _items((product_id, 10), (striped_id, 5)), "ttl_seconds": 60},
+    )
+    assert response.status_code == 201
+    reservation = response.json()
+    assert reservation["items"] == _items((product_id, 10), (striped_id, 5))
+    assert await _stock(client, product_id) == (40, 10)
+    assert await _stock(client, striped_id) == (15, 5)
+
+    # Held stock is gone for everyone else.
+    response = await client.post(
+        "/api/v1/orders", json={"items": _items((product_id, 41))}
+    )
+    assert response.status_code == 400
+
+    round_trips.reset()
+    response = await client.post(
+        "/api/v1/orders", json={"reservation_id": reservation["id"]}
+    )
+    assert response.status_code == 201
+    order = response.json()
+    assert [(i["product_id"], i["quantity"]) for i in order["items"]] == [
+        (product_id, 10),
+        (striped_id, 5),
+    ]
+    assert order["items"][0]["price_at_time"] == "19.99"
+    assert not any(
+        "UPDATE products" in statement or "FOR UPDATE" in statement
+        for statement in round_trips.statements
+    )
+    assert await _stock(client, product_id) == (40, 0)
+    assert await _stock(client, striped_id) == (15, 0)
+
+    response = await client.post(
+        "/api/v1/orders", json={"reservation_id": reservation["id"]}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_holds_are_all_or_nothing(
+    client: AsyncClient, sample_product: dict[str, Any], db_session: AsyncSession
+) -> None:
+    product_id = sample_product["id"]
+    for items, expected in (
+        (_items((product_id, 10), (product_id, 41)), 400),
+        (_items((product_id, 1), (999_999, 1)), 404),
+    ):
+        response = await client.post("/api/v1/reservations", json={"items": items})
+        assert response.status_code == expected
+
+    assert await _stock(client, product_id) == (50, 0)
+    assert await db_session.scalar(select(func.count()).select_from(Reservation)) == 0
+
+    for body in ({"items": _items((product_id, 1)), "reservation_id": 1}, {}):
+        assert (await client.post("/api/v1/orders", json=body)).status_code == 422
+    batch = {"orders": [{"reservation_id": 1}]}
+    response = await client.post("/api/v1/orders/batch", json=batch)
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_expired_and_released_holds_return_stock(
+    client: AsyncClient,
+    sample_product: dict[str, Any],
+    db_session: AsyncSession,
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    product_id = sample_product["id"]
+    holds = [
+        (
+            await client.post(
+                "/api/v1/reservations", json={"items": _items((product_id, 5))}
+            )
+        ).json()["id"]
+        for _ in range(3)
+    ]
+    assert await _stock(client, product_id) == (35, 15)
+
+    await db_session.execute(
+        update(Reservation)
+        .where(Reservation.id.in_(holds[:2]))
+        .values(expires_at=func.now() - func.make_interval(0, 0, 0, 0, 0, 1))
+    )
+    await db_session.commit()
+
+    response = await client.post("/api/v1/orders", json={"reservation_id": holds[0]})
+    assert response.status_code == 409
+    response = await client.get(f"/api/v1/reservations/{holds[2]}")
+    assert response.json()["items"] == _items((product_id, 5))
+
+    sweeper = ReservationSweeper(
+        session_factory,
+        interval_seconds=1,
+        batch_size=1,
+        product_cache=app.dependency_overrides[get_product_cache](),
+    )
+    assert await sweeper.run_once() == 2
+    assert await sweeper.run_once() == 0
+    assert await _stock(client, product_id) == (45, 5)
+    response = await client.post("/api/v1/orders", json={"reservation_id": holds[0]})
+    assert response.status_code == 404
+
+    response = await client.delete(f"/api/v1/reservations/{holds[2]}")
+    assert response.status_code == 204
+    assert await _stock(client, product_id) == (50, 0)
+    response = await client.delete(f"/api/v1/reservations/{holds[2]}")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_released_stock_of_striped_product_can_be_ordered(
+    client: AsyncClient,
+) -> None:
+    striped_id = await _striped_product(client)
+    response = await client.post(
+        "/api/v1/reservations", json={"items": _items((striped_id, 5))}
+    )
+    await client.delete(f"/api/v1/reservations/{response.json()['id']}")
+    # Back on the product row, which no rebalancer has folded into stripes.
+    assert await _stock(client, striped_id) == (20, 0)
+
+    batch = {"orders": [{"items": _items((striped_id, 8))}] * 2}
+    response = await client.post("/api/v1/orders/batch", json=batch)
+    assert response.json()["created"] == 2
+    response = await client.post(
+        "/api/v1/orders", json={"items": _items((striped_id, 4))}
+    )
+    assert response.status_code == 201
+    assert await _stock(client, striped_id) == (0, 0)
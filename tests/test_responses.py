@@ -0,0 +1,140 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import BaseModel
+
+from app.responses import PydanticJSONResponse
+from app.schemas.analytics import ProductSales, SalesBucket, SalesReport
+from app.schemas.common import PaginatedResponse
+from app.schemas.order import (
+    OrderBatchError,
+    OrderBatchResponse,
+    OrderBatchResult,
+    OrderItemRead,
+    OrderRead,
+)
+from app.schemas.product import ProductImportError, ProductImportResult, ProductRead
+
+NAIVE = datetime(2024, 2, 29, 23, 59, 59, 123456)
+AWARE = datetime(2024, 3, 1, 8, 0, tzinfo=timezone(timedelta(hours=5, minutes=30)))
+PRICES = [Decimal("19.90"), Decimal("0.10"), Decimal("1234567890.12"), Decimal("1E+2")]
+
+PRODUCTS = [
+    ProductRead(
+        id=i,
+        name=name,
+        price=price,
+        stock_quantity=i * 7,
+        stock_stripes=i % 2,
+        created_at=NAIVE,
+        updated_at=AWARE,
+    )
+    for i, (name, price) in enumerate(
+        zip(["Widget", "Café ☕", 'Quote " and \\ slash', "Line\nbreak"], PRICES), 1
+    )
+]
+ORDERS = [
+    OrderRead(
+        id=i,
+        status=status,
+        created_at=NAIVE,
+        updated_at=AWARE,
+        items=[
+            OrderItemRead(id=i * 10 + n, product_id=n, quantity=n, price_at_time=p)
+            for n, p in enumerate(PRICES[:i], 1)
+        ],
+    )
+    for i, status in enumerate(["Pending", "Shipped", "Cancelled"], 1)
+]
+
+RESPONSES: list[tuple[Any, BaseModel]] = [
+    (ProductRead, PRODUCTS[1]),
+    (
+        PaginatedResponse[ProductRead],
+        PaginatedResponse[ProductRead](
+            items=PRODUCTS, total=4, limit=20, offset=None, next_cursor="eyJpZCI6NH0"
+        ),
+    ),
+    (OrderRead, ORDERS[2]),
+    (
+        PaginatedResponse[OrderRead],
+        PaginatedResponse[OrderRead](items=ORDERS, total=3, limit=20, offset=0),
+    ),
+    (
+        OrderBatchResponse,
+        OrderBatchResponse(
+            created=1,
+            failed=2,
+            results=[
+                OrderBatchResult(index=0, status="created", order=ORDERS[0]),
+                OrderBatchResult(
+                    index=1,
+                    status="failed",
+                    error=OrderBatchError(
+                        detail="Insufficient stock", product_id=1, requested=5
+                    ),
+                ),
+                OrderBatchResult(
+                    index=2, status="failed", error=OrderBatchError(detail="Nope")
+                ),
+            ],
+        ),
+    ),
+    (
+        ProductImportResult,
+        ProductImportResult(
+            received=3,
+            inserted=1,
+            updated=1,
+            failed=1,
+            errors=[ProductImportError(line=3, detail="price: Input should be ≥ 0")],
+        ),
+    ),
+    (
+        SalesReport,
+        SalesReport(
+            granularity="week",
+            date_from=date(2024, 1, 1),
+            date_to=None,
+            buckets=[
+                SalesBucket(period=date(2024, 1, 1), units=3, revenue=Decimal("-5.00"))
+            ],
+            top_products=[
+                ProductSales(
+                    product_id=1,
+                    name="Café",
+                    order_count=2,
+                    units=3,
+                    revenue=Decimal("59.70"),
+                )
+            ],
+        ),
+    ),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("response_model", "content"),
+    RESPONSES,
+    ids=[getattr(m, "__name__", str(m)) for m, _ in RESPONSES],
+)
+async def test_pydantic_response_matches_default_serialization(
+    response_model: Any, content: BaseModel
+) -> None:
+    field = create_response_field(name="response", type_=response_model)
+    default = JSONResponse(
+        await serialize_response(field=field, response_content=content)
+    )
+
+    assert PydanticJSONResponse(content).body == default.body
+
+
+def test_non_model_content_renders_like_json_response() -> None:
+    content = {"detail": "Café", "available": 0, "items": [None, 1.5]}
+    assert PydanticJSONResponse(content).body == JSONResponse(content).body
@@ -0,0 +1,158 @@
+import asyncio
+from typing import Any
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache import InMemoryCacheBackend
+from app.exceptions import NotFoundError
+from app.metrics import REGISTRY
+from app.services.list_totals import EXACT_COUNTS
+from app.schemas.product import ProductRead
+from app.services.order_service import OrderService
+from app.services.product_cache import ProductCache
+from app.services.product_service import ProductService
+from app.singleflight import SingleFlight
+from tests.conftest import RoundTripCounter
+
+
+class Loader:
+    """Counts calls and blocks each one until ``release`` is set."""
+
+    def __init__(self, result: Any = "result") -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+        self._result = result
+
+    async def __call__(self) -> Any:
+        self.calls += 1
+        await self.release.wait()
+        if isinstance(self._result, Exception):
+            raise self._result
+        return self._result
+
+
+def _collapsed(call: str) -> float:
+    prefix = f'single_flight_collapsed_total{{call="{call}"}} '
+    for line in REGISTRY.render().splitlines():
+        if line.startswith(prefix):
+            return float(line.removeprefix(prefix))
+    return 0.0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_load_and_nothing_is_kept() -> None:
+    flight = SingleFlight()
+    loader = Loader()
+    collapsed_before = _collapsed("test.shared")
+
+    calls = [
+        asyncio.create_task(flight.do("test.shared", 1, loader)) for _ in range(5)
+    ]
+    other_key = asyncio.create_task(flight.do("test.shared", 2, loader))
+    await asyncio.sleep(0)
+    loader.release.set()
+
+    assert await asyncio.gather(*calls, other_key) == ["result"] * 6
+    assert loader.calls == 2
+    assert _collapsed("test.shared") == collapsed_before + 4
+    assert flight.in_flight == 0
+
+    assert await flight.do("test.shared", 1, loader) == "result"
+    assert loader.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller() -> None:
+    flight = SingleFlight()
+    loader = Loader(NotFoundError("Product", 7))
+    calls = [asyncio.create_task(flight.do("test.error", 7, loader)) for _ in range(3)]
+    await asyncio.sleep(0)
+    loader.release.set()
+
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    assert all(isinstance(result, NotFoundError) for result in results)
+    assert loader.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cancellation_and_forget() -> None:
+    flight = SingleFlight()
+    loader = Loader()
+    leader = asyncio.create_task(flight.do("test.cancel", 1, loader))
+    follower = asyncio.create_task(flight.do("test.cancel", 1, loader))
+    impatient = asyncio.create_task(flight.do("test.cancel", 1, loader))
+    await asyncio.sleep(0)
+
+    # A follower giving up leaves the shared call alone...
+    impatient.cancel()
+    await asyncio.sleep(0)
+    assert flight.in_flight == 1
+    # ...while the leader giving up makes the others load for themselves.
+    leader.cancel()
+    await asyncio.sleep(0.01)
+    assert loader.calls == 2
+
+    # After forget(), new callers do not join the call already in flight.
+    flight.forget()
+    fresh = asyncio.create_task(flight.do("test.cancel", 1, loader))
+    await asyncio.sleep(0)
+    assert loader.calls == 3
+    loader.release.set()
+    assert await asyncio.gather(follower, fresh) == ["result", "result"]
+    assert leader.cancelled() and impatient.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_identical_service_reads_run_one_query(
+    session_factory: async_sessionmaker[AsyncSession],
+    round_trips: RoundTripCounter,
+) -> None:
+    async def read_all() -> list[Any]:
+        async with session_factory() as products, session_factory() as orders:
+            return [
+                await ProductService(products).list_products(limit=5),
+                await OrderService(orders).list_orders(limit=5),
+            ]
+
+    round_trips.reset()
+    await read_all()
+    alone = round_trips.count
+
+    EXACT_COUNTS.clear()
+    round_trips.reset()
+    pages = await asyncio.gather(*(read_all() for _ in range(10)))
+    assert round_trips.count == alone
+    assert all(page == pages[0] for page in pages)
+
+
+@pytest.mark.asyncio
+async def test_reads_only_share_a_flight_with_the_same_cache(
+    session_factory: async_sessionmaker[AsyncSession],
+    round_trips: RoundTripCounter,
+    sample_product: dict[str, Any],
+) -> None:
+    async def read(cache: ProductCache | None) -> ProductRead:
+        async with session_factory() as session:
+            service = ProductService(session, cache)
+            return await service.get_product_by_id(sample_product["id"])
+
+    def new_cache() -> ProductCache:
+        return ProductCache(InMemoryCacheBackend(max_entries=10, ttl_seconds=60))
+
+    round_trips.reset()
+    await read(None)
+    alone = round_trips.count
+
+    # A cache-less (read-your-writes) caller, a cache-backed one and a
+    # read-only view of the same cache each load for themselves...
+    cache = new_cache()
+    round_trips.reset()
+    await asyncio.gather(read(cache), read(None), read(cache.read_only()))
+    assert round_trips.count == 3 * alone
+
+    # ...while callers with the same cache share one load.
+    cache = new_cache()
+    round_trips.reset()
+    await asyncio.gather(read(cache), read(cache))
+    assert round_trips.count == alone
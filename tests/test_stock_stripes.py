@@ -0,0 +1,165 @@
+import asyncio
+import random
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.exceptions import InsufficientStockError
+from app.models.product import Product
+from app.models.product_stock_stripe import ProductStockStripe
+from app.schemas.order import OrderCreate
+from app.services.order_service import OrderService
+from app.services.stock_stripes import StockRebalancer, StockStripes
+
+
+async def _stripes(session: AsyncSession, product_id: int) -> list[int]:
+    result = await session.execute(
+        select(ProductStockStripe.quantity)
+        .where(ProductStockStripe.product_id == product_id)
+        .order_by(ProductStockStripe.stripe)
+        .execution_options(populate_existing=True)
+    )
+    quantities = list(result.scalars())
+    await session.commit()
+    return quantities
+
+
+async def _order(client: AsyncClient, product_id: int, quantity: int) -> Any:
+    return await client.post(
+        "/api/v1/orders",
+        json={"items": [{"product_id": product_id, "quantity": quantity}]},
+    )
+
+
+@pytest.mark.asyncio
+async def test_striped_stock_reports_total_and_never_oversells(
+    client: AsyncClient, db_session: AsyncSession, sample_product: dict[str, Any]
+) -> None:
+    product_id = sample_product["id"]
+    response = await client.put(
+        f"/api/v1/products/{product_id}/stripes", json={"stripes": 4}
+    )
+    assert response.status_code == 200
+    assert (response.json()["stock_quantity"], response.json()["stock_stripes"]) == (
+        50,
+        4,
+    )
+    assert await _stripes(db_session, product_id) == [13, 13, 12, 12]
+
+    for _ in range(3):
+        assert (await _order(client, product_id, 12)).status_code == 201
+    product = (await client.get(f"/api/v1/products/{product_id}")).json()
+    assert product["stock_quantity"] == 14
+
+    response = await _order(client, product_id, 15)
+    assert response.status_code == 400
+    assert response.json()["available"] == 14
+
+    # No single stripe holds 14 any more: drawn across stripes.
+    assert (await _order(client, product_id, 14)).status_code == 201
+    assert await _stripes(db_session, product_id) == [0, 0, 0, 0]
+    report = (await client.get("/api/v1/analytics/sales")).json()
+    assert report["buckets"][0]["units"] == 50
+
+    response = await client.put(
+        f"/api/v1/products/{product_id}/stripes", json={"stripes": 0}
+    )
+    assert (response.json()["stock_quantity"], response.json()["stock_stripes"]) == (
+        0,
+        0,
+    )
+    assert await _stripes(db_session, product_id) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("strategy", ["lock", "conditional_update"])
+async def test_concurrent_striped_orders(
+    strategy: str,
+    db_session: AsyncSession,
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    product = Product(name="Hot", price="1.00", stock_quantity=10)
+    plain = Product(name="Plain", price="2.00", stock_quantity=100)
+    db_session.add_all([product, plain])
+    await db_session.commit()
+    await StockStripes(db_session).set_stripes(product.id, 4)
+    await db_session.commit()
+
+    payload = OrderCreate(
+        items=[
+            {"product_id": product.id, "quantity": 1},
+            {"product_id": plain.id, "quantity": 1},
+        ]
+    )
+
+    async def place() -> bool:
+        async with session_factory() as session:
+            service = OrderService(session, stock_strategy=strategy)
+            try:
+                await service.create_order(payload)
+            except InsufficientStockError:
+                return False
+            return True
+
+    results = await asyncio.gather(*(place() for _ in range(16)))
+
+    assert sum(results) == 10
+    assert await _stripes(db_session, product.id) == [0, 0, 0, 0]
+    stock = await db_session.scalar(
+        select(Product.stock_quantity)
+        .where(Product.id == plain.id)
+        .execution_options(populate_existing=True)
+    )
+    assert stock == 90
+
+
+@pytest.mark.asyncio
+async def test_batch_draws_from_stripes(
+    client: AsyncClient, sample_product: dict[str, Any]
+) -> None:
+    product_id = sample_product["id"]
+    await client.put(f"/api/v1/products/{product_id}/stripes", json={"stripes": 3})
+
+    response = await client.post(
+        "/api/v1/orders/batch",
+        json={
+            "orders": [
+                {"items": [{"product_id": product_id, "quantity": 30}]},
+                {"items": [{"product_id": product_id, "quantity": 30}]},
+                {"items": [{"product_id": product_id, "quantity": 20}]},
+            ]
+        },
+    )
+    statuses = [r["status"] for r in response.json()["results"]]
+    assert statuses == ["created", "failed", "created"]
+    product = (await client.get(f"/api/v1/products/{product_id}")).json()
+    assert product["stock_quantity"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rebalancer_evens_out_stripes(
+    db_session: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    product = Product(name="Hot", price="1.00", stock_quantity=40)
+    db_session.add(product)
+    await db_session.commit()
+    stripes = StockStripes(db_session, rng=random.Random(0))
+    await stripes.set_stripes(product.id, 4)
+    await db_session.commit()
+    locked = await stripes.lock([product.id])
+    await stripes.take(locked, {product.id: 10})
+    # Stock added to the product row after striping is folded in too.
+    await db_session.execute(
+        update(Product).where(Product.id == product.id).values(stock_quantity=3)
+    )
+    await db_session.commit()
+    assert await _stripes(db_session, product.id) == [0, 10, 10, 10]
+
+    rebalancer = StockRebalancer(session_factory, interval_seconds=60)
+    assert await rebalancer.run_once() == 1
+
+    assert await _stripes(db_session, product.id) == [9, 8, 8, 8]
+    assert await rebalancer.run_once() == 0
@@ -0,0 +1,86 @@
+from collections.abc import AsyncGenerator
+from contextlib import AsyncExitStack
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.dependencies import get_pool_warmer
+from app.main import app
+from app.warmup import PoolWarmer
+from tests.conftest import settings
+
+
+@pytest_asyncio.fixture
+async def pooled_engine(
+    db_session: AsyncSession,
+) -> AsyncGenerator[AsyncEngine, None]:
+    """A real connection pool on the test database, unlike the NullPool one."""
+    engine = create_async_engine(
+        settings.test_async_database_url, pool_size=3, max_overflow=2
+    )
+    yield engine
+    await engine.dispose()
+
+
+def _warmer(engine: AsyncEngine, connections: int | None = None) -> PoolWarmer:
+    return PoolWarmer([async_sessionmaker(engine)], connections=connections)
+
+
+@pytest.mark.asyncio
+async def test_warmer_prepares_hot_statements_on_every_connection(
+    pooled_engine: AsyncEngine,
+) -> None:
+    warmer = _warmer(pooled_engine)
+    assert not warmer.ready
+    assert await warmer.run_once() == 3
+    assert warmer.ready
+    assert pooled_engine.pool.checkedin() == 3
+
+    async with AsyncExitStack() as stack:
+        conns = [
+            await stack.enter_async_context(pooled_engine.connect()) for _ in range(3)
+        ]
+        # No new connection was opened to hand out the three.
+        assert pooled_engine.pool.checkedin() == 0
+        for conn in conns:
+            prepared = (
+                await conn.execute(text("SELECT statement FROM pg_prepared_statements"))
+            ).scalars()
+            statements = " ".join(prepared)
+            assert "FOR UPDATE" in statements
+            assert "FROM orders" in statements
+            assert "FROM products" in statements
+
+
+@pytest.mark.asyncio
+async def test_warm_up_is_capped_at_the_persistent_pool(
+    pooled_engine: AsyncEngine,
+) -> None:
+    assert await _warmer(pooled_engine, connections=10).run_once() == 3
+    assert await _warmer(pooled_engine, connections=1).run_once() == 1
+    assert _warmer(pooled_engine, connections=0).ready
+
+
+@pytest.mark.asyncio
+async def test_ready_endpoint_waits_for_warm_up(
+    client: AsyncClient, pooled_engine: AsyncEngine
+) -> None:
+    warmer = _warmer(pooled_engine)
+    app.dependency_overrides[get_pool_warmer] = lambda: warmer
+
+    response = await client.get("/ready")
+    assert response.status_code == 503
+    assert (await client.get("/health")).status_code == 200
+
+    await warmer.run_once()
+    response = await client.get("/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready"}